@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import logging
+import random
+import re
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from skillpulse_ingest.dates import to_epoch
+from skillpulse_ingest.fake_source import FakeSourceConfig, FakeSourceServer
+from skillpulse_ingest.locations import normalize_location
+from skillpulse_ingest.models import IngestionQuery, JobPosting
+from skillpulse_ingest.pipeline import run_pipeline
+from skillpulse_ingest.skill_extract import clean_text, content_hash
+from skillpulse_ingest.sources.http_client import HttpClient
+from skillpulse_ingest.sources.remotive import RemotiveAdapter
+from skillpulse_ingest.sources.theirstack import TheirstackAdapter
+from skillpulse_ingest.storage_sqlite import SQLiteStore, compress_text
+from skillpulse_ingest.skill_matcher import SkillMatcher, per_pattern_counts
+from skillpulse_ingest.synthetic import synthetic_description, synthetic_theirstack_job, synthetic_title
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _three_pass_clean(text: str | None) -> str:
+    if not text:
+        return ""
+    no_tags = re.sub(r"<[^>]+>", " ", text)
+    return re.sub(r"\s+", " ", html.unescape(no_tags)).strip()
+
+
+def bench_clean(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    docs = [synthetic_description(rng, paragraphs=args.paragraphs) for _ in range(args.postings)]
+
+    mismatches = sum(1 for d in docs if clean_text(d) != _three_pass_clean(d))
+    three_pass = _timed(lambda: [_three_pass_clean(d) for d in docs], args.repeat)
+    current = _timed(lambda: [clean_text(d) for d in docs], args.repeat)
+    # Peak is measured per document, which is what bounds a large extraction run.
+    largest = max(docs, key=len)
+
+    print(f"postings={len(docs)} avg_chars={sum(map(len, docs)) // max(len(docs), 1)}")
+    print(f"three_pass_s={three_pass:.3f}")
+    print(f"clean_text_s={current:.3f}")
+    print(f"speedup={three_pass / current:.2f}x")
+    print(f"three_pass_peak_bytes={_peak_bytes(lambda: _three_pass_clean(largest))}")
+    print(f"clean_text_peak_bytes={_peak_bytes(lambda: clean_text(largest))}")
+    print(f"mismatches={mismatches}")
+
+
+def bench_extract(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    docs = [
+        f"{clean_text(synthetic_title(rng))}\n{clean_text(synthetic_description(rng))}"
+        for _ in range(args.postings)
+    ]
+    matcher = SkillMatcher()
+
+    mismatches = sum(1 for d in docs if matcher.count(d) != per_pattern_counts(d))
+    per_pattern = _timed(lambda: [per_pattern_counts(d) for d in docs], args.repeat)
+    matcher_s = _timed(lambda: [matcher.count(d) for d in docs], args.repeat)
+
+    print(f"postings={len(docs)} avg_chars={sum(map(len, docs)) // max(len(docs), 1)}")
+    print(f"per_pattern_s={per_pattern:.3f}")
+    print(f"matcher_s={matcher_s:.3f}")
+    print(f"speedup={per_pattern / matcher_s:.1f}x")
+    print(f"mismatches={mismatches}")
+
+
+def _per_row_upsert(store: SQLiteStore, postings: list[JobPosting]) -> tuple[int, int]:
+    # The previous upsert path: one execute per posting, duplicates found via IntegrityError.
+    inserted = skipped = 0
+    cur = store.conn.cursor()
+    for p in postings:
+        try:
+            cur.execute(
+                "INSERT INTO postings (id, source, url, title, company, location, location_id, date_posted, "
+                "retrieved_at, role_bucket, level_bucket, content_hash, posted_ts, retrieved_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    p.id, p.source, p.url, p.title, p.company, p.location,
+                    store._resolve_locations([p.location]).get(normalize_location(p.location or "")),
+                    p.date_posted, p.retrieved_at,
+                    p.role_bucket, p.level_bucket, content_hash(p.title, p.description_raw),
+                    to_epoch(p.date_posted), to_epoch(p.retrieved_at),
+                ),
+            )
+            cur.execute(
+                "INSERT INTO posting_blobs (posting_id, description_z, raw_json_z) VALUES (?, ?, ?)",
+                (p.id, compress_text(p.description_raw), compress_text(json.dumps(p.raw, ensure_ascii=False))),
+            )
+            inserted += 1
+        except sqlite3.IntegrityError:
+            skipped += 1
+    store.conn.commit()
+    return inserted, skipped
+
+
+def _synthetic_postings(n: int, seed: int, *, paragraphs: int = 1) -> list[JobPosting]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    postings = []
+    for i in range(n):
+        raw = synthetic_theirstack_job(rng, i)
+        raw["description"] = synthetic_description(rng, paragraphs=paragraphs)
+        postings.append(
+            JobPosting(
+                id=JobPosting.make_id("theirstack", raw["final_url"]),
+                source="theirstack",
+                url=raw["final_url"],
+                title=raw["job_title"],
+                company=raw["company"],
+                location=raw["location"],
+                date_posted=raw["date_posted"],
+                retrieved_at=now,
+                role_bucket="backend",
+                level_bucket="entry",
+                description_raw=raw["description"],
+                raw=raw,
+            )
+        )
+    return postings
+
+
+def bench_upsert(args: argparse.Namespace) -> None:
+    postings = _synthetic_postings(args.postings, args.seed)
+    print(f"postings={len(postings)}")
+    for rate in args.duplicate_rates:
+        # The first rate% of the batch is already stored before the timed run.
+        existing = postings[: len(postings) * rate // 100]
+        results = {}
+        for name, upsert in (("per_row", _per_row_upsert), ("executemany", SQLiteStore.upsert_many)):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                store = SQLiteStore(str(Path(tmpdir) / "bench.db"))
+                try:
+                    store.upsert_many(existing)
+                    start = time.perf_counter()
+                    counts = upsert(store, postings)
+                    results[name] = (time.perf_counter() - start, counts)
+                finally:
+                    store.close()
+        (per_row_s, per_row_counts), (bulk_s, bulk_counts) = results["per_row"], results["executemany"]
+        print(
+            f"duplicates={rate}% per_row_s={per_row_s:.3f} executemany_s={bulk_s:.3f} "
+            f"speedup={per_row_s / bulk_s:.2f}x inserted_skipped={bulk_counts} counts_match={per_row_counts == bulk_counts}"
+        )
+
+
+_INLINE_POSTINGS = """
+CREATE TABLE postings (
+  id TEXT PRIMARY KEY, source TEXT NOT NULL, url TEXT NOT NULL, title TEXT NOT NULL,
+  company TEXT NOT NULL, location TEXT, date_posted TEXT, retrieved_at TEXT NOT NULL,
+  role_bucket TEXT NOT NULL, level_bucket TEXT NOT NULL, description_raw TEXT NOT NULL,
+  raw_json TEXT NOT NULL, posted_ts INTEGER, retrieved_ts INTEGER
+);
+CREATE INDEX idx_postings_role ON postings(role_bucket);
+CREATE INDEX idx_postings_level ON postings(level_bucket);
+CREATE INDEX idx_postings_date ON postings(date_posted);
+CREATE INDEX idx_postings_posted_ts ON postings(posted_ts);
+CREATE INDEX idx_postings_retrieved_ts ON postings(retrieved_ts);
+"""
+
+
+def _db_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.parent.glob(f"{path.name}*"))
+
+
+def bench_storage(args: argparse.Namespace) -> None:
+    postings = _synthetic_postings(args.postings, args.seed, paragraphs=args.paragraphs)
+    q = IngestionQuery(location="Dallas", role_bucket="backend", level_bucket="entry", days=30)
+    # The shared filter clause, as the insights totals use it.
+    probe = SQLiteStore(":memory:")
+    where_sql, params = probe._posting_where_clause(q)
+    probe.close()
+    totals_sql = f"SELECT COUNT(*), COUNT(DISTINCT company) FROM postings WHERE {where_sql}"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench.db"
+        # The layout before posting_blobs: both payloads inline in postings.
+        conn = sqlite3.connect(path)
+        conn.executescript(_INLINE_POSTINGS)
+        conn.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    p.id, p.source, p.url, p.title, p.company, p.location, p.date_posted, p.retrieved_at,
+                    p.role_bucket, p.level_bucket, p.description_raw, json.dumps(p.raw, ensure_ascii=False),
+                    to_epoch(p.date_posted), to_epoch(p.retrieved_at),
+                )
+                for p in postings
+            ],
+        )
+        conn.commit()
+        inline_bytes = _db_bytes(path)
+        inline_totals = conn.execute(totals_sql, params).fetchone()
+        inline_s = _timed(lambda: conn.execute(totals_sql, params).fetchone(), args.repeat)
+        conn.close()
+
+        start = time.perf_counter()
+        store = SQLiteStore(str(path))
+        migrate_s = time.perf_counter() - start
+        try:
+            split_bytes = _db_bytes(path)
+            split_totals = store.conn.execute(totals_sql, params).fetchone()
+            split_s = _timed(lambda: store.conn.execute(totals_sql, params).fetchone(), args.repeat)
+            ids = [p.id for p in postings[: args.sample]]
+            read_s = _timed(lambda: store.get_descriptions(ids), args.repeat)
+        finally:
+            store.close()
+
+    print(f"postings={len(postings)} avg_description_chars={sum(len(p.description_raw) for p in postings) // max(len(postings), 1)}")
+    print(f"inline_db_bytes={inline_bytes} split_db_bytes={split_bytes} ratio={inline_bytes / split_bytes:.2f}x")
+    print(f"inline_totals_s={inline_s:.4f} split_totals_s={split_s:.4f} speedup={inline_s / split_s:.2f}x")
+    print(f"migrate_s={migrate_s:.3f} read_{len(ids)}_descriptions_s={read_s:.4f}")
+    print(f"totals_match={tuple(inline_totals) == tuple(split_totals)}")
+
+
+def bench_ingest(args: argparse.Namespace) -> None:
+    config = FakeSourceConfig(
+        postings=args.postings,
+        latency_seconds=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    q = IngestionQuery(location="", role_bucket="any", level_bucket="any", days=30, max_results=args.postings)
+    logger = logging.getLogger("benchmark")
+    with FakeSourceServer(config) as server, tempfile.TemporaryDirectory() as tmpdir:
+        client = HttpClient(backoff_seconds=args.backoff, max_retries=args.max_retries)
+        adapters = [
+            TheirstackAdapter(
+                api_key="benchmark", client=client, page_concurrency=args.page_concurrency, base_url=server.theirstack_base
+            ),
+            RemotiveAdapter(client=client, base_url=server.remotive_base),
+        ]
+        store = SQLiteStore(str(Path(tmpdir) / "bench.db"))
+        try:
+            batches = [[a] for a in adapters] if args.serial else [adapters]
+            start = time.perf_counter()
+            for batch in batches:
+                run_pipeline(q, batch, store, logger, extract_skills=args.extract)
+            elapsed = time.perf_counter() - start
+            inserted = store.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        finally:
+            store.close()
+            client.close()
+
+    print(f"postings_per_source={args.postings} latency_s={args.latency} page_concurrency={args.page_concurrency}")
+    print(f"server_stats={server.stats}")
+    print(f"stored={inserted}")
+    print(f"wall_s={elapsed:.3f}")
+    print(f"postings_per_s={inserted / elapsed:.1f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Micro-benchmarks for backend hot paths.")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeat", type=int, default=3)
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    extract = sub.add_parser("extract", help="SkillMatcher vs per-pattern findall.")
+    extract.add_argument("--postings", type=int, default=500)
+    extract.set_defaults(func=bench_extract)
+
+    clean = sub.add_parser("clean", help="clean_text vs regex strip/unescape/collapse.")
+    clean.add_argument("--postings", type=int, default=500)
+    clean.add_argument("--paragraphs", type=int, default=30)
+    clean.set_defaults(func=bench_clean)
+
+    upsert = sub.add_parser("upsert", help="Bulk executemany upsert vs per-row inserts at several duplicate rates.")
+    upsert.add_argument("--postings", type=int, default=100_000)
+    upsert.add_argument(
+        "--duplicate-rates",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=[0, 50, 100],
+        help="Comma-separated percentages of the batch already stored.",
+    )
+    upsert.set_defaults(func=bench_upsert)
+
+    storage = sub.add_parser("storage", help="DB size and insights totals with inline vs compressed side-table blobs.")
+    storage.add_argument("--postings", type=int, default=20_000)
+    storage.add_argument("--paragraphs", type=int, default=8)
+    storage.add_argument("--sample", type=int, default=200, help="Descriptions read back after the migration.")
+    storage.set_defaults(func=bench_storage)
+
+    ingest = sub.add_parser("ingest", help="Full ingest against the local fake source server.")
+    ingest.add_argument("--postings", type=int, default=500, help="Postings per source.")
+    ingest.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response.")
+    ingest.add_argument("--error-rate", type=float, default=0.0)
+    ingest.add_argument("--throttle-rate", type=float, default=0.0)
+    ingest.add_argument("--backoff", type=float, default=0.05, help="Retry backoff base in seconds.")
+    ingest.add_argument("--max-retries", type=int, default=5)
+    ingest.add_argument("--page-concurrency", type=int, default=4)
+    ingest.add_argument("--serial", action="store_true", help="Fetch one source after the other.")
+    ingest.add_argument("--extract", action="store_true", help="Also extract skills inline.")
+    ingest.set_defaults(func=bench_ingest)
+
+    return ap
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import argparse
 
+from skillpulse_ingest.extraction_cache import DEFAULT_CACHE_SIZE
+from skillpulse_ingest.metrics import recording
 from skillpulse_ingest.models import IngestionQuery
 from skillpulse_ingest.runtime_paths import DEFAULT_DB_PATH
 from skillpulse_ingest.workflow import extract_posting_skills
@@ -16,6 +18,11 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--days", type=int, default=30)
     ap.add_argument("--limit", type=int, default=None)
     ap.add_argument("--sample-out", default=None)
+    ap.add_argument("--workers", type=int, default=1, help="Extraction worker processes (1 = in-process).")
+    ap.add_argument("--force", action="store_true", help="Re-extract postings even if already current.")
+    ap.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="In-memory extraction cache entries.")
+    ap.add_argument("--persist-cache", action="store_true", help="Also keep the extraction cache in the database.")
+    ap.add_argument("--metrics-dir", default=None, help="Write metrics.json and metrics.prom here (off by default).")
     return ap
 
 
@@ -30,12 +37,26 @@ def main(argv: list[str] | None = None) -> None:
         max_results=10_000,
     )
 
-    summary = extract_posting_skills(args.db, q, limit=args.limit, sample_out=args.sample_out)
+    with recording(args.metrics_dir):
+        summary = extract_posting_skills(
+            args.db,
+            q,
+            limit=args.limit,
+            sample_out=args.sample_out,
+            workers=args.workers,
+            force=args.force,
+            cache_size=args.cache_size,
+            persist_cache=args.persist_cache,
+        )
 
     print(f"postings_processed={summary.postings_processed}")
+    print(f"postings_skipped={summary.postings_skipped}")
     print(f"postings_with_skills={summary.postings_with_skills}")
     print(f"skills_inserted={summary.skills_inserted}")
     print(f"skills_updated_or_skipped={summary.skills_updated_or_skipped}")
+    print(f"skills_removed={summary.skills_removed}")
+    print(f"cache_hits={summary.cache_hits}")
+    print(f"cache_misses={summary.cache_misses}")
     if args.sample_out:
         print(f"sample_written={args.sample_out}")
 
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from skillpulse_ingest.fake_source import FakeSourceConfig, FakeSourceServer
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Serve synthetic Theirstack/Remotive APIs locally for load tests.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--postings", type=int, default=1000, help="Postings per source.")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--spacing-seconds", type=int, default=600, help="Time between consecutive postings.")
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    ap.add_argument("--max-page-size", type=int, default=None, help="Cut Theirstack pages to this many postings.")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered 503.")
+    ap.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered 429.")
+    ap.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with each 429.")
+    return ap
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    config = FakeSourceConfig(
+        postings=args.postings,
+        seed=args.seed,
+        spacing_seconds=args.spacing_seconds,
+        latency_seconds=args.latency,
+        max_page_size=args.max_page_size,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+    )
+    with FakeSourceServer(config, host=args.host, port=args.port) as server:
+        print(f"THEIRSTACK_BASE_URL={server.theirstack_base}")
+        print(f"REMOTIVE_BASE_URL={server.remotive_base}")
+        print("Any THEIRSTACK_API_KEY is accepted. Ctrl+C to stop.", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        print(f"stats={server.stats}")
+
+
+if __name__ == "__main__":
+    main()
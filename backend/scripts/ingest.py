@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import argparse
 
+from skillpulse_ingest.metrics import recording
 from skillpulse_ingest.models import IngestionQuery
-from skillpulse_ingest.pipeline import SOURCES
-from skillpulse_ingest.runtime_paths import DEFAULT_DB_PATH, DEFAULT_LOG_PATH
+from skillpulse_ingest.pipeline import SOURCES, parse_source_names
+from skillpulse_ingest.runtime_paths import DEFAULT_DB_PATH, DEFAULT_HTTP_CACHE_DIR, DEFAULT_LOG_PATH
+from skillpulse_ingest.sources.response_cache import DEFAULT_TTL_SECONDS, ResponseCache
 from skillpulse_ingest.workflow import ingest_postings, setup_logger
 
 
@@ -15,14 +17,45 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--level", choices=["any", "entry", "junior_mid"], default="any")
     ap.add_argument("--days", type=int, default=30)
     ap.add_argument("--max-results", type=int, default=250)
-    ap.add_argument("--source", choices=sorted(SOURCES.keys()), default=None)
+    ap.add_argument(
+        "--source",
+        default=None,
+        help=f"One of {', '.join(sorted(SOURCES))}, a comma-separated list, or 'all' (fetched concurrently).",
+    )
     ap.add_argument("--db", default=str(DEFAULT_DB_PATH))
     ap.add_argument("--log", default=str(DEFAULT_LOG_PATH))
+    ap.add_argument("--extract", action="store_true", help="Also extract skills for new postings during ingest.")
+    ap.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignore stored fetch watermarks and request the whole --days window again.",
+    )
+    ap.add_argument("--http-cache-dir", default=str(DEFAULT_HTTP_CACHE_DIR))
+    ap.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="Seconds a cached response is served before it is revalidated.",
+    )
+    ap.add_argument("--no-http-cache", action="store_true", help="Always fetch from the network.")
+    ap.add_argument(
+        "--replay",
+        action="store_true",
+        help="Serve every request from the HTTP cache; no network. Implies --full-refresh.",
+    )
+    ap.add_argument("--metrics-dir", default=None, help="Write metrics.json and metrics.prom here (off by default).")
     return ap
 
 
 def main(argv: list[str] | None = None) -> None:
-    args = build_parser().parse_args(argv)
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    try:
+        parse_source_names(args.source)
+    except ValueError as exc:
+        ap.error(str(exc))
+    if args.replay and args.no_http_cache:
+        ap.error("--replay needs the HTTP cache")
 
     q = IngestionQuery(
         location=args.location,
@@ -31,8 +64,21 @@ def main(argv: list[str] | None = None) -> None:
         days=args.days,
         max_results=args.max_results,
     )
+    http_cache = None
+    if not args.no_http_cache:
+        http_cache = ResponseCache(args.http_cache_dir, ttl_seconds=args.http_cache_ttl, replay=args.replay)
 
-    ingest_postings(q, args.db, args.log, source_name=args.source)
+    with recording(args.metrics_dir):
+        ingest_postings(
+            q,
+            args.db,
+            args.log,
+            source_name=args.source,
+            extract_skills=args.extract,
+            # Replayed requests must match the recorded ones, so no watermark filters.
+            incremental=not (args.full_refresh or args.replay),
+            http_cache=http_cache,
+        )
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,19 @@ import argparse
 import json
 import sys
 
+from skillpulse_ingest.extraction_cache import DEFAULT_CACHE_SIZE
+from skillpulse_ingest.metrics import recording
 from skillpulse_ingest.models import IngestionQuery
-from skillpulse_ingest.pipeline import SOURCES
+from skillpulse_ingest.pipeline import SOURCES, parse_source_names
 from skillpulse_ingest.runtime_paths import (
     DEFAULT_DB_PATH,
+    DEFAULT_HTTP_CACHE_DIR,
     DEFAULT_LOG_PATH,
     DEFAULT_SAMPLE_PATH,
     ensure_parent_dir,
 )
+from skillpulse_ingest.sources.response_cache import DEFAULT_TTL_SECONDS, ResponseCache
+from skillpulse_ingest.storage_sqlite import SQLiteStore
 from skillpulse_ingest.workflow import build_skill_insights, extract_posting_skills, ingest_postings
 
 
@@ -22,17 +27,51 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--level", choices=["any", "entry", "junior_mid"], default="any")
     ap.add_argument("--days", type=int, default=30)
     ap.add_argument("--max-results", type=int, default=250)
-    ap.add_argument("--source", choices=sorted(SOURCES.keys()), default=None)
+    ap.add_argument(
+        "--source",
+        default=None,
+        help=f"One of {', '.join(sorted(SOURCES))}, a comma-separated list, or 'all' (fetched concurrently).",
+    )
     ap.add_argument("--top", type=int, default=5)
     ap.add_argument("--db", default=str(DEFAULT_DB_PATH))
     ap.add_argument("--log", default=str(DEFAULT_LOG_PATH))
     ap.add_argument("--sample-out", default=str(DEFAULT_SAMPLE_PATH))
     ap.add_argument("--out", default=None)
+    ap.add_argument("--workers", type=int, default=1, help="Extraction worker processes (1 = in-process).")
+    ap.add_argument("--force", action="store_true", help="Re-extract postings even if already current.")
+    ap.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="In-memory extraction cache entries.")
+    ap.add_argument("--persist-cache", action="store_true", help="Also keep the extraction cache in the database.")
+    ap.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignore stored fetch watermarks and request the whole --days window again.",
+    )
+    ap.add_argument("--http-cache-dir", default=str(DEFAULT_HTTP_CACHE_DIR))
+    ap.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="Seconds a cached response is served before it is revalidated.",
+    )
+    ap.add_argument("--no-http-cache", action="store_true", help="Always fetch from the network.")
+    ap.add_argument(
+        "--replay",
+        action="store_true",
+        help="Serve every request from the HTTP cache; no network. Implies --full-refresh.",
+    )
+    ap.add_argument("--metrics-dir", default=None, help="Write metrics.json and metrics.prom here (off by default).")
     return ap
 
 
 def main(argv: list[str] | None = None) -> None:
-    args = build_parser().parse_args(argv)
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    try:
+        parse_source_names(args.source)
+    except ValueError as exc:
+        ap.error(str(exc))
+    if args.replay and args.no_http_cache:
+        ap.error("--replay needs the HTTP cache")
 
     q = IngestionQuery(
         location=args.location,
@@ -41,15 +80,49 @@ def main(argv: list[str] | None = None) -> None:
         days=args.days,
         max_results=args.max_results,
     )
+    http_cache = None
+    if not args.no_http_cache:
+        http_cache = ResponseCache(args.http_cache_dir, ttl_seconds=args.http_cache_ttl, replay=args.replay)
 
-    ingest_postings(q, args.db, args.log, source_name=args.source)
-    summary = extract_posting_skills(args.db, q, sample_out=args.sample_out)
-    payload = build_skill_insights(args.db, q, top_n=args.top)
+    ensure_parent_dir(args.db)
+    # One connection for all three steps.
+    with recording(args.metrics_dir), SQLiteStore(args.db) as store:
+        # New postings are extracted during ingest; the extraction step then only
+        # revisits rows that are stale (or everything, with --force).
+        # Replayed requests must match the recorded ones, so no watermark filters.
+        ingested = ingest_postings(
+            q,
+            store,
+            args.log,
+            source_name=args.source,
+            extract_skills=True,
+            incremental=not (args.full_refresh or args.replay),
+            http_cache=http_cache,
+        )
+        summary = extract_posting_skills(
+            store,
+            q,
+            sample_out=args.sample_out,
+            workers=args.workers,
+            force=args.force,
+            cache_size=args.cache_size,
+            persist_cache=args.persist_cache,
+        )
+        payload = build_skill_insights(store, q, top_n=args.top)
 
+    print(f"postings_inserted={ingested.postings_inserted}", file=sys.stderr)
+    # New postings are extracted during ingest, so the extraction step skips them.
+    print(f"inline_postings_extracted={ingested.postings_extracted}", file=sys.stderr)
+    print(f"inline_postings_with_skills={ingested.postings_with_skills}", file=sys.stderr)
+    print(f"inline_skills_inserted={ingested.skills_inserted}", file=sys.stderr)
     print(f"postings_processed={summary.postings_processed}", file=sys.stderr)
+    print(f"postings_skipped={summary.postings_skipped}", file=sys.stderr)
     print(f"postings_with_skills={summary.postings_with_skills}", file=sys.stderr)
     print(f"skills_inserted={summary.skills_inserted}", file=sys.stderr)
     print(f"skills_updated_or_skipped={summary.skills_updated_or_skipped}", file=sys.stderr)
+    print(f"skills_removed={summary.skills_removed}", file=sys.stderr)
+    print(f"cache_hits={summary.cache_hits}", file=sys.stderr)
+    print(f"cache_misses={summary.cache_misses}", file=sys.stderr)
     if summary.sample_out:
         print(f"sample_written={summary.sample_out}", file=sys.stderr)
 
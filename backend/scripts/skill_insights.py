@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 
+from skillpulse_ingest.metrics import recording
 from skillpulse_ingest.models import IngestionQuery
 from skillpulse_ingest.runtime_paths import DEFAULT_DB_PATH
 from skillpulse_ingest.workflow import build_skill_insights
@@ -16,6 +17,7 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--level", choices=["any", "entry", "junior_mid"], default="any")
     ap.add_argument("--days", type=int, default=30)
     ap.add_argument("--top", type=int, default=5)
+    ap.add_argument("--metrics-dir", default=None, help="Write metrics.json and metrics.prom here (off by default).")
     return ap
 
 
@@ -30,7 +32,8 @@ def main(argv: list[str] | None = None) -> None:
         max_results=250,
     )
 
-    payload = build_skill_insights(args.db, q, top_n=args.top)
+    with recording(args.metrics_dir):
+        payload = build_skill_insights(args.db, q, top_n=args.top)
 
     print(json.dumps(payload, ensure_ascii=False, indent=2))
 
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from dateutil import parser as dtparser
+
+
+def parse_datetime(value: object) -> Optional[datetime]:
+    """Best-effort UTC datetime for a provider or stored date; naive values are UTC.
+
+    Sources emit ISO 8601 (``2026-03-01T12:00:00Z``, ``2026-03-01``), which
+    ``datetime.fromisoformat`` reads directly; dateutil only sees the rest.
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        # Python 3.10's fromisoformat does not accept a "Z" suffix.
+        dt = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith(("Z", "z")) else text)
+    except ValueError:
+        try:
+            dt = dtparser.parse(text)
+        except (ValueError, OverflowError):
+            return None
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def to_epoch(value: object) -> Optional[int]:
+    """Whole seconds since the Unix epoch, or None if ``value`` isn't a date."""
+    dt = parse_datetime(value)
+    return None if dt is None else int(dt.timestamp())
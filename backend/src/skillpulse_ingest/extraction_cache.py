@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable
+
+from .skills_catalog import CATALOG_FINGERPRINT
+
+if TYPE_CHECKING:
+    from .storage_sqlite import SQLiteStore
+
+DEFAULT_CACHE_SIZE = 10_000
+
+
+class ExtractionCache:
+    """Content-addressed skill counts, keyed by the cleaned text extraction reads.
+
+    Reposted jobs with identical text are extracted once per catalog version.
+    Entries live in an in-memory LRU and, when a store is given, in its
+    ``extraction_cache`` table so later runs can reuse them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        *,
+        store: SQLiteStore | None = None,
+        catalog_fingerprint: str = CATALOG_FINGERPRINT,
+    ) -> None:
+        self.max_entries = max_entries
+        self.store = store
+        self.catalog_fingerprint = catalog_fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict[str, int]] = OrderedDict()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+    def lookup(self, keys: Iterable[str]) -> tuple[dict[str, dict[str, int]], list[str]]:
+        """Resolve a batch of keys, counting one hit or miss per key occurrence.
+
+        Returns the cached counts and the distinct missing keys in first-seen
+        order. Repeats of a missing key within the batch count as hits, exactly
+        as they would if the batch were processed one posting at a time.
+        """
+        keys = list(keys)
+        found: dict[str, dict[str, int]] = {}
+        for key in dict.fromkeys(keys):
+            counts = self._entries.get(key)
+            if counts is not None:
+                self._entries.move_to_end(key)
+                found[key] = counts
+
+        if self.store is not None:
+            unresolved = [key for key in dict.fromkeys(keys) if key not in found]
+            if unresolved:
+                persisted = self.store.get_cached_extractions(unresolved, self.catalog_fingerprint)
+                found.update(persisted)
+                self._remember(persisted)
+
+        missing: list[str] = []
+        pending: set[str] = set()
+        for key in keys:
+            if key in found or key in pending:
+                self.hits += 1
+            else:
+                self.misses += 1
+                pending.add(key)
+                missing.append(key)
+        return found, missing
+
+    def put_many(self, entries: dict[str, dict[str, int]]) -> None:
+        if not entries:
+            return
+        self._remember(entries)
+        if self.store is not None:
+            # Committed by the caller together with the posting skills.
+            self.store.put_cached_extractions(entries, self.catalog_fingerprint)
+
+    def _remember(self, entries: dict[str, dict[str, int]]) -> None:
+        if self.max_entries <= 0:
+            return
+        for key, counts in entries.items():
+            self._entries[key] = counts
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
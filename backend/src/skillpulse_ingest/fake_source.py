@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .dates import parse_datetime
+from .synthetic import synthetic_remotive_job, synthetic_theirstack_job
+
+THEIRSTACK_PATH = "/v1/jobs/search"
+REMOTIVE_PATH = "/api/remote-jobs"
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients drop pooled connections after error responses; that's normal here.
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+@dataclass(frozen=True)
+class FakeSourceConfig:
+    postings: int = 1000          # listing size per source
+    seed: int = 42
+    spacing_seconds: int = 600    # postings are this far apart, newest first
+    latency_seconds: float = 0.0  # added to every response
+    max_page_size: Optional[int] = None  # Theirstack pages are cut to this, if set
+    error_rate: float = 0.0       # share of requests answered 503
+    throttle_rate: float = 0.0    # share of requests answered 429
+    retry_after_seconds: int = 0  # Retry-After sent with each 429
+
+
+class FakeSourceServer:
+    """Local stand-in for the Theirstack and Remotive job APIs.
+
+    Serves ``config.postings`` synthetic postings per source, built on demand
+    from ``(seed, id)`` so large listings cost no memory. Posting dates count
+    back from server start, so every query window and watermark filter
+    behaves as against the real API. Point adapters at ``theirstack_base`` /
+    ``remotive_base`` (or the ``*_BASE_URL`` environment variables).
+
+    Use as a context manager; ``port=0`` picks a free port.
+    """
+
+    def __init__(self, config: FakeSourceConfig = FakeSourceConfig(), *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config
+        self.anchor = datetime.now(timezone.utc).replace(microsecond=0)
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "postings": 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(config.seed)
+        self._httpd = _QuietServer((host, port), _handler_for(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def theirstack_base(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def remotive_base(self) -> str:
+        return f"{self.url}{REMOTIVE_PATH}"
+
+    def start(self) -> FakeSourceServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-source", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> FakeSourceServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def injected_failure(self) -> Optional[int]:
+        """Status to fail this request with, drawn from the configured rates."""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+        if roll < self.config.throttle_rate:
+            self._count("throttled")
+            return 429
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self._count("errors")
+            return 503
+        return None
+
+    def posted_at(self, job_id: int) -> datetime:
+        return self.anchor - timedelta(seconds=job_id * self.config.spacing_seconds)
+
+    def visible(self, cutoff: datetime) -> int:
+        """How many postings (ids 0..n-1, newest first) are at or after ``cutoff``."""
+        age = (self.anchor - cutoff).total_seconds()
+        if age < 0:
+            return 0
+        return min(self.config.postings, int(age // self.config.spacing_seconds) + 1)
+
+    def theirstack_job(self, job_id: int) -> dict:
+        rng = random.Random(self.config.seed * 1_000_003 + job_id)
+        return synthetic_theirstack_job(rng, job_id, date_posted=self.posted_at(job_id).isoformat())
+
+    def remotive_job(self, job_id: int) -> dict:
+        rng = random.Random(self.config.seed * 1_000_003 + job_id)
+        date = self.posted_at(job_id).replace(tzinfo=None).isoformat()
+        return synthetic_remotive_job(rng, job_id, publication_date=date)
+
+
+def _handler_for(server: FakeSourceServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+        def _send_json(self, status: int, payload: Any, headers: Optional[dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_chunked(self, parts: Iterator[bytes]) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for part in parts:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading (e.g. max_results reached).
+                self.close_connection = True
+
+        def _fail_or_delay(self) -> bool:
+            if server.config.latency_seconds:
+                time.sleep(server.config.latency_seconds)
+            status = server.injected_failure()
+            if status is None:
+                return False
+            headers = {"Retry-After": str(server.config.retry_after_seconds)} if status == 429 else None
+            self._send_json(status, {"error": "injected"}, headers)
+            return True
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length)
+            if urlsplit(self.path).path != THEIRSTACK_PATH:
+                self._send_json(404, {"error": "not found"})
+                return
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._send_json(401, {"error": "missing API key"})
+                return
+            if self._fail_or_delay():
+                return
+
+            payload = json.loads(body or b"{}")
+            cutoffs = [server.anchor - timedelta(days=payload.get("posted_at_max_age_days", 36500))]
+            if payload.get("posted_at_gte"):
+                cutoffs.append(parse_datetime(payload["posted_at_gte"]))
+            total = server.visible(max(c for c in cutoffs if c is not None))
+
+            limit = int(payload.get("limit", 25))
+            start = int(payload.get("page", 0)) * limit
+            if server.config.max_page_size is not None:
+                # Pages still start at page * limit; they just come back short.
+                limit = min(limit, server.config.max_page_size)
+            ids = range(start, min(start + limit, total))
+            server._count("postings", len(ids))
+            self._send_json(
+                200,
+                {"metadata": {"total_results": total}, "data": [server.theirstack_job(i) for i in ids]},
+            )
+
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            if parts.path != REMOTIVE_PATH:
+                self._send_json(404, {"error": "not found"})
+                return
+            # "search" is accepted but not applied; every posting matches.
+            if self._fail_or_delay():
+                return
+
+            def feed() -> Iterator[bytes]:
+                total = server.config.postings
+                yield b'{"0-legal-notice": "Synthetic data", "job-count": %d, "jobs": [' % total
+                for i in range(total):
+                    server._count("postings")
+                    yield (b"," if i else b"") + json.dumps(server.remotive_job(i)).encode("utf-8")
+                yield b"]}"
+
+            self._send_chunked(feed())
+
+    return Handler
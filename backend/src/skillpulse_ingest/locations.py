@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+US_STATES = {
+    "AL": "alabama", "AK": "alaska", "AZ": "arizona", "AR": "arkansas", "CA": "california",
+    "CO": "colorado", "CT": "connecticut", "DE": "delaware", "DC": "district of columbia",
+    "FL": "florida", "GA": "georgia", "HI": "hawaii", "ID": "idaho", "IL": "illinois",
+    "IN": "indiana", "IA": "iowa", "KS": "kansas", "KY": "kentucky", "LA": "louisiana",
+    "ME": "maine", "MD": "maryland", "MA": "massachusetts", "MI": "michigan", "MN": "minnesota",
+    "MS": "mississippi", "MO": "missouri", "MT": "montana", "NE": "nebraska", "NV": "nevada",
+    "NH": "new hampshire", "NJ": "new jersey", "NM": "new mexico", "NY": "new york",
+    "NC": "north carolina", "ND": "north dakota", "OH": "ohio", "OK": "oklahoma", "OR": "oregon",
+    "PA": "pennsylvania", "RI": "rhode island", "SC": "south carolina", "SD": "south dakota",
+    "TN": "tennessee", "TX": "texas", "UT": "utah", "VT": "vermont", "VA": "virginia",
+    "WA": "washington", "WV": "west virginia", "WI": "wisconsin", "WY": "wyoming",
+}
+
+_STATE_CODES = {name: code for code, name in US_STATES.items()}
+_STATE_CODES.update({code.lower(): code for code in US_STATES})
+
+_US_NAMES = {"us", "usa", "u.s.", "u.s.a.", "united states", "united states of america", "usa only", "us only"}
+
+# Metro areas and nicknames, folded into the city postings are filtered by.
+CITY_ALIASES = {
+    "dallas-fort worth": ("dallas", "TX"),
+    "dallas/fort worth": ("dallas", "TX"),
+    "dallas fort worth": ("dallas", "TX"),
+    "dfw": ("dallas", "TX"),
+    "nyc": ("new york", "NY"),
+    "new york city": ("new york", "NY"),
+    "manhattan": ("new york", "NY"),
+    "brooklyn": ("new york", "NY"),
+    "sf": ("san francisco", "CA"),
+    "san francisco bay area": ("san francisco", "CA"),
+    "bay area": ("san francisco", "CA"),
+    "greater seattle area": ("seattle", "WA"),
+    "greater boston": ("boston", "MA"),
+    "washington dc": ("washington", "DC"),
+}
+
+_REMOTE_WORDS = r"remote|anywhere|worldwide|work from home|wfh"
+_REMOTE_RE = re.compile(rf"\b(?:{_REMOTE_WORDS})\b")
+# Dropped before parsing: "(Hybrid)", ZIP codes, and work-mode words with
+# their separator, as in "Remote - US".
+_NOISE_RE = re.compile(rf"\([^)]*\)|\b\d{{5}}(?:-\d{{4}})?\b|\b(?:{_REMOTE_WORDS}|hybrid|on-?site)\b\s*[-:/]?")
+
+
+@dataclass(frozen=True)
+class ParsedLocation:
+    city: Optional[str] = None     # lowercased, metro aliases folded in
+    state: Optional[str] = None    # two-letter code for US states, else lowercased region
+    country: Optional[str] = None  # "US", else lowercased name
+    remote: bool = False
+
+    @property
+    def key(self) -> str:
+        return "|".join([self.city or "", self.state or "", self.country or "", "remote" if self.remote else ""])
+
+
+def normalize_location(text: str) -> str:
+    """Alias form of a location string: lowercased, whitespace collapsed."""
+    return " ".join(text.lower().split())
+
+
+def parse_location(text: str | None) -> ParsedLocation:
+    """Best-effort city/state/country/remote for a posting or query location.
+
+    Reads "City, ST", "City, State", "City, ST, Country", "City, Region,
+    Country", a state or country alone, metro aliases ("Dallas-Fort Worth")
+    and remote markers. Whatever is left after the state and country is the city.
+    """
+    norm = normalize_location(text or "")
+    remote = bool(_REMOTE_RE.search(norm))
+    parts = [" ".join(p.strip(" -/").split()) for p in _NOISE_RE.sub(" ", norm).split(",")]
+    parts = [p for p in parts if p]
+
+    city = state = country = None
+    if parts and parts[-1] in _US_NAMES:
+        country = "US"
+        parts.pop()
+    if parts and parts[-1].replace(".", "") in _STATE_CODES:
+        state = _STATE_CODES[parts.pop().replace(".", "")]
+    elif len(parts) >= 2 and country is None:
+        country = parts.pop()
+        if len(parts) >= 2:
+            state = parts.pop()
+
+    if parts:
+        city = ", ".join(parts)
+        if city in CITY_ALIASES:
+            city, alias_state = CITY_ALIASES[city]
+            state = state or alias_state
+    if state in US_STATES:
+        country = "US"
+    return ParsedLocation(city=city, state=state, country=country, remote=remote)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Iterator
+
+from .runtime_paths import ensure_parent_dir
+
+# Upper bounds in seconds; the +Inf bucket is implicit.
+HTTP_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICS_JSON = "metrics.json"
+METRICS_PROM = "metrics.prom"
+
+_PREFIX = "skillpulse_"
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+def _key(name: str, labels: dict[str, object]) -> tuple[str, _Labels]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Stage:
+    """Handle yielded by ``stage()``; set ``items`` to report throughput."""
+
+    __slots__ = ("items",)
+
+    def __init__(self) -> None:
+        self.items = 0
+
+
+class Metrics:
+    """Thread-safe stage timings, counters and histograms for one run.
+
+    Stages record calls, total seconds and items processed (for items/sec).
+    Counters and histograms are labelled, e.g. ``source="theirstack"``.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: tuple[float, ...] = HTTP_LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages: dict[tuple[str, _Labels], list[float]] = {}
+        self._counters: dict[tuple[str, _Labels], float] = {}
+        self._histograms: dict[tuple[str, _Labels], list[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str, **labels: object) -> Iterator[Stage]:
+        handle = Stage()
+        start = time.perf_counter()
+        try:
+            yield handle
+        finally:
+            elapsed = time.perf_counter() - start
+            key = _key(name, labels)
+            with self._lock:
+                record = self._stages.setdefault(key, [0, 0.0, 0])
+                record[0] += 1
+                record[1] += elapsed
+                record[2] += handle.items
+
+    def add(self, name: str, value: float = 1, **labels: object) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            # One slot per bucket, then +Inf, sum and count.
+            hist = self._histograms.setdefault(key, [0] * (len(self.buckets) + 3))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[i] += 1
+            hist[-3] += 1
+            hist[-2] += value
+            hist[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        return {
+            "started_at": self.started_at.isoformat().replace("+00:00", "Z"),
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "calls": int(calls),
+                    "seconds": round(seconds, 6),
+                    "items": int(items),
+                    "items_per_second": round(items / seconds, 3) if seconds > 0 else None,
+                }
+                for (name, labels), (calls, seconds, items) in stages
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value} for (name, labels), value in counters
+            ],
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": {
+                        **{_format_bound(b): int(n) for b, n in zip(self.buckets, hist)},
+                        "+Inf": int(hist[-3]),
+                    },
+                    "sum": round(hist[-2], 6),
+                    "count": int(hist[-1]),
+                }
+                for (name, labels), hist in histograms
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines: list[str] = []
+
+        def family(name: str, kind: str) -> None:
+            lines.append(f"# TYPE {_PREFIX}{name} {kind}")
+
+        stage_fields = ("calls", "seconds", "items")
+        for field in stage_fields:
+            metric = f"stage_{field}_total"
+            if snap["stages"]:
+                family(metric, "counter")
+            for s in snap["stages"]:
+                labels = {"stage": s["name"], **s["labels"]}
+                lines.append(f"{_PREFIX}{metric}{_format_labels(labels)} {_format_value(s[field])}")
+
+        seen: set[str] = set()
+        for c in snap["counters"]:
+            if c["name"] not in seen:
+                seen.add(c["name"])
+                family(c["name"], "counter")
+            lines.append(f"{_PREFIX}{c['name']}{_format_labels(c['labels'])} {_format_value(c['value'])}")
+
+        for h in snap["histograms"]:
+            if h["name"] not in seen:
+                seen.add(h["name"])
+                family(h["name"], "histogram")
+            for bound, n in h["buckets"].items():
+                labels = {**h["labels"], "le": bound}
+                lines.append(f"{_PREFIX}{h['name']}_bucket{_format_labels(labels)} {n}")
+            lines.append(f"{_PREFIX}{h['name']}_sum{_format_labels(h['labels'])} {_format_value(h['sum'])}")
+            lines.append(f"{_PREFIX}{h['name']}_count{_format_labels(h['labels'])} {h['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str | Path) -> tuple[Path, Path]:
+        json_path = ensure_parent_dir(Path(directory) / METRICS_JSON)
+        prom_path = Path(directory) / METRICS_PROM
+        json_path.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        prom_path.write_text(self.to_prometheus(), encoding="utf-8")
+        return json_path, prom_path
+
+
+class NullMetrics:
+    """Disabled instrumentation: every call is a no-op."""
+
+    enabled = False
+    _STAGE = nullcontext(Stage())
+
+    def stage(self, name: str, **labels: object) -> ContextManager[Stage]:
+        return self._STAGE
+
+    def add(self, name: str, value: float = 1, **labels: object) -> None:
+        return None
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        return None
+
+
+_active: Metrics | NullMetrics = NullMetrics()
+
+
+def get_metrics() -> Metrics | NullMetrics:
+    return _active
+
+
+@contextmanager
+def recording(directory: str | Path | None) -> Iterator[Metrics | NullMetrics]:
+    """Collect metrics for the duration of a run and write them on exit.
+
+    With ``directory=None`` instrumentation stays disabled. Files are written
+    even when the run fails, so partial timings are still available.
+    """
+    global _active
+    if directory is None:
+        yield _active
+        return
+
+    metrics = Metrics()
+    previous, _active = _active, metrics
+    try:
+        yield metrics
+    finally:
+        _active = previous
+        metrics.write(directory)
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
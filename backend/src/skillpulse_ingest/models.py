@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, FrozenSet
 import hashlib
 import json
 
@@ -15,6 +15,34 @@ class IngestionQuery:
     days: int = 30                # time window
     max_results: int = 250        # cap per source to avoid runaway
 
+    def watermark_key(self) -> str:
+        # days/max_results only bound a fetch; the watermark records the window
+        # it covered instead (see FetchWatermark.covers_window).
+        return json.dumps(
+            {"location": self.location.strip().lower(), "role": self.role_bucket, "level": self.level_bucket},
+            sort_keys=True,
+        )
+
+
+@dataclass(frozen=True)
+class FetchWatermark:
+    newest_posted_at: datetime    # newest posting date seen for a (source, query), UTC
+    boundary_ids: FrozenSet[str] = frozenset()  # provider ids posted exactly at newest_posted_at
+    window_start: Optional[datetime] = None  # oldest posting date the fetches behind this mark asked for
+    complete: bool = False        # False if the last fetch stopped at max_results
+
+    def covers_window(self, window_start: datetime) -> bool:
+        """True if every posting from ``window_start`` up to the mark was fetched."""
+        return self.complete and self.window_start is not None and self.window_start <= window_start
+
+    def covers(self, posted_at: Optional[datetime], provider_id: Optional[str]) -> bool:
+        """True if a posting with this date and id was already fetched."""
+        if posted_at is None:
+            return False
+        if posted_at < self.newest_posted_at:
+            return True
+        return posted_at == self.newest_posted_at and provider_id is not None and provider_id in self.boundary_ids
+
 
 @dataclass
 class JobPosting:
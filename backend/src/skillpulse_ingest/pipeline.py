@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
-from typing import Optional, Type, Iterable
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Type, Iterable
 
-from .models import IngestionQuery, JobPosting
-from .role_match import classify_level, classify_role, matches_query
+from .dates import parse_datetime
+from .extraction_cache import ExtractionCache
+from .metrics import get_metrics
+from .models import FetchWatermark, IngestionQuery, JobPosting
+from .prepared import PreparedPosting
+from .role_match import classify_prepared, matches_query
+from .skills_catalog import CATALOG_FINGERPRINT
 from .sources.remotive import RemotiveAdapter
 from .sources.theirstack import TheirstackAdapter
-from .sources.base import SourceAdapter
+from .sources.base import SourceAdapter, provider_id
 
 DEFAULT_SOURCE = "theirstack"
 
@@ -18,6 +27,19 @@ SOURCES: dict[str, Type[SourceAdapter]] = {
 }
 
 
+@dataclass(frozen=True)
+class IngestSummary:
+    postings_inserted: int = 0
+    postings_skipped: int = 0
+    # With extract_skills: new postings extracted inline, and what that found.
+    postings_extracted: int = 0
+    postings_with_skills: int = 0
+    skills_inserted: int = 0
+
+    def __add__(self, other: IngestSummary) -> IngestSummary:
+        return IngestSummary(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+
 def get_source(name: Optional[str] = None) -> SourceAdapter:
     source_name = name or DEFAULT_SOURCE
     try:
@@ -27,6 +49,34 @@ def get_source(name: Optional[str] = None) -> SourceAdapter:
     return adapter_cls()
 
 
+def parse_source_names(spec: Optional[str] = None) -> list[str]:
+    """Resolve ``None``, a single name, ``"a,b"`` or ``"all"`` into source names."""
+    if not spec:
+        return [DEFAULT_SOURCE]
+    if spec == "all":
+        return list(SOURCES)
+    names = list(dict.fromkeys(part.strip() for part in spec.split(",") if part.strip()))
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown or not names:
+        raise ValueError(f"Unknown source '{spec}'. Options: all, {', '.join(SOURCES)}")
+    return names
+
+
+def get_sources(spec: Optional[str] = None, logger=None) -> list[SourceAdapter]:
+    """Adapters for ``spec``. With ``logger``, a source that can't be set up
+    (e.g. no API key) is logged and left out, like a source whose fetch fails."""
+    adapters = []
+    for name in parse_source_names(spec):
+        if logger is None:
+            adapters.append(get_source(name))
+            continue
+        try:
+            adapters.append(get_source(name))
+        except Exception as exc:
+            logger.error("Setup failed for source=%s: %s", name, exc)
+    return adapters
+
+
 def _coerce_text(value: object) -> str:
     if value is None:
         return ""
@@ -41,21 +91,33 @@ def _coerce_text(value: object) -> str:
     return str(value)
 
 
-def _normalize_remotive(raw: dict) -> JobPosting:
-    url = _coerce_text(raw.get("url"))
+def _remotive_url(raw: dict) -> str:
+    return _coerce_text(raw.get("url")) or f"remotive://{raw.get('id', '')}"
+
+
+def _theirstack_url(raw: dict) -> str:
+    url = _coerce_text(raw.get("final_url")) or _coerce_text(raw.get("url")) or _coerce_text(raw.get("source_url"))
+    return url or f"theirstack://{raw.get('id', '')}"
+
+
+def _normalize_remotive(raw: dict) -> tuple[JobPosting, PreparedPosting]:
+    url = _remotive_url(raw)
     title = _coerce_text(raw.get("title"))
     company = _coerce_text(raw.get("company_name"))
     location = _coerce_text(raw.get("candidate_required_location")) or None
     date_posted = _coerce_text(raw.get("publication_date")) or None
     description = _coerce_text(raw.get("description"))
 
-    role_bucket = classify_role(title, description)
-    level_bucket = classify_level(title, description)
+    prepared = PreparedPosting(title, description)
+    # Senior postings are filtered out by run_pipeline, so their role is skipped.
+    # Timed stage includes cleaning, which classification triggers first.
+    with get_metrics().stage("classify", source="remotive"):
+        role_bucket, level_bucket = classify_prepared(prepared, skip_senior_role=True)
 
-    return JobPosting(
-        id=JobPosting.make_id("remotive", url or f"remotive://{raw.get('id', '')}"),
+    posting = JobPosting(
+        id=JobPosting.make_id("remotive", url),
         source="remotive",
-        url=url or f"remotive://{raw.get('id', '')}",
+        url=url,
         title=title,
         company=company,
         location=location,
@@ -66,10 +128,11 @@ def _normalize_remotive(raw: dict) -> JobPosting:
         description_raw=description,
         raw=raw,
     )
+    return posting, prepared
 
 
-def _normalize_theirstack(raw: dict) -> JobPosting:
-    url = _coerce_text(raw.get("final_url")) or _coerce_text(raw.get("url")) or _coerce_text(raw.get("source_url"))
+def _normalize_theirstack(raw: dict) -> tuple[JobPosting, PreparedPosting]:
+    url = _theirstack_url(raw)
     title = _coerce_text(raw.get("job_title"))
     company = _coerce_text(raw.get("company"))
     location = (
@@ -81,15 +144,16 @@ def _normalize_theirstack(raw: dict) -> JobPosting:
     date_posted = _coerce_text(raw.get("date_posted")) or None
     description = _coerce_text(raw.get("description"))
 
-    role_bucket = classify_role(title, description)
-    level_bucket = classify_level(title, description)
+    prepared = PreparedPosting(title, description)
+    # Senior postings are filtered out by run_pipeline, so their role is skipped.
+    # Timed stage includes cleaning, which classification triggers first.
+    with get_metrics().stage("classify", source="theirstack"):
+        role_bucket, level_bucket = classify_prepared(prepared, skip_senior_role=True)
 
-    fallback_url = f"theirstack://{raw.get('id', '')}"
-
-    return JobPosting(
-        id=JobPosting.make_id("theirstack", url or fallback_url),
+    posting = JobPosting(
+        id=JobPosting.make_id("theirstack", url),
         source="theirstack",
-        url=url or fallback_url,
+        url=url,
         title=title,
         company=company,
         location=location,
@@ -100,9 +164,10 @@ def _normalize_theirstack(raw: dict) -> JobPosting:
         description_raw=description,
         raw=raw,
     )
+    return posting, prepared
 
 
-def _normalize(source: SourceAdapter, raw: dict) -> JobPosting:
+def _normalize(source: SourceAdapter, raw: dict) -> tuple[JobPosting, PreparedPosting]:
     if source.name == "remotive":
         return _normalize_remotive(raw)
     if source.name == "theirstack":
@@ -110,45 +175,325 @@ def _normalize(source: SourceAdapter, raw: dict) -> JobPosting:
     raise ValueError(f"No normalizer for source '{source.name}'")
 
 
-def run_pipeline(
+def _raw_posting_id(source: SourceAdapter, raw: dict) -> str:
+    # Same id _normalize would produce, from the URL fields alone.
+    if source.name == "remotive":
+        return JobPosting.make_id("remotive", _remotive_url(raw))
+    if source.name == "theirstack":
+        return JobPosting.make_id("theirstack", _theirstack_url(raw))
+    raise ValueError(f"No normalizer for source '{source.name}'")
+
+
+def _extract_inline(store, postings: list[tuple[JobPosting, PreparedPosting]], cache: ExtractionCache) -> IngestSummary:
+    # Reuses the text cleaned for classification; identical reposts are matched once.
+    keys = [cache.key(prepared.text) for _, prepared in postings]
+    found, missing = cache.lookup(keys)
+    if missing:
+        prepared_by_key = {key: prepared for key, (_, prepared) in zip(keys, postings)}
+        with get_metrics().stage("skill_match", mode="inline") as stage:
+            stage.items = len(missing)
+            computed = {key: prepared_by_key[key].skill_counts for key in missing}
+        cache.put_many(computed)
+        found.update(computed)
+
+    counts = [found[key] for key in keys]
+    inserted, _, _ = store.upsert_skills_many(
+        ((posting.id, c) for (posting, _), c in zip(postings, counts)), commit=False
+    )
+    store.record_extractions(
+        ((posting.id, prepared.content_hash) for posting, prepared in postings),
+        CATALOG_FINGERPRINT,
+    )
+    store.commit()
+    return IngestSummary(
+        postings_extracted=len(postings),
+        postings_with_skills=sum(1 for c in counts if c),
+        skills_inserted=inserted,
+    )
+
+
+def _store_page(
     q: IngestionQuery,
-    adapters: Iterable[SourceAdapter],
+    adapter: SourceAdapter,
+    raw_jobs: list[dict],
     store,
     logger,
-) -> None:
-    total_inserted = 0
-    total_skipped = 0
+    *,
+    extract_skills: bool,
+    cache: ExtractionCache,
+) -> IngestSummary:
+    logger.info("Fetched %d raw jobs from source=%s", len(raw_jobs), adapter.name)
+    metrics = get_metrics()
+    metrics.add("postings_fetched_total", len(raw_jobs), source=adapter.name)
 
-    for adapter in adapters:
-        logger.info("Fetching from source=%s", adapter.name)
-        try:
-            raw_jobs = adapter.fetch(q)
-        except Exception as exc:
-            logger.error("Fetch failed for source=%s: %s", adapter.name, exc)
-            continue
-        logger.info("Fetched %d raw jobs from source=%s", len(raw_jobs), adapter.name)
-
-        postings: list[JobPosting] = []
+    # Ids come from the URL fields alone, so stored postings are dropped with
+    # one query per page before any cleaning or classification runs.
+    with metrics.stage("prefilter", source=adapter.name) as stage:
+        stage.items = len(raw_jobs)
+        raw_ids: list[str | None] = []
         for raw in raw_jobs:
             try:
-                p = _normalize(adapter, raw)
+                raw_ids.append(_raw_posting_id(adapter, raw))
+            except Exception:
+                raw_ids.append(None)  # _normalize reports the error below.
+        known = store.known_posting_ids([i for i in dict.fromkeys(raw_ids) if i is not None])
+
+    postings: list[tuple[JobPosting, PreparedPosting]] = []
+    accepted: set[str] = set()
+    known_skipped = 0
+    filtered = 0
+    with metrics.stage("normalize", source=adapter.name) as stage:
+        for raw, raw_id in zip(raw_jobs, raw_ids):
+            if raw_id in known or raw_id in accepted:
+                known_skipped += 1
+                continue
+            stage.items += 1
+            try:
+                p, prepared = _normalize(adapter, raw)
             except Exception as exc:
                 logger.warning("Skipping job from source=%s due to normalize error: %s", adapter.name, exc)
+                metrics.add("postings_invalid_total", source=adapter.name)
                 continue
 
             if not matches_query(p.role_bucket, p.level_bucket, q.role_bucket, q.level_bucket):
+                filtered += 1
                 continue
-            postings.append(p)
-
-        inserted, skipped = store.upsert_many(postings)
-        total_inserted += inserted
-        total_skipped += skipped
-        logger.info(
-            "Upserted source=%s inserted=%d skipped=%d (after filtering %d)",
-            adapter.name,
-            inserted,
-            skipped,
-            len(postings),
+            postings.append((p, prepared))
+            accepted.add(p.id)
+
+    inserted, skipped = store.upsert_many([p for p, _ in postings], known_ids=known)
+    skipped += known_skipped
+    metrics.add("postings_known_total", known_skipped, source=adapter.name)
+    metrics.add("postings_filtered_total", filtered, source=adapter.name)
+    metrics.add("postings_inserted_total", inserted, source=adapter.name)
+    extracted = IngestSummary()
+    if extract_skills and postings:
+        # Known postings never got this far, so everything here is new.
+        extracted = _extract_inline(store, postings, cache)
+    logger.info(
+        "Upserted source=%s inserted=%d skipped=%d (after filtering %d)",
+        adapter.name,
+        inserted,
+        skipped,
+        len(postings),
+    )
+    return IngestSummary(postings_inserted=inserted, postings_skipped=skipped) + extracted
+
+
+def _iter_pages(
+    adapter: SourceAdapter, q: IngestionQuery, since: Optional[FetchWatermark] = None
+) -> Iterator[list[dict]]:
+    # Duck-typed adapters that only implement ``fetch`` arrive as one page.
+    if not hasattr(adapter, "iter_pages"):
+        yield adapter.fetch(q)
+    elif since is not None:
+        yield from adapter.iter_pages(q, since=since)
+    else:
+        yield from adapter.iter_pages(q)
+
+
+def advance_watermark(mark: Optional[FetchWatermark], raw_jobs: list[dict], field: str) -> Optional[FetchWatermark]:
+    """Move ``mark`` up to the newest ``field`` date in ``raw_jobs``.
+
+    Ids posted exactly at the newest date are kept, since a day-granular
+    provider filter returns them again next time.
+    """
+    newest = mark.newest_posted_at if mark is not None else None
+    boundary = set(mark.boundary_ids) if mark is not None else set()
+    for raw in raw_jobs:
+        posted_at = parse_datetime(raw.get(field))
+        raw_id = provider_id(raw)
+        if posted_at is None or raw_id is None:
+            continue
+        if newest is None or posted_at > newest:
+            newest, boundary = posted_at, set()
+        if posted_at == newest:
+            boundary.add(raw_id)
+    if newest is None:
+        return None
+    return FetchWatermark(newest_posted_at=newest, boundary_ids=frozenset(boundary))
+
+
+class _SourceFetch:
+    """One adapter's page stream plus the watermark it would leave behind."""
+
+    def __init__(self, adapter: SourceAdapter, since: Optional[FetchWatermark], window_start: datetime) -> None:
+        self.adapter = adapter
+        self.since = since
+        self.mark = since
+        # An incremental fetch extends the window its watermark already covers.
+        self.window_start = since.window_start if since is not None else window_start
+        self.fetched = 0
+        self.failed = False
+        # Adapters without a date field can't be fetched incrementally.
+        self.date_field: Optional[str] = getattr(adapter, "POSTED_AT_FIELD", None)
+
+    def pages(self, q: IngestionQuery, logger) -> Iterator[list[dict]]:
+        # A fetch error ends this source only; pages already yielded stay stored.
+        metrics = get_metrics()
+        pages = _iter_pages(self.adapter, q, self.since)
+        while True:
+            try:
+                # HTTP, retry sleeps and response parsing for one page.
+                with metrics.stage("fetch", source=self.adapter.name) as stage:
+                    page = next(pages)
+                    stage.items = len(page)
+            except StopIteration:
+                return
+            except Exception as exc:
+                self.failed = True
+                logger.error("Fetch failed for source=%s: %s", self.adapter.name, exc)
+                return
+            self.fetched += len(page)
+            if self.date_field is not None:
+                self.mark = advance_watermark(self.mark, page, self.date_field)
+            yield page
+
+    def coverage(self, q: IngestionQuery) -> Optional[FetchWatermark]:
+        """The watermark to save after the last page, with the window it covers."""
+        if self.mark is None:
+            return None
+        # Adapters stop at max_results, so a full quota may have left older
+        # postings unfetched; such a mark only ever moves the next run forward.
+        return replace(self.mark, window_start=self.window_start, complete=self.fetched < q.max_results)
+
+
+def _produce_pages(
+    fetch: _SourceFetch,
+    q: IngestionQuery,
+    logger,
+    pages: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        for page in fetch.pages(q, logger):
+            pages.put((fetch, page))
+            if stop.is_set():
+                return
+    finally:
+        pages.put((fetch, None))
+
+
+def run_pipeline(
+    q: IngestionQuery,
+    adapters: Iterable[SourceAdapter],
+    store,
+    logger,
+    *,
+    extract_skills: bool = False,
+    max_workers: Optional[int] = None,
+    incremental: bool = False,
+) -> IngestSummary:
+    """Fetch, normalize, filter and store postings from each adapter, page by page.
+
+    Each provider page is normalized and upserted as soon as it arrives, so
+    memory stays bounded by a page and earlier pages are durable even if a
+    later request fails. With several adapters, fetches run concurrently on
+    threads (``max_workers`` defaults to one per adapter). Normalization and
+    every store call stay on the calling thread, so the store is never shared
+    across threads. A failing source is logged and skipped without affecting
+    the others.
+
+    With ``extract_skills`` newly inserted postings also get their skills
+    extracted here, from the text already cleaned for classification, so a
+    later extraction run finds them current and skips them.
+
+    With ``incremental`` each source is asked only for postings newer than its
+    stored watermark for this query, provided the fetches behind that mark
+    finished below ``max_results`` and reached back as far as this query's
+    ``days`` window; otherwise the whole window is fetched again. The
+    watermark moves forward only after a source's listing was fetched without
+    error, so a failed run is retried in full next time.
+
+    Returns the run's totals, including what inline extraction found.
+    """
+    with get_metrics().stage("ingest") as stage:
+        summary = _run_pipeline(
+            q,
+            adapters,
+            store,
+            logger,
+            extract_skills=extract_skills,
+            max_workers=max_workers,
+            incremental=incremental,
         )
+        stage.items = summary.postings_inserted
+    return summary
+
+
+def _run_pipeline(
+    q: IngestionQuery,
+    adapters: Iterable[SourceAdapter],
+    store,
+    logger,
+    *,
+    extract_skills: bool,
+    max_workers: Optional[int],
+    incremental: bool,
+) -> IngestSummary:
+    adapters = list(adapters)
+    total = IngestSummary()
+    cache = ExtractionCache()
+    query_key = q.watermark_key()
+    window_start = datetime.now(timezone.utc) - timedelta(days=q.days)
+
+    def start(adapter: SourceAdapter) -> _SourceFetch:
+        logger.info("Fetching from source=%s", adapter.name)
+        since = None
+        if incremental and getattr(adapter, "POSTED_AT_FIELD", None):
+            since = store.get_watermark(adapter.name, query_key)
+            if since is not None and not since.covers_window(window_start):
+                # A narrower or truncated earlier fetch may have skipped older postings.
+                logger.info("Full fetch source=%s: stored watermark does not cover the window", adapter.name)
+                since = None
+            if since is not None:
+                logger.info("Incremental fetch source=%s since=%s", adapter.name, since.newest_posted_at.isoformat())
+        return _SourceFetch(adapter, since, window_start)
+
+    def finish(fetch: _SourceFetch) -> None:
+        # Saved on the calling thread, after every page of the source is stored.
+        if not incremental or fetch.failed:
+            return
+        mark = fetch.coverage(q)
+        if mark is None or mark == fetch.since:
+            return
+        store.save_watermark(fetch.adapter.name, query_key, mark)
+
+    def store_page(adapter: SourceAdapter, raw_jobs: list[dict]) -> None:
+        nonlocal total
+        total += _store_page(q, adapter, raw_jobs, store, logger, extract_skills=extract_skills, cache=cache)
+
+    if len(adapters) <= 1 or max_workers == 1:
+        for adapter in adapters:
+            fetch = start(adapter)
+            for page in fetch.pages(q, logger):
+                store_page(adapter, page)
+            finish(fetch)
+    else:
+        # Bounded so fast sources cannot buffer unbounded pages ahead of the
+        # writer; each producer adds at most two items after ``stop`` is set,
+        # so the drain below always unblocks them.
+        pages: queue.Queue = queue.Queue(maxsize=2 * len(adapters))
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=max_workers or len(adapters)) as pool:
+            for adapter in adapters:
+                pool.submit(_produce_pages, start(adapter), q, logger, pages, stop)
+            try:
+                remaining = len(adapters)
+                while remaining:
+                    fetch, page = pages.get()
+                    if page is None:
+                        remaining -= 1
+                        finish(fetch)
+                        continue
+                    store_page(fetch.adapter, page)
+            finally:
+                stop.set()
+                while True:
+                    try:
+                        pages.get_nowait()
+                    except queue.Empty:
+                        break
 
-    logger.info("Pipeline complete inserted=%d skipped=%d", total_inserted, total_skipped)
+    logger.info("Pipeline complete inserted=%d skipped=%d", total.postings_inserted, total.postings_skipped)
+    return total
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+
+from .skill_extract import content_hash, count_skills, skill_text
+
+
+@dataclass(frozen=True)
+class PreparedPosting:
+    """Text views of one posting, each computed at most once.
+
+    Built during normalization so classification and skill extraction read the
+    same cleaned text: HTML is stripped before any keyword check, and the
+    extractor reuses the cleaned and lowercased copies instead of redoing them.
+    """
+
+    title: str
+    description: str
+
+    @cached_property
+    def text(self) -> str:
+        # Exactly what extraction reads, so cache keys match workflow extraction.
+        return skill_text(self.title, self.description)
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def content_hash(self) -> str:
+        return content_hash(self.title, self.description)
+
+    @cached_property
+    def skill_counts(self) -> dict[str, int]:
+        return count_skills(self.text, lowered=self.lowered)
@@ -9,6 +9,7 @@ LOG_DIR = BACKEND_ROOT / "logs"
 DEFAULT_DB_PATH = DATA_DIR / "skillpulse.db"
 DEFAULT_LOG_PATH = LOG_DIR / "ingest.log"
 DEFAULT_SAMPLE_PATH = LOG_DIR / "skills_sample.json"
+DEFAULT_HTTP_CACHE_DIR = DATA_DIR / "http_cache"
 
 
 def ensure_parent_dir(path: str | Path) -> Path:
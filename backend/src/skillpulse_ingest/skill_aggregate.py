@@ -3,12 +3,11 @@ from __future__ import annotations
 from typing import Any
 
 from .models import IngestionQuery
-from .storage_sqlite import SQLiteStore
+from .storage_sqlite import SQLiteStore, using_store
 
 
-def aggregate_skills(db: str, q: IngestionQuery, top_n: int) -> list[dict[str, Any]]:
-    store = SQLiteStore(db)
-    try:
+def aggregate_skills(db: str | SQLiteStore, q: IngestionQuery, top_n: int) -> list[dict[str, Any]]:
+    with using_store(db) as store:
         postings_count = store.get_postings_count(q)
         if postings_count == 0:
             return []
@@ -36,5 +35,3 @@ def aggregate_skills(db: str, q: IngestionQuery, top_n: int) -> list[dict[str, A
         # Stable deterministic order for frontend display and test reproducibility.
         items.sort(key=lambda x: (-x["pct"], -x["count"], x["name"]))
         return items[:top_n]
-    finally:
-        store.close()
@@ -1,45 +1,51 @@
 from __future__ import annotations
 
+import hashlib
 import html
 import re
-from collections import Counter
 
-from .skills_catalog import SKILL_PATTERNS
+from .skill_matcher import SkillMatcher
 
 _HTML_TAG_RE = re.compile(r"<[^>]+>")
-_WS_RE = re.compile(r"\s+")
 
 # Compile once at import time so extraction is fast for batch processing.
-_COMPILED_PATTERNS: dict[str, tuple[re.Pattern[str], ...]] = {
-    skill: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
-    for skill, patterns in SKILL_PATTERNS.items()
-}
+_MATCHER = SkillMatcher()
 
 
 def clean_text(text: str | None) -> str:
+    """Strip tags, decode entities and collapse whitespace.
+
+    Output is identical to ``re.sub(r"\\s+", " ", html.unescape(stripped)).strip()``.
+    Collapsing uses ``str.split`` (same whitespace definition as ``\\s``) because
+    a regex substitution visits every single space, and entity decoding is
+    skipped entirely for descriptions without ``&``.
+    """
     if not text:
         return ""
-    no_tags = _HTML_TAG_RE.sub(" ", text)
-    unescaped = html.unescape(no_tags)
-    return _WS_RE.sub(" ", unescaped).strip()
+    cleaned = _HTML_TAG_RE.sub(" ", text)
+    if "&" in cleaned:
+        cleaned = html.unescape(cleaned)
+    return " ".join(cleaned.split())
 
 
-def extract_skill_counts(title: str | None, description: str | None) -> dict[str, int]:
+def content_hash(title: str | None, description: str | None) -> str:
+    # Hash of exactly what extraction reads, used to skip unchanged postings.
+    payload = f"{title or ''}\n{description or ''}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def skill_text(title: str | None, description: str | None) -> str:
     # Title and description are combined so signals in either field are counted.
     cleaned_title = clean_text(title)
     cleaned_desc = clean_text(description)
-    text = f"{cleaned_title}\n{cleaned_desc}".strip()
-    if not text:
-        return {}
+    return f"{cleaned_title}\n{cleaned_desc}".strip()
 
-    counts: Counter[str] = Counter()
 
+def count_skills(text: str, *, lowered: str | None = None) -> dict[str, int]:
     # Skills are canonicalized by catalog key; pattern aliases map into one bucket.
-    for skill, patterns in _COMPILED_PATTERNS.items():
-        skill_count = 0
-        for pattern in patterns:
-            skill_count += len(pattern.findall(text))
-        if skill_count > 0:
-            counts[skill] = skill_count
-
-    return dict(counts)
+    # ``lowered`` must be ``text.lower()``; callers that already have it skip a copy.
+    return _MATCHER.count(text, lowered=lowered)
+
+
+def extract_skill_counts(title: str | None, description: str | None) -> dict[str, int]:
+    return count_skills(skill_text(title, description))
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Mapping
+
+from .skills_catalog import SKILL_PATTERNS
+
+_WORD_RE = re.compile(r"\w+")
+
+# Non-ASCII characters that IGNORECASE matches against ASCII word characters.
+# After this translation, lower() maps a token onto an ASCII alias word exactly
+# when the regex would have matched it.
+_IGNORECASE_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s", "K": "k"})
+
+# Expanded alias pieces are single characters or one of these markers.
+_BOUNDARY = "<b>"
+_SPACE = "<s>"
+_MAX_EXPANSIONS = 256
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _expand(pattern: str) -> tuple[set[tuple[str, ...]], bool]:
+    """Expand the simple regex subset used by the catalog into its strings.
+
+    Supports literals, ``\\b``, ``\\s`` with ``?``/``*``/``+``, ``(?:...)``
+    groups, alternation and ``?``. Lookarounds are dropped (reported via the
+    second return value), which widens the language, never narrows it.
+    """
+    pos = 0
+    saw_lookaround = False
+
+    def alternation() -> set[tuple[str, ...]]:
+        nonlocal pos
+        options = sequence()
+        while pos < len(pattern) and pattern[pos] == "|":
+            pos += 1
+            options |= sequence()
+        return options
+
+    def sequence() -> set[tuple[str, ...]]:
+        out: set[tuple[str, ...]] = {()}
+        while pos < len(pattern) and pattern[pos] not in "|)":
+            item = quantified(atom())
+            out = {a + b for a in out for b in item}
+            if len(out) > _MAX_EXPANSIONS:
+                raise _Unsupported(pattern)
+        return out
+
+    def group_body() -> set[tuple[str, ...]]:
+        nonlocal pos
+        inner = alternation()
+        if pos >= len(pattern) or pattern[pos] != ")":
+            raise _Unsupported(pattern)
+        pos += 1
+        return inner
+
+    def atom() -> set[tuple[str, ...]]:
+        nonlocal pos, saw_lookaround
+        ch = pattern[pos]
+        if ch == "(":
+            if pattern.startswith("(?:", pos):
+                pos += 3
+                return group_body()
+            if pattern.startswith(("(?=", "(?!"), pos):
+                pos += 3
+                group_body()
+                saw_lookaround = True
+                return {()}
+            if pattern.startswith("(?", pos):
+                raise _Unsupported(pattern)
+            pos += 1
+            return group_body()
+        if ch == "\\":
+            if pos + 1 >= len(pattern):
+                raise _Unsupported(pattern)
+            esc = pattern[pos + 1]
+            pos += 2
+            if esc == "b":
+                return {(_BOUNDARY,)}
+            if esc == "s":
+                return {(_SPACE,)}
+            if esc.isalnum() or not esc.isascii():
+                raise _Unsupported(pattern)
+            return {(esc,)}
+        if ch in ".^$[]{}*+?" or not ch.isascii():
+            raise _Unsupported(pattern)
+        pos += 1
+        return {(ch.lower(),)}
+
+    def quantified(item: set[tuple[str, ...]]) -> set[tuple[str, ...]]:
+        nonlocal pos
+        if pos >= len(pattern) or pattern[pos] not in "?*+{":
+            return item
+        quant = pattern[pos]
+        pos += 1
+        if pos < len(pattern) and pattern[pos] in "?+":
+            raise _Unsupported(pattern)  # lazy/possessive quantifiers
+        if quant == "?":
+            return item | {()}
+        if item == {(_SPACE,)} and quant in "*+":
+            return item if quant == "+" else item | {()}
+        raise _Unsupported(pattern)
+
+    expanded = alternation()
+    if pos != len(pattern):
+        raise _Unsupported(pattern)
+    return expanded, saw_lookaround
+
+
+def _is_word_char(piece: str) -> bool:
+    return len(piece) == 1 and (piece.isalnum() or piece == "_")
+
+
+def _leading_word(pieces: tuple[str, ...]) -> str | None:
+    """First whole token a match of ``pieces`` must start with, if determinable."""
+    if not pieces or pieces[0] != _BOUNDARY:
+        return None
+    end = 1
+    while end < len(pieces) and _is_word_char(pieces[end]):
+        end += 1
+    # The word is a whole token only if something non-word follows it.
+    if end == 1 or end == len(pieces):
+        return None
+    return "".join(pieces[1:end])
+
+
+def _plan_alias(pattern: str) -> tuple[str, frozenset[str]]:
+    """Classify an alias as ``token`` (dict lookup), ``gated`` or ``scan``.
+
+    ``token`` aliases match exactly one whole word from a finite set.
+    ``gated`` aliases need a real regex, but can only start at one of a finite
+    set of first words. ``scan`` aliases always run ``findall``.
+    """
+    try:
+        expanded, saw_lookaround = _expand(pattern)
+    except _Unsupported:
+        return "scan", frozenset()
+
+    words: set[str] = set()
+    pure_tokens = not saw_lookaround
+    for pieces in expanded:
+        word = _leading_word(pieces)
+        if word is None:
+            return "scan", frozenset()
+        words.add(word)
+        if pieces != (_BOUNDARY, *word, _BOUNDARY):
+            pure_tokens = False
+    return ("token" if pure_tokens else "gated"), frozenset(words)
+
+
+class SkillMatcher:
+    """Count catalog skills in a text, tokenizing it once.
+
+    Literal aliases (``\\bpython(?:3)?\\b``) are resolved by looking up each
+    distinct word token in a dict. Aliases that need real regex features
+    (lookaheads, multi-word phrases, ``c\\+\\+``) are only tried at tokens
+    that can start them, and only if such a token occurs at all. Counts are
+    identical to running ``findall`` for every alias of every skill.
+    """
+
+    def __init__(self, catalog: Mapping[str, tuple[str, ...]] = SKILL_PATTERNS) -> None:
+        self.skills: tuple[str, ...] = tuple(catalog)
+
+        # One entry per distinct alias, credited to every skill that lists it.
+        alias_skills: dict[str, list[str]] = {}
+        for skill, patterns in catalog.items():
+            for pattern in patterns:
+                alias_skills.setdefault(pattern, []).append(skill)
+
+        self._aliases: tuple[re.Pattern[str], ...] = tuple(re.compile(p, re.IGNORECASE) for p in alias_skills)
+        self._alias_skills: tuple[tuple[str, ...], ...] = tuple(tuple(s) for s in alias_skills.values())
+
+        token_aliases: dict[str, list[int]] = {}
+        gate_aliases: dict[str, list[int]] = {}
+        scan: list[int] = []
+        for idx, pattern in enumerate(alias_skills):
+            kind, words = _plan_alias(pattern)
+            if kind == "scan":
+                scan.append(idx)
+                continue
+            target = token_aliases if kind == "token" else gate_aliases
+            for word in words:
+                target.setdefault(word, []).append(idx)
+
+        self._token_aliases: dict[str, tuple[int, ...]] = {w: tuple(v) for w, v in token_aliases.items()}
+        self._gate_aliases: dict[str, tuple[int, ...]] = {w: tuple(v) for w, v in gate_aliases.items()}
+        self._scan: tuple[int, ...] = tuple(scan)
+
+        # Finds every whole token that can start a gated alias, in one scan.
+        # The case-sensitive variant runs on pre-lowered ASCII text, which is
+        # noticeably cheaper than an IGNORECASE alternation.
+        words = "|".join(re.escape(w) for w in sorted(gate_aliases, key=len, reverse=True))
+        self._gate_trigger = re.compile(rf"\b(?:{words})\b")
+        self._gate_trigger_ci = re.compile(rf"\b(?:{words})\b", re.IGNORECASE)
+
+    def alias_counts(self, text: str, *, lowered: str | None = None) -> list[int]:
+        counts = [0] * len(self._aliases)
+        token_aliases = self._token_aliases
+        gate_aliases = self._gate_aliases
+        gated = False
+
+        if text.isascii():
+            # ASCII lowercasing is exact for IGNORECASE, so fold the text once
+            # (or reuse a caller's lowered copy of the same text).
+            folded = lowered if lowered is not None else text.lower()
+            tokens = Counter(_WORD_RE.findall(folded))
+            trigger, trigger_text = self._gate_trigger, folded
+        else:
+            tokens = Counter()
+            for token, n in Counter(_WORD_RE.findall(text)).items():
+                tokens[token.translate(_IGNORECASE_FOLD).lower()] += n
+            trigger, trigger_text = self._gate_trigger_ci, text
+
+        for key, n in tokens.items():
+            for idx in token_aliases.get(key, ()):
+                counts[idx] += n
+            gated = gated or key in gate_aliases
+
+        if gated:
+            aliases = self._aliases
+            # Mirror findall's non-overlapping semantics per alias.
+            next_start: dict[int, int] = {}
+            for hit in trigger.finditer(trigger_text):
+                pos = hit.start()
+                for idx in gate_aliases[hit.group().translate(_IGNORECASE_FOLD).lower()]:
+                    if pos < next_start.get(idx, 0):
+                        continue
+                    m = aliases[idx].match(text, pos)
+                    if m is not None:
+                        counts[idx] += 1
+                        next_start[idx] = m.end()
+
+        for idx in self._scan:
+            counts[idx] = len(self._aliases[idx].findall(text))
+        return counts
+
+    def count(self, text: str, *, lowered: str | None = None) -> dict[str, int]:
+        if not text:
+            return {}
+        totals: Counter[str] = Counter()
+        for idx, n in enumerate(self.alias_counts(text, lowered=lowered)):
+            if n:
+                for skill in self._alias_skills[idx]:
+                    totals[skill] += n
+        # Catalog order keeps output deterministic.
+        return {skill: totals[skill] for skill in self.skills if totals[skill] > 0}
+
+
+def per_pattern_counts(text: str, catalog: Mapping[str, tuple[str, ...]] = SKILL_PATTERNS) -> dict[str, int]:
+    """Reference engine: one ``findall`` per alias. Used for parity checks."""
+    counts: dict[str, int] = {}
+    for skill, patterns in catalog.items():
+        n = sum(len(re.findall(p, text, re.IGNORECASE)) for p in patterns)
+        if n > 0:
+            counts[skill] = n
+    return counts
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from collections import OrderedDict
 
 # Ordered catalog keeps deterministic extraction output.
@@ -78,3 +80,12 @@ SKILL_PATTERNS: OrderedDict[str, tuple[str, ...]] = OrderedDict(
         "MySQL": (r"\bmysql\b",),
     }
 )
+
+
+def catalog_fingerprint(catalog: OrderedDict[str, tuple[str, ...]] = SKILL_PATTERNS) -> str:
+    # Any edit to skills, aliases, or their order invalidates stored extractions.
+    payload = json.dumps(list(catalog.items()), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+CATALOG_FINGERPRINT = catalog_fingerprint()
@@ -1,12 +1,47 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List
-from ..models import IngestionQuery
+from abc import ABC
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..dates import parse_datetime
+from ..models import FetchWatermark, IngestionQuery
+
+
+def provider_id(raw: Dict[str, Any]) -> Optional[str]:
+    value = raw.get("id")
+    return None if value is None else str(value)
+
 
 class SourceAdapter(ABC):
+    """Provider adapter. Subclasses implement ``iter_pages`` or, for older
+    adapters, ``fetch``; each is derived from the other."""
+
     name: str
+    # Raw field holding the posting date; enables incremental fetching.
+    POSTED_AT_FIELD: Optional[str] = None
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> SourceAdapter:
+        if cls.iter_pages is SourceAdapter.iter_pages and cls.fetch is SourceAdapter.fetch:
+            raise TypeError(f"Can't instantiate {cls.__name__} without iter_pages or fetch")
+        return super().__new__(cls)
+
+    def is_known(self, raw: Dict[str, Any], since: Optional[FetchWatermark]) -> bool:
+        if since is None or self.POSTED_AT_FIELD is None:
+            return False
+        return since.covers(parse_datetime(raw.get(self.POSTED_AT_FIELD)), provider_id(raw))
+
+    def iter_pages(
+        self, q: IngestionQuery, since: Optional[FetchWatermark] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield raw postings one provider page at a time. Normalization happens later.
+
+        With ``since``, postings the watermark already covers are left out.
+        """
+        yield [raw for raw in self.fetch(q) if not self.is_known(raw, since)]
+
+    def iter_jobs(self, q: IngestionQuery) -> Iterator[Dict[str, Any]]:
+        for page in self.iter_pages(q):
+            yield from page
 
-    @abstractmethod
     def fetch(self, q: IngestionQuery) -> List[Dict[str, Any]]:
         """Return raw postings as dicts. Normalization happens later."""
-        raise NotImplementedError
+        return list(self.iter_jobs(q))
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import CONTENT_CHUNK_SIZE
+from requests.utils import DEFAULT_ACCEPT_ENCODING, stream_decode_response_unicode
+
+from ..metrics import get_metrics
+from .response_cache import PendingBody, ReplayMiss, ResponseCache, cache_key
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_POOL_SIZE = 10
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _status(exc: requests.RequestException) -> Optional[int]:
+    resp = exc.response if isinstance(exc, requests.HTTPError) else None
+    return resp.status_code if resp is not None else None
+
+
+def _retry_after(exc: requests.RequestException) -> float:
+    headers = getattr(exc.response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        return 0.0  # HTTP-date form is not worth parsing here.
+
+
+def _read_through(
+    resp: requests.Response,
+    on_chunk: Callable[[bytes], None],
+    on_done: Optional[Callable[[bool], None]] = None,
+    *,
+    drain_on_close: bool = False,
+) -> requests.Response:
+    """Hook the chunks of a streamed ``resp`` as its caller reads them.
+
+    Streaming callers read through ``iter_content`` (``resp.content`` does
+    too). ``on_done`` gets True if the body was read to the end, False if
+    reading stopped early. With ``drain_on_close``, closing ``resp`` before
+    the end first reads the rest of the body through ``on_chunk``.
+    """
+    read = resp.iter_content
+    close = resp.close
+    reading: list[Iterator[bytes]] = []  # the latest read, while it is unfinished
+    done = False
+
+    def hooked(chunk_size: int) -> Iterator[bytes]:
+        nonlocal done
+        complete = False
+        try:
+            for chunk in read(chunk_size):
+                on_chunk(chunk)
+                yield chunk
+            complete = True
+        finally:
+            reading.clear()
+            done = True
+            if on_done is not None:
+                on_done(complete)
+
+    def iter_content(chunk_size: int = 1, decode_unicode: bool = False) -> Iterator[Any]:
+        chunks = hooked(chunk_size)
+        reading[:] = [chunks]
+        return stream_decode_response_unicode(chunks, resp) if decode_unicode else chunks
+
+    def drain_and_close() -> None:
+        try:
+            if not done:
+                for _ in reading[0] if reading else hooked(CONTENT_CHUNK_SIZE):
+                    pass
+        except requests.RequestException:
+            pass  # on_done has seen the body end early
+        finally:
+            close()
+
+    resp.iter_content = iter_content  # type: ignore[method-assign]
+    if drain_on_close:
+        resp.close = drain_and_close  # type: ignore[method-assign]
+    return resp
+
+
+def is_retryable(exc: requests.RequestException) -> bool:
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        return _status(exc) in RETRYABLE_STATUS
+    return False
+
+
+class HttpClient:
+    """Pooled keep-alive sessions (one per host) plus the shared retry loop.
+
+    Every adapter request goes through ``request``, so paging through a
+    provider reuses one TCP/TLS connection instead of a handshake per call.
+    ``Accept-Encoding`` lists exactly the codings urllib3 can decode here
+    (gzip/deflate, plus br when a brotli package is installed).
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = MAX_RETRIES,
+        backoff_seconds: float = BACKOFF_SECONDS,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.cache = cache
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._sessions: dict[str, requests.Session] = {}
+        self._resume_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _pause_host(self, host: str, seconds: float) -> None:
+        # A 429 on one request holds back every request to that host.
+        with self._lock:
+            self._resume_at[host] = max(self._resume_at.get(host, 0.0), time.monotonic() + seconds)
+
+    def _wait_for_host(self, host: str) -> None:
+        with self._lock:
+            delay = self._resume_at.get(host, 0.0) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def session_for(self, url: str) -> requests.Session:
+        host = self._host(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers["Accept-Encoding"] = DEFAULT_ACCEPT_ENCODING
+                # Retries live in request(); urllib3's own retries stay off.
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method: str, url: str, *, source: str, **kwargs: Any) -> requests.Response:
+        """Send through the response cache, if one is set, then ``_send``."""
+        cache = self.cache
+        if cache is None:
+            return self._send(method, url, source=source, **kwargs)
+
+        metrics = get_metrics()
+        stream = bool(kwargs.get("stream"))
+        key = cache_key(method, url, kwargs.get("params"), kwargs.get("json"))
+        entry = cache.lookup(key)
+        if cache.replay:
+            if entry is None:
+                raise ReplayMiss(f"No cached response for {method} {url}")
+            metrics.add("http_cache_total", source=source, result="replay")
+            return cache.to_response(entry, stream=stream)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                metrics.add("http_cache_total", source=source, result="hit")
+                return cache.to_response(entry, stream=stream)
+            kwargs["headers"] = {**cache.validators(entry), **(kwargs.get("headers") or {})}
+
+        resp = self._send(method, url, source=source, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            metrics.add("http_cache_total", source=source, result="revalidated")
+            resp.close()
+            return cache.to_response(cache.refresh(key, entry), stream=stream)
+        metrics.add("http_cache_total", source=source, result="miss")
+        if resp.status_code == 200:
+            if stream:
+                # Copied into the cache as the caller reads it. A caller that
+                # stops early gets control back at once, but closing the
+                # response reads the rest, so the full body is still cached;
+                # a body cut short by an error is not.
+                pending = cache.begin(key, resp)
+                return _read_through(
+                    resp,
+                    pending.write,
+                    lambda complete: pending.commit() if complete else pending.discard(),
+                    drain_on_close=True,
+                )
+            cache.store(key, resp)
+        return resp
+
+    def _send(self, method: str, url: str, *, source: str, **kwargs: Any) -> requests.Response:
+        """Send with exponential backoff on timeouts, connection errors and
+        HTTP 429/5xx; other errors are raised immediately.
+
+        A 429 pauses all requests to the host (including other threads' in-flight
+        retries) for the backoff delay, or ``Retry-After`` seconds if longer.
+        """
+        metrics = get_metrics()
+        host = self._host(url)
+        session = self.session_for(url)
+        kwargs.setdefault("timeout", self.timeout)
+        last_exc: requests.RequestException | None = None
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_host(host)
+            try:
+                start = time.perf_counter()
+                resp = session.request(method, url, **kwargs)
+                metrics.observe("http_request_seconds", time.perf_counter() - start, source=source)
+                resp.raise_for_status()
+                if metrics.enabled:
+                    if kwargs.get("stream"):
+                        # Streamed bodies are counted as the caller reads them.
+                        return _read_through(
+                            resp, lambda chunk: metrics.add("http_bytes_total", len(chunk), source=source)
+                        )
+                    metrics.add("http_bytes_total", len(resp.content), source=source)
+                return resp
+            except requests.RequestException as exc:
+                last_exc = exc
+                metrics.add("http_errors_total", source=source, error=type(exc).__name__)
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    raise
+                if exc.response is not None:
+                    # Frees the pooled connection now, not when the response is collected.
+                    exc.response.close()
+                delay = self.backoff_seconds * (2 ** attempt)
+                if _status(exc) == 429:
+                    delay = max(delay, _retry_after(exc))
+                    # Slept off by _wait_for_host at the top of the next attempt.
+                    self._pause_host(host, delay)
+                else:
+                    time.sleep(delay)
+                metrics.add("http_retry_sleep_seconds_total", delay, source=source)
+        assert last_exc is not None
+        raise last_exc
+
+    def get(self, url: str, *, source: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, source=source, **kwargs)
+
+    def post(self, url: str, *, source: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, source=source, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_shared: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> HttpClient:
+    """Process-wide client, so every adapter instance shares the same pools."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClient()
+        return _shared
+
+
+@contextmanager
+def caching(cache: Optional[ResponseCache]) -> Iterator[HttpClient]:
+    """Route the shared client through ``cache`` for the duration of a run.
+
+    With ``cache=None`` the shared client is left as it is.
+    """
+    client = shared_client()
+    if cache is None:
+        yield client
+        return
+
+    previous, client.cache = client.cache, cache
+    try:
+        yield client
+    finally:
+        client.cache = previous
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+# Large enough that a typical posting (a few KB of HTML) decodes in one try.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer over a chunk iterator, refilled only when a value is cut off."""
+
+    def __init__(self, chunks: Iterable[bytes | str]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = chunk if isinstance(chunk, str) else self._utf8.decode(chunk)
+            if text:
+                # Drop what was consumed so the buffer stays about one chunk long.
+                self.buf = self.buf[self.pos :] + text
+                self.pos = 0
+                return True
+        self.buf = self.buf[self.pos :] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos} of JSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off mid-value; at EOF it is a real error.
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk.
+            if end == len(self.buf) and not self.eof and isinstance(value, (int, float)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(chunks: Iterable[bytes | str], key: str) -> Iterator[Any]:
+    """Yield the elements of the top-level ``key`` array one at a time.
+
+    Only one element (plus about a chunk of unread text) is held in memory,
+    so closing the stream early skips the rest of the document. Other
+    top-level values are decoded and discarded; a missing key yields nothing.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                if reader.peek() == "]":
+                    return
+                reader.expect(",")
+        reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
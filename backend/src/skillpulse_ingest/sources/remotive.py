@@ -1,72 +1,58 @@
 from __future__ import annotations
 
-import time
-from typing import Any, Dict, List
+import os
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime, timezone
-from dateutil import parser as dtparser
-import requests
 
 from .base import SourceAdapter
-from ..models import IngestionQuery
+from .http_client import HttpClient, shared_client
+from .json_stream import STREAM_CHUNK_SIZE, iter_array_items
+from ..dates import to_epoch
+from ..models import FetchWatermark, IngestionQuery
 
 class RemotiveAdapter(SourceAdapter):
     name = "remotive"
     BASE = "https://remotive.com/api/remote-jobs"
-    MAX_RETRIES = 3
-    BACKOFF_SECONDS = 1.0
-
-    @staticmethod
-    def _is_retryable(exc: requests.RequestException) -> bool:
-        if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
-            return True
-        if isinstance(exc, requests.HTTPError):
-            resp = exc.response
-            status = resp.status_code if resp is not None else None
-            return status in {429, 500, 502, 503, 504}
-        return False
-
-    def _get_with_retry(self, params: dict) -> requests.Response:
-        last_exc: requests.RequestException | None = None
-        for attempt in range(self.MAX_RETRIES + 1):
-            try:
-                resp = requests.get(self.BASE, params=params, timeout=30)
-                resp.raise_for_status()
-                return resp
-            except requests.RequestException as exc:
-                last_exc = exc
-                if attempt >= self.MAX_RETRIES or not self._is_retryable(exc):
-                    raise
-                time.sleep(self.BACKOFF_SECONDS * (2 ** attempt))
-        assert last_exc is not None
-        raise last_exc
-
-    def fetch(self, q: IngestionQuery) -> List[Dict[str, Any]]:
+    POSTED_AT_FIELD = "publication_date"
+    PAGE_SIZE = 100
+
+    def __init__(self, client: Optional[HttpClient] = None, base_url: Optional[str] = None) -> None:
+        self.client = client or shared_client()
+        # Overridable so a local stand-in server can be used (see fake_source.py).
+        self.BASE = base_url or os.getenv("REMOTIVE_BASE_URL") or self.BASE
+
+    def iter_pages(
+        self, q: IngestionQuery, since: Optional[FetchWatermark] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # Remotive returns every match in one response. It is parsed as a stream
+        # and handed on in pages of PAGE_SIZE, so memory follows max_results,
+        # not the feed size; the connection is closed once max_results is reached.
+        # It has no date filter either; postings the watermark covers are dropped here.
         # Remotive supports some filtering like "search" and "category"
         # We'll use role_bucket as a weak search term.
         params = {}
         if q.role_bucket != "any":
             params["search"] = q.role_bucket
 
-        r = self._get_with_retry(params)
-        data = r.json()
-        jobs = data.get("jobs", [])
-
         # best-effort time window filter
         cutoff = datetime.now(timezone.utc).timestamp() - (q.days * 86400)
-        out: List[Dict[str, Any]] = []
-        for j in jobs:
-            # Remotive uses publication_date
-            dt = j.get("publication_date")
-            keep = True
-            if dt:
-                try:
-                    ts = dtparser.parse(dt).timestamp()
-                    keep = ts >= cutoff
-                except Exception:
-                    keep = True
-            if keep:
-                out.append(j)
-            if len(out) >= q.max_results:
-                break
-
-        return out
+        kept = 0
+        page: List[Dict[str, Any]] = []
+        with self.client.get(self.BASE, source=self.name, params=params, stream=True) as r:
+            chunks = r.iter_content(STREAM_CHUNK_SIZE)
+            for j in iter_array_items(chunks, "jobs"):
+                if self.is_known(j, since):
+                    continue
+                # Remotive uses publication_date; undated or unparseable jobs are kept.
+                ts = to_epoch(j.get("publication_date"))
+                if ts is None or ts >= cutoff:
+                    page.append(j)
+                    kept += 1
+                if kept >= q.max_results:
+                    break
+                if len(page) >= self.PAGE_SIZE:
+                    yield page
+                    page = []
+
+        if page:
+            yield page
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_COPY_CHUNK_SIZE = 64 * 1024
+
+# Only headers that still mean something when the body is served again.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ReplayMiss(requests.RequestException):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def cache_key(method: str, url: str, params: Any = None, json_body: Any = None) -> str:
+    """Request identity: method, URL, query params and JSON body. Headers
+    (including ``Authorization``) are left out so keys never hold secrets."""
+    identity = {"method": method.upper(), "url": url, "params": params or {}, "json": json_body}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class _BodyFile(io.BufferedReader):
+    # Response.close() only closes an unconsumed raw stream, but always calls
+    # release_conn(), so the file is released either way.
+    def release_conn(self) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    body_sha256: str
+    stored_at: float
+
+
+class PendingBody:
+    """A response body on its way into the cache, written as it is read.
+
+    Nothing is cached until ``commit``, so a body abandoned part way through
+    (``discard``) never turns into a truncated entry.
+    """
+
+    def __init__(self, cache: ResponseCache, key: str, resp: requests.Response) -> None:
+        self._cache = cache
+        self._key = key
+        self._url = resp.url
+        self._status_code = resp.status_code
+        self._headers = {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers}
+        self._tmp = cache._bodies / f"{key}.{threading.get_ident()}.tmp"
+        self._fh = self._tmp.open("wb")
+        self._digest = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._fh.write(chunk)
+
+    def commit(self) -> CachedResponse:
+        self._fh.close()
+        entry = CachedResponse(
+            url=self._url,
+            status_code=self._status_code,
+            headers=self._headers,
+            body_sha256=self._digest.hexdigest(),
+            stored_at=time.time(),
+        )
+        self._cache._commit(self._key, entry, self._tmp)
+        return entry
+
+    def discard(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class ResponseCache:
+    """On-disk HTTP response cache.
+
+    Bodies are content-addressed (``bodies/<sha256>``), so identical payloads
+    behind different requests are stored once; ``entries/<key>.json`` maps a
+    request to its body and validators. Entries younger than ``ttl_seconds``
+    are served without a request, older ones are revalidated with
+    ``If-None-Match``/``If-Modified-Since``. Once bodies exceed ``max_bytes``
+    the least recently used entries are evicted. With ``replay`` the cache is
+    the only source: nothing is sent and a missing entry raises ``ReplayMiss``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        replay: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self._entries = self.directory / "entries"
+        self._bodies = self.directory / "bodies"
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self._entries / f"{key}.json"
+
+    def _body_path(self, sha: str) -> Path:
+        return self._bodies / sha
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        path = self._entry_path(key)
+        try:
+            entry = CachedResponse(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        if not self._body_path(entry.body_sha256).exists():
+            return None
+        # Entry mtime is the LRU clock.
+        os.utime(path)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl_seconds
+
+    @staticmethod
+    def validators(entry: CachedResponse) -> dict[str, str]:
+        headers = {}
+        if "ETag" in entry.headers:
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if "Last-Modified" in entry.headers:
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+    def to_response(self, entry: CachedResponse, *, stream: bool = False) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = entry.status_code
+        resp.url = entry.url
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.encoding = "utf-8"
+        path = self._body_path(entry.body_sha256)
+        if stream:
+            # iter_content() reads the file lazily; close() releases it.
+            resp.raw = _BodyFile(io.FileIO(path, "rb"))
+        else:
+            resp._content = path.read_bytes()
+        return resp
+
+    def begin(self, key: str, resp: requests.Response) -> PendingBody:
+        """Start copying ``resp``'s body into the cache; see ``PendingBody``."""
+        self._bodies.mkdir(parents=True, exist_ok=True)
+        return PendingBody(self, key, resp)
+
+    def store(self, key: str, resp: requests.Response) -> CachedResponse:
+        # Copied to disk chunk by chunk, so a streamed body is never held whole.
+        pending = self.begin(key, resp)
+        try:
+            for chunk in resp.iter_content(_COPY_CHUNK_SIZE):
+                pending.write(chunk)
+        except BaseException:
+            pending.discard()
+            raise
+        return pending.commit()
+
+    def _commit(self, key: str, entry: CachedResponse, tmp: Path) -> None:
+        with self._lock:
+            if self._body_path(entry.body_sha256).exists():
+                tmp.unlink()
+            else:
+                os.replace(tmp, self._body_path(entry.body_sha256))
+            self._write_atomic(self._entry_path(key), json.dumps(asdict(entry)).encode("utf-8"))
+            self._evict()
+
+    def refresh(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Restart the TTL after a ``304 Not Modified``."""
+        entry = replace(entry, stored_at=time.time())
+        with self._lock:
+            self._write_atomic(self._entry_path(key), json.dumps(asdict(entry)).encode("utf-8"))
+        return entry
+
+    def _evict(self) -> None:
+        bodies = {p.name: p.stat().st_size for p in self._bodies.iterdir() if not p.name.endswith(".tmp")}
+        total = sum(bodies.values())
+        if total <= self.max_bytes:
+            return
+
+        entries = []
+        for path in self._entries.glob("*.json"):
+            try:
+                sha = json.loads(path.read_text(encoding="utf-8"))["body_sha256"]
+                entries.append((path.stat().st_mtime, path, sha))
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+        entries.sort(key=lambda e: e[0])
+
+        refs: dict[str, int] = {}
+        for _, _, sha in entries:
+            refs[sha] = refs.get(sha, 0) + 1
+        # Bodies no entry points at go first.
+        for sha in [s for s in bodies if s not in refs]:
+            self._body_path(sha).unlink(missing_ok=True)
+            total -= bodies.pop(sha)
+
+        for _, path, sha in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            refs[sha] -= 1
+            if refs[sha] == 0 and sha in bodies:
+                self._body_path(sha).unlink(missing_ok=True)
+                total -= bodies.pop(sha)
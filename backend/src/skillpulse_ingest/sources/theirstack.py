@@ -2,102 +2,140 @@ from __future__ import annotations
 
 import os
 import re
-import time
-from typing import Any, Dict, List, Optional
-
-import requests
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 
 from .base import SourceAdapter
-from ..models import IngestionQuery
+from .http_client import HttpClient, shared_client
+from ..dates import parse_datetime
+from ..models import FetchWatermark, IngestionQuery
+
+
+DEFAULT_PAGE_CONCURRENCY = 4
 
 
 class TheirstackAdapter(SourceAdapter):
     name = "theirstack"
     BASE = "https://api.theirstack.com/v1"
-    MAX_RETRIES = 3
-    BACKOFF_SECONDS = 1.0
-
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    PAGE_SIZE = 50
+    POSTED_AT_FIELD = "date_posted"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Optional[HttpClient] = None,
+        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        base_url: Optional[str] = None,
+    ) -> None:
         raw_key = api_key if api_key is not None else os.getenv("THEIRSTACK_API_KEY")
         self.api_key = raw_key.strip() if isinstance(raw_key, str) else raw_key
         if not self.api_key:
             raise ValueError("THEIRSTACK_API_KEY is required for TheirstackAdapter")
-
-    @staticmethod
-    def _is_retryable(exc: requests.RequestException) -> bool:
-        if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
-            return True
-        if isinstance(exc, requests.HTTPError):
-            resp = exc.response
-            status = resp.status_code if resp is not None else None
-            return status in {429, 500, 502, 503, 504}
-        return False
-
-    def _post_with_retry(self, payload: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
-        last_exc: requests.RequestException | None = None
-        for attempt in range(self.MAX_RETRIES + 1):
-            try:
-                resp = requests.post(
-                    f"{self.BASE}/jobs/search",
-                    json=payload,
-                    headers=headers,
-                    timeout=30,
-                )
-                resp.raise_for_status()
-                return resp
-            except requests.RequestException as exc:
-                last_exc = exc
-                if attempt >= self.MAX_RETRIES or not self._is_retryable(exc):
-                    raise
-                time.sleep(self.BACKOFF_SECONDS * (2 ** attempt))
-        assert last_exc is not None
-        raise last_exc
-
-    def fetch(self, q: IngestionQuery) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        page = 0
-
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-
-        location_pattern = None
-        if q.location:
-            # TheirStack expects regex patterns for location filters.
-            location_pattern = re.escape(q.location)
+        self.client = client or shared_client()
+        self.page_concurrency = page_concurrency
+        # Overridable so a local stand-in server can be used (see fake_source.py).
+        self.BASE = (base_url or os.getenv("THEIRSTACK_BASE_URL") or self.BASE).rstrip("/")
+
+    def _search_payload(self, q: IngestionQuery, since: Optional[FetchWatermark] = None) -> Dict[str, Any]:
+        # Newest first, so max_results keeps the latest postings and an
+        # incremental fetch reaches already-seen postings last.
+        payload: Dict[str, Any] = {
+            "posted_at_max_age_days": q.days,
+            "order_by": [{"desc": True, "field": "date_posted"}],
+        }
+        if since is not None:
+            # The filter is day-granular; is_known() trims the rest of the day.
+            payload["posted_at_gte"] = since.newest_posted_at.date().isoformat()
+
+        if q.role_bucket != "any":
+            payload["job_title_or"] = [q.role_bucket]
 
         seniority_or = None
         if q.level_bucket == "entry":
             seniority_or = ["intern", "entry", "junior"]
         elif q.level_bucket == "junior_mid":
             seniority_or = ["junior", "mid_level"]
+        if seniority_or:
+            payload["job_seniority_or"] = seniority_or
 
-        while len(out) < q.max_results:
-            remaining = q.max_results - len(out)
-            limit = min(50, remaining)
-
-            payload: Dict[str, Any] = {
-                "page": page,
-                "limit": limit,
-                "posted_at_max_age_days": q.days,
-            }
-
-            if q.role_bucket != "any":
-                payload["job_title_or"] = [q.role_bucket]
-            if seniority_or:
-                payload["job_seniority_or"] = seniority_or
-            if location_pattern:
-                payload["job_location_pattern_or"] = [location_pattern]
-
-            r = self._post_with_retry(payload, headers)
-            data = r.json()
-            jobs = data.get("data", []) or data.get("jobs", []) or []
-
-            if not jobs:
-                break
-
-            out.extend(jobs)
+        if q.location:
+            # TheirStack expects regex patterns for location filters.
+            payload["job_location_pattern_or"] = [re.escape(q.location)]
 
-            if len(jobs) < limit:
-                break
-            page += 1
+        return payload
 
-        return out[: q.max_results]
+    def _fetch_page(self, base: Dict[str, Any], page: int, limit: int) -> List[Dict[str, Any]]:
+        payload = {"page": page, "limit": limit, **base}
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        r = self.client.post(f"{self.BASE}/jobs/search", source=self.name, json=payload, headers=headers)
+        data = r.json()
+        return data.get("data", []) or data.get("jobs", []) or []
+
+    def _older_than(self, raw: Dict[str, Any], since: FetchWatermark) -> bool:
+        posted_at = parse_datetime(raw.get(self.POSTED_AT_FIELD))
+        return posted_at is not None and posted_at < since.newest_posted_at
+
+    def _page_request(self, start: int, remaining: int) -> tuple[int, int]:
+        """(page, limit) for the postings from ``start``.
+
+        The API offsets results by ``page * limit``, so a smaller last page only
+        lines up when its limit divides ``start``; otherwise a full page is
+        requested and the surplus dropped.
+        """
+        if remaining < self.PAGE_SIZE and start % remaining == 0:
+            return start // remaining, remaining
+        return start // self.PAGE_SIZE, self.PAGE_SIZE
+
+    def iter_pages(
+        self, q: IngestionQuery, since: Optional[FetchWatermark] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # Page sizes are known up front (every page before the last is full),
+        # so up to ``page_concurrency`` requests run ahead of the consumer.
+        # Pages are still yielded in page order, and the first short or empty
+        # page ends the listing; anything fetched past it is discarded.
+        # With ``since``, covered postings are dropped, and the first one older
+        # than the watermark ends it too. Boundary-day postings share a date
+        # and come back in any order, so a known one of those ends nothing.
+        limits = [self._page_request(start, q.max_results - start) for start in range(0, q.max_results, self.PAGE_SIZE)]
+        if not limits:
+            return
+
+        base = self._search_payload(q, since)
+        workers = max(1, min(self.page_concurrency, len(limits)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        in_flight: deque[tuple[Future, int]] = deque()
+        next_page = 0
+
+        def submit() -> None:
+            nonlocal next_page
+            if next_page < len(limits):
+                page, limit = limits[next_page]
+                in_flight.append((pool.submit(self._fetch_page, base, page, limit), limit))
+                next_page += 1
+
+        fetched = 0
+        try:
+            for _ in range(workers):
+                submit()
+            while in_flight:
+                future, limit = in_flight.popleft()
+                jobs = future.result()
+                if not jobs:
+                    break
+
+                short_page = len(jobs) < limit
+                fresh = [j for j in jobs if not self.is_known(j, since)]
+                past_mark = since is not None and any(self._older_than(j, since) for j in jobs)
+                jobs = fresh[: q.max_results - fetched]
+                fetched += len(jobs)
+                done = short_page or past_mark
+                if not done:
+                    submit()
+                if jobs:
+                    yield jobs
+
+                if done:
+                    break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,30 +1,69 @@
 from __future__ import annotations
 
+import json
 import sqlite3
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
-from .models import IngestionQuery, JobPosting
+from .dates import to_epoch
+from .locations import normalize_location, parse_location
+from .metrics import get_metrics
+from .models import FetchWatermark, IngestionQuery, JobPosting
+from .skill_extract import content_hash
 
-SCHEMA = """
-CREATE TABLE IF NOT EXISTS postings (
+# The hot table only holds what filters, counts and joins read; the heavy
+# description/raw_json payloads live compressed in posting_blobs.
+_POSTINGS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
   id TEXT PRIMARY KEY,
   source TEXT NOT NULL,
   url TEXT NOT NULL,
   title TEXT NOT NULL,
   company TEXT NOT NULL,
   location TEXT,
+  location_id INTEGER,
   date_posted TEXT,
   retrieved_at TEXT NOT NULL,
   role_bucket TEXT NOT NULL,
   level_bucket TEXT NOT NULL,
-  description_raw TEXT NOT NULL,
-  raw_json TEXT NOT NULL
+  content_hash TEXT NOT NULL,
+  posted_ts INTEGER,
+  retrieved_ts INTEGER
+)
+"""
+
+_POSTINGS_COLUMNS = (
+    "id, source, url, title, company, location, location_id, date_posted, retrieved_at, "
+    "role_bucket, level_bucket, content_hash, posted_ts, retrieved_ts"
+)
+
+SCHEMA = _POSTINGS_TABLE.format(name="postings") + """;
+
+-- Parsed locations; location_aliases maps every location string seen
+-- (normalized) to one of them.
+CREATE TABLE IF NOT EXISTS locations (
+  id INTEGER PRIMARY KEY,
+  key TEXT NOT NULL UNIQUE,
+  city TEXT,
+  state TEXT,
+  country TEXT,
+  remote INTEGER NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_postings_role ON postings(role_bucket);
-CREATE INDEX IF NOT EXISTS idx_postings_level ON postings(level_bucket);
-CREATE INDEX IF NOT EXISTS idx_postings_date ON postings(date_posted);
+CREATE INDEX IF NOT EXISTS idx_locations_city_state ON locations(city, state);
+
+CREATE TABLE IF NOT EXISTS location_aliases (
+  alias TEXT PRIMARY KEY,
+  location_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS posting_blobs (
+  posting_id TEXT PRIMARY KEY,
+  description_z BLOB NOT NULL,
+  raw_json_z BLOB NOT NULL
+);
 
 CREATE TABLE IF NOT EXISTS posting_skills (
   posting_id TEXT NOT NULL,
@@ -33,124 +72,526 @@ CREATE TABLE IF NOT EXISTS posting_skills (
   PRIMARY KEY (posting_id, skill)
 );
 
-CREATE INDEX IF NOT EXISTS idx_posting_skills_skill ON posting_skills(skill);
-CREATE INDEX IF NOT EXISTS idx_posting_skills_posting ON posting_skills(posting_id);
+
+CREATE TABLE IF NOT EXISTS posting_extractions (
+  posting_id TEXT PRIMARY KEY,
+  content_hash TEXT NOT NULL,
+  catalog_fingerprint TEXT NOT NULL,
+  extracted_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS extraction_cache (
+  content_key TEXT NOT NULL,
+  catalog_fingerprint TEXT NOT NULL,
+  skills_json TEXT NOT NULL,
+  PRIMARY KEY (content_key, catalog_fingerprint)
+);
+
+CREATE TABLE IF NOT EXISTS fetch_watermarks (
+  source TEXT NOT NULL,
+  query_key TEXT NOT NULL,
+  newest_posted_at TEXT NOT NULL,
+  boundary_ids_json TEXT NOT NULL,
+  window_start TEXT,
+  complete INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (source, query_key)
+);
 """
 
+# Epoch-second copies of date_posted/retrieved_at, so time windows are
+# integer range scans instead of comparisons between ISO strings.
+_EPOCH_COLUMNS = ("posted_ts", "retrieved_ts")
+
+# Created after the column migrations, since older tables lack some indexed columns.
+# Each postings index leads with what one _posting_where_clause shape can
+# seek on and carries the remaining filter columns plus company and id, so
+# counts, distinct companies and the skills join never touch table rows:
+#   role (+ level) given  -> idx_postings_role_level
+#   level only            -> idx_postings_level_time
+#   neither               -> idx_postings_time
+#   location given        -> idx_postings_location_time
+_QUERY_INDEXES = """
+DROP INDEX IF EXISTS idx_postings_role;
+DROP INDEX IF EXISTS idx_postings_level;
+DROP INDEX IF EXISTS idx_postings_date;
+DROP INDEX IF EXISTS idx_postings_retrieved_ts;
+DROP INDEX IF EXISTS idx_postings_location;
+DROP INDEX IF EXISTS idx_posting_skills_skill;
+DROP INDEX IF EXISTS idx_posting_skills_posting;
+CREATE INDEX IF NOT EXISTS idx_postings_role_level ON postings(role_bucket, level_bucket, retrieved_ts, company, id);
+CREATE INDEX IF NOT EXISTS idx_postings_level_time ON postings(level_bucket, retrieved_ts, role_bucket, company, id);
+CREATE INDEX IF NOT EXISTS idx_postings_time ON postings(retrieved_ts, level_bucket, role_bucket, company, id);
+CREATE INDEX IF NOT EXISTS idx_postings_location_time ON postings(location_id, retrieved_ts, role_bucket, level_bucket, company, id);
+CREATE INDEX IF NOT EXISTS idx_postings_posted_ts ON postings(posted_ts);
+-- The skills join probes by posting and reads count and skill from the index.
+CREATE INDEX IF NOT EXISTS idx_posting_skills_posting_count ON posting_skills(posting_id, count, skill);
+"""
+
+# Level 1 compresses HTML about as well as the default at several times the speed.
+_ZLIB_LEVEL = 1
+
+
+def compress_text(text: str | None) -> bytes:
+    return zlib.compress((text or "").encode("utf-8"), _ZLIB_LEVEL)
+
+
+def decompress_text(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
 
 class SQLiteStore:
+    """SQLite-backed posting store; use as a context manager to close it.
+
+    Opening a database already at ``SCHEMA_VERSION`` runs no DDL at all;
+    older ones are brought up to date by ``_MIGRATIONS``, in order.
+    """
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        # Normalized location string -> locations.id, filled as postings arrive.
+        self._location_ids: dict[str, int] = {}
+        self._migrate()
+
+    def __enter__(self) -> SQLiteStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _migrate(self) -> None:
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.db_path} has schema version {version}; this code supports up to {SCHEMA_VERSION}")
+        for number, migration in enumerate(_MIGRATIONS[version:], start=version + 1):
+            migration(self)
+            # Recorded with the migration's own writes, so a failed step reruns.
+            self.conn.execute(f"PRAGMA user_version = {number}")
+            self.conn.commit()
+
+    def _create_schema(self) -> None:
+        # WAL mode is stored in the database file, so it is only set here.
         self.conn.execute("PRAGMA journal_mode=WAL;")
         self.conn.executescript(SCHEMA)
-        self.conn.commit()
 
-    def upsert_many(self, postings: Iterable[JobPosting]) -> tuple[int, int]:
-        inserted = 0
-        skipped = 0
-        cur = self.conn.cursor()
-        for p in postings:
-            try:
-                cur.execute(
-                    """
-                    INSERT INTO postings (
-                      id, source, url, title, company, location, date_posted, retrieved_at,
-                      role_bucket, level_bucket, description_raw, raw_json
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        p.id,
-                        p.source,
-                        p.url,
-                        p.title,
-                        p.company,
-                        p.location,
-                        p.date_posted,
-                        p.retrieved_at,
-                        p.role_bucket,
-                        p.level_bucket,
-                        p.description_raw,
-                        __import__("json").dumps(p.raw, ensure_ascii=False),
-                    ),
-                )
-                inserted += 1
-            except sqlite3.IntegrityError:
-                skipped += 1
-        self.conn.commit()
+    def _create_query_indexes(self) -> None:
+        self.conn.executescript(_QUERY_INDEXES)
+
+    def _add_epoch_columns(self) -> None:
+        # Databases created before the epoch columns get them added and backfilled.
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(postings)")}
+        missing = [c for c in _EPOCH_COLUMNS if c not in existing]
+        for column in missing:
+            self.conn.execute(f"ALTER TABLE postings ADD COLUMN {column} INTEGER")
+        if missing:
+            rows = self.conn.execute("SELECT id, date_posted, retrieved_at FROM postings").fetchall()
+            self.conn.executemany(
+                "UPDATE postings SET posted_ts = ?, retrieved_ts = ? WHERE id = ?",
+                [(to_epoch(r["date_posted"]), to_epoch(r["retrieved_at"]), r["id"]) for r in rows],
+            )
+
+    def _add_watermark_coverage(self) -> None:
+        # Marks saved before coverage was recorded read as incomplete, so the
+        # next incremental run for them does one full fetch.
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(fetch_watermarks)")}
+        if "window_start" not in existing:
+            self.conn.execute("ALTER TABLE fetch_watermarks ADD COLUMN window_start TEXT")
+        if "complete" not in existing:
+            self.conn.execute("ALTER TABLE fetch_watermarks ADD COLUMN complete INTEGER NOT NULL DEFAULT 0")
+
+    def _add_location_ids(self) -> None:
+        # Older databases get location_id, resolved from the stored location text.
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(postings)")}
+        if "location_id" in existing:
+            return
+        self.conn.execute("ALTER TABLE postings ADD COLUMN location_id INTEGER")
+        texts = [row[0] for row in self.conn.execute("SELECT DISTINCT location FROM postings WHERE location IS NOT NULL")]
+        self._resolve_locations(texts)
+        self.conn.create_function("normalize_location", 1, normalize_location, deterministic=True)
+        self.conn.execute(
+            "UPDATE postings SET location_id = "
+            "(SELECT location_id FROM location_aliases WHERE alias = normalize_location(postings.location)) "
+            "WHERE location IS NOT NULL"
+        )
+
+    def _resolve_locations(self, texts: Iterable[str | None]) -> dict[str, int]:
+        """Location id for each normalized location string, parsing and storing new ones.
+
+        Not committed here; callers write this with the postings that use it.
+        """
+        aliases = {normalize_location(t) for t in texts if t and t.strip()}
+        missing = [a for a in aliases if a not in self._location_ids]
+        for start in range(0, len(missing), 500):
+            batch = missing[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT alias, location_id FROM location_aliases WHERE alias IN ({placeholders})", batch
+            ).fetchall()
+            self._location_ids.update((row["alias"], row["location_id"]) for row in rows)
+
+        for alias in (a for a in missing if a not in self._location_ids):
+            parsed = parse_location(alias)
+            self.conn.execute(
+                "INSERT OR IGNORE INTO locations (key, city, state, country, remote) VALUES (?, ?, ?, ?, ?)",
+                (parsed.key, parsed.city, parsed.state, parsed.country, int(parsed.remote)),
+            )
+            (location_id,) = self.conn.execute("SELECT id FROM locations WHERE key = ?", (parsed.key,)).fetchone()
+            self.conn.execute("INSERT INTO location_aliases (alias, location_id) VALUES (?, ?)", (alias, location_id))
+            self._location_ids[alias] = location_id
+        return {a: self._location_ids[a] for a in aliases}
+
+    def _split_blobs(self) -> None:
+        # Databases from before posting_blobs keep description_raw/raw_json
+        # inline: compress them into the side table and rebuild a narrow postings.
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(postings)")}
+        if "description_raw" not in existing:
+            return
+        self.conn.create_function("compress_text", 1, compress_text, deterministic=True)
+        self.conn.create_function("content_hash", 2, content_hash, deterministic=True)
+        columns = _POSTINGS_COLUMNS.replace("content_hash", "content_hash(title, description_raw)")
+        try:
+            self.conn.execute("BEGIN")
+            self.conn.execute(
+                "INSERT OR IGNORE INTO posting_blobs (posting_id, description_z, raw_json_z) "
+                "SELECT id, compress_text(description_raw), compress_text(raw_json) FROM postings"
+            )
+            self.conn.execute(_POSTINGS_TABLE.format(name="postings_narrow"))
+            self.conn.execute(f"INSERT INTO postings_narrow ({_POSTINGS_COLUMNS}) SELECT {columns} FROM postings")
+            self.conn.execute("DROP TABLE postings")
+            self.conn.execute("ALTER TABLE postings_narrow RENAME TO postings")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        # Hand the space the inline blobs took back to the filesystem; in WAL
+        # mode VACUUM goes through the log, so fold that back in too.
+        self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def upsert_many(self, postings: Iterable[JobPosting], *, known_ids: set[str] | None = None) -> tuple[int, int]:
+        # ``known_ids``: a known_posting_ids() result the caller already has
+        # for these postings, so the lookup isn't repeated.
+        with get_metrics().stage("sqlite", op="upsert_postings") as stage:
+            inserted, skipped = self._upsert_many(postings, known_ids)
+            stage.items = inserted + skipped
         return inserted, skipped
 
+    def _upsert_many(self, postings: Iterable[JobPosting], known: set[str] | None) -> tuple[int, int]:
+        postings = list(postings)
+        # Ids already stored are dropped with one lookup, before any row is
+        # serialized; re-ingests are mostly duplicates.
+        if known is None:
+            known = self._known_ids([p.id for p in postings])
+        fresh = [p for p in postings if p.id not in known]
+        location_ids = self._resolve_locations(p.location for p in fresh)
+        # A page shares retrieved_at and usually a handful of posting dates.
+        epochs: dict[str | None, int | None] = {}
+
+        def epoch(value: str | None) -> int | None:
+            if value not in epochs:
+                epochs[value] = to_epoch(value)
+            return epochs[value]
+
+        rows = [
+            (
+                p.id,
+                p.source,
+                p.url,
+                p.title,
+                p.company,
+                p.location,
+                location_ids.get(normalize_location(p.location)) if p.location else None,
+                p.date_posted,
+                p.retrieved_at,
+                p.role_bucket,
+                p.level_bucket,
+                content_hash(p.title, p.description_raw),
+                epoch(p.date_posted),
+                epoch(p.retrieved_at),
+            )
+            for p in fresh
+        ]
+        blobs = [
+            (p.id, compress_text(p.description_raw), compress_text(json.dumps(p.raw, ensure_ascii=False)), p.id)
+            for p in fresh
+        ]
+        # One executemany in one transaction. OR IGNORE skips the same rows the
+        # old per-row IntegrityError handling did (ids repeated within the batch,
+        # NOT NULL), and total_changes tells how many rows actually went in.
+        before = self.conn.total_changes
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO postings ({_POSTINGS_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        inserted = self.conn.total_changes - before
+        # Blobs only for rows that went in; a repeated id keeps its first copy.
+        self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO posting_blobs (posting_id, description_z, raw_json_z)
+            SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM postings WHERE id = ?)
+            """,
+            blobs,
+        )
+        self.conn.commit()
+        return inserted, len(postings) - inserted
+
+    def known_posting_ids(self, ids: list[str]) -> set[str]:
+        with get_metrics().stage("sqlite", op="known_ids") as stage:
+            stage.items = len(ids)
+            return self._known_ids(ids)
+
+    def _known_ids(self, ids: list[str]) -> set[str]:
+        known: set[str] = set()
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self.conn.execute(f"SELECT id FROM postings WHERE id IN ({placeholders})", batch).fetchall()
+            known.update(row["id"] for row in rows)
+        return known
+
     def _posting_where_clause(self, q: IngestionQuery) -> tuple[str, list[object]]:
         # One shared filter clause keeps extraction and aggregation aligned.
         clauses: list[str] = ["level_bucket != ?"]
         params: list[object] = ["senior_excluded"]
+        # Role and level have a handful of values each; with a location given,
+        # unary + keeps the planner on idx_postings_location_time instead.
+        bucket = "+" if q.location else ""
 
         if q.role_bucket != "any":
-            clauses.append("role_bucket = ?")
+            clauses.append(f"{bucket}role_bucket = ?")
             params.append(q.role_bucket)
 
         if q.level_bucket != "any":
-            clauses.append("level_bucket = ?")
+            clauses.append(f"{bucket}level_bucket = ?")
             params.append(q.level_bucket)
 
         if q.location:
-            clauses.append("location IS NOT NULL")
-            clauses.append("LOWER(location) LIKE ?")
-            params.append(f"%{q.location.lower()}%")
+            # Resolved against the small locations/aliases tables, so postings
+            # are reached through idx_postings_location_time. The alias substring
+            # match keeps everything the old LIKE on postings.location found;
+            # the parsed match adds spellings like "Dallas, Texas".
+            parsed = parse_location(q.location)
+            fields = [("city", parsed.city), ("state", parsed.state), ("country", parsed.country)]
+            conditions = [f"{name} = ?" for name, value in fields if value]
+            params.extend(value for _, value in fields if value)
+            if parsed.remote:
+                conditions.append("remote = 1")
+            lookups = [f"SELECT id FROM locations WHERE {' AND '.join(conditions)}"] if conditions else []
+            lookups.append("SELECT location_id FROM location_aliases WHERE alias LIKE ?")
+            params.append(f"%{normalize_location(q.location)}%")
+            clauses.append(f"location_id IN ({' UNION '.join(lookups)})")
 
         cutoff = datetime.now(timezone.utc) - timedelta(days=q.days)
-        clauses.append("retrieved_at >= ?")
-        params.append(cutoff.isoformat())
+        clauses.append("retrieved_ts >= ?")
+        params.append(int(cutoff.timestamp()))
 
         return " AND ".join(clauses), params
 
     def iter_postings(self, q: IngestionQuery, limit: int | None = None):
         where_sql, params = self._posting_where_clause(q)
+        # Extraction bookkeeping rides along so callers can skip current rows.
         sql = (
-            "SELECT id, title, company, location, retrieved_at, description_raw, role_bucket, level_bucket "
+            "SELECT id, title, company, location, retrieved_at, postings.content_hash, role_bucket, level_bucket, "
+            "pe.content_hash AS extracted_hash, pe.catalog_fingerprint AS extracted_fingerprint "
             "FROM postings "
+            "LEFT JOIN posting_extractions pe ON pe.posting_id = postings.id "
             f"WHERE {where_sql} "
-            "ORDER BY retrieved_at DESC"
+            "ORDER BY retrieved_ts DESC"
         )
         if limit is not None:
             sql += " LIMIT ?"
             params = [*params, limit]
-        cur = self.conn.cursor()
-        return cur.execute(sql, params).fetchall()
+        with get_metrics().stage("sqlite", op="read_postings") as stage:
+            rows = self.conn.execute(sql, params).fetchall()
+            stage.items = len(rows)
+        return rows
 
-    def upsert_posting_skills(self, posting_id: str, skill_counts: dict[str, int]) -> tuple[int, int]:
-        inserted = 0
-        updated_or_skipped = 0
-        cur = self.conn.cursor()
+    def get_descriptions(self, ids: list[str]) -> dict[str, str]:
+        """Decompressed ``description_raw`` for each stored id."""
+        with get_metrics().stage("sqlite", op="read_descriptions") as stage:
+            stage.items = len(ids)
+            descriptions: dict[str, str] = {}
+            for start in range(0, len(ids), 500):
+                batch = ids[start : start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = self.conn.execute(
+                    f"SELECT posting_id, description_z FROM posting_blobs WHERE posting_id IN ({placeholders})", batch
+                ).fetchall()
+                descriptions.update((row["posting_id"], decompress_text(row["description_z"])) for row in rows)
+        return descriptions
+
+    def get_raw(self, posting_id: str) -> dict | None:
+        """The provider payload a posting was normalized from, for inspection."""
+        row = self.conn.execute("SELECT raw_json_z FROM posting_blobs WHERE posting_id = ?", (posting_id,)).fetchone()
+        return None if row is None else json.loads(decompress_text(row["raw_json_z"]))
 
-        # We track existing rows to report insert vs update counts in script summaries.
-        existing = {
-            row["skill"]: row["count"]
-            for row in cur.execute(
-                "SELECT skill, count FROM posting_skills WHERE posting_id = ?",
-                (posting_id,),
+    def get_posting_skills(self, ids: list[str]) -> dict[str, dict[str, int]]:
+        """Stored skill counts per posting id; ids without skills are left out."""
+        skills: dict[str, dict[str, int]] = {}
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT posting_id, skill, count FROM posting_skills WHERE posting_id IN ({placeholders})", batch
             ).fetchall()
-        }
-
-        for skill, count in skill_counts.items():
-            cur.execute(
-                """
-                INSERT INTO posting_skills (posting_id, skill, count)
-                VALUES (?, ?, ?)
-                ON CONFLICT(posting_id, skill)
-                DO UPDATE SET count = excluded.count
-                """,
-                (posting_id, skill, count),
-            )
-            if skill in existing:
-                updated_or_skipped += 1
-            else:
-                inserted += 1
+            for row in rows:
+                skills.setdefault(row["posting_id"], {})[row["skill"]] = row["count"]
+        return skills
 
-        self.conn.commit()
+    def upsert_posting_skills(
+        self,
+        posting_id: str,
+        skill_counts: dict[str, int],
+        *,
+        commit: bool = True,
+    ) -> tuple[int, int]:
+        inserted, updated_or_skipped, _ = self.upsert_skills_many([(posting_id, skill_counts)], commit=commit)
         return inserted, updated_or_skipped
 
+    def upsert_skills_many(
+        self,
+        entries: Iterable[tuple[str, dict[str, int]]],
+        *,
+        commit: bool = True,
+    ) -> tuple[int, int, int]:
+        """Replace the skill counts of many postings; returns (inserted, updated_or_skipped, removed).
+
+        Skills a posting no longer has are deleted, so a re-extraction leaves
+        exactly ``skill_counts`` behind.
+        """
+        with get_metrics().stage("sqlite", op="upsert_skills") as stage:
+            counts_by_posting = dict(entries)
+            stage.items = sum(len(counts) for counts in counts_by_posting.values())
+            return self._upsert_skills_many(counts_by_posting, commit=commit)
+
+    def _upsert_skills_many(self, counts_by_posting: dict[str, dict[str, int]], *, commit: bool) -> tuple[int, int, int]:
+        # Existing pairs are read once per chunk of postings; the insert vs
+        # update split for script summaries is then plain set arithmetic.
+        ids = list(counts_by_posting)
+        existing: set[tuple[str, str]] = set()
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT posting_id, skill FROM posting_skills WHERE posting_id IN ({placeholders})", batch
+            ).fetchall()
+            existing.update((row["posting_id"], row["skill"]) for row in rows)
+
+        wanted = {(posting_id, skill) for posting_id, counts in counts_by_posting.items() for skill in counts}
+        stale = existing - wanted
+        self.conn.executemany("DELETE FROM posting_skills WHERE posting_id = ? AND skill = ?", stale)
+        self.conn.executemany(
+            """
+            INSERT INTO posting_skills (posting_id, skill, count)
+            VALUES (?, ?, ?)
+            ON CONFLICT(posting_id, skill)
+            DO UPDATE SET count = excluded.count
+            """,
+            [
+                (posting_id, skill, count)
+                for posting_id, counts in counts_by_posting.items()
+                for skill, count in counts.items()
+            ],
+        )
+
+        # Batch writers pass commit=False and commit once per chunk.
+        if commit:
+            self.conn.commit()
+        updated_or_skipped = len(wanted & existing)
+        return len(wanted) - updated_or_skipped, updated_or_skipped, len(stale)
+
+    def record_extractions(self, entries: Iterable[tuple[str, str]], catalog_fingerprint: str) -> None:
+        """Remember which content hash and catalog each posting was extracted with.
+
+        Not committed here; callers write this in the same transaction as the skills.
+        """
+        extracted_at = datetime.now(timezone.utc).isoformat()
+        self.conn.executemany(
+            """
+            INSERT INTO posting_extractions (posting_id, content_hash, catalog_fingerprint, extracted_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(posting_id) DO UPDATE SET
+              content_hash = excluded.content_hash,
+              catalog_fingerprint = excluded.catalog_fingerprint,
+              extracted_at = excluded.extracted_at
+            """,
+            [(posting_id, h, catalog_fingerprint, extracted_at) for posting_id, h in entries],
+        )
+
+    def get_cached_extractions(self, keys: list[str], catalog_fingerprint: str) -> dict[str, dict[str, int]]:
+        placeholders = ", ".join("?" for _ in keys)
+        rows = self.conn.execute(
+            f"""
+            SELECT content_key, skills_json FROM extraction_cache
+            WHERE catalog_fingerprint = ? AND content_key IN ({placeholders})
+            """,
+            [catalog_fingerprint, *keys],
+        ).fetchall()
+        return {row["content_key"]: json.loads(row["skills_json"]) for row in rows}
+
+    def put_cached_extractions(self, entries: dict[str, dict[str, int]], catalog_fingerprint: str) -> None:
+        self.conn.executemany(
+            """
+            INSERT OR REPLACE INTO extraction_cache (content_key, catalog_fingerprint, skills_json)
+            VALUES (?, ?, ?)
+            """,
+            [(key, catalog_fingerprint, json.dumps(counts)) for key, counts in entries.items()],
+        )
+
+    def prune_extraction_cache(self, catalog_fingerprint: str) -> None:
+        # Entries from older catalogs can never be hit again.
+        self.conn.execute("DELETE FROM extraction_cache WHERE catalog_fingerprint != ?", (catalog_fingerprint,))
+        self.conn.commit()
+
+    def get_watermark(self, source: str, query_key: str) -> FetchWatermark | None:
+        row = self.conn.execute(
+            "SELECT newest_posted_at, boundary_ids_json, window_start, complete FROM fetch_watermarks "
+            "WHERE source = ? AND query_key = ?",
+            (source, query_key),
+        ).fetchone()
+        if row is None:
+            return None
+        return FetchWatermark(
+            newest_posted_at=datetime.fromisoformat(row["newest_posted_at"]),
+            boundary_ids=frozenset(json.loads(row["boundary_ids_json"])),
+            window_start=datetime.fromisoformat(row["window_start"]) if row["window_start"] else None,
+            complete=bool(row["complete"]),
+        )
+
+    def save_watermark(self, source: str, query_key: str, mark: FetchWatermark) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO fetch_watermarks
+              (source, query_key, newest_posted_at, boundary_ids_json, window_start, complete, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source, query_key) DO UPDATE SET
+              newest_posted_at = excluded.newest_posted_at,
+              boundary_ids_json = excluded.boundary_ids_json,
+              window_start = excluded.window_start,
+              complete = excluded.complete,
+              updated_at = excluded.updated_at
+            """,
+            (
+                source,
+                query_key,
+                mark.newest_posted_at.isoformat(),
+                json.dumps(sorted(mark.boundary_ids)),
+                mark.window_start.isoformat() if mark.window_start is not None else None,
+                int(mark.complete),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        self.conn.commit()
+
+    def commit(self) -> None:
+        with get_metrics().stage("sqlite", op="commit"):
+            self.conn.commit()
+
     def get_postings_count(self, q: IngestionQuery) -> int:
         where_sql, params = self._posting_where_clause(q)
         cur = self.conn.cursor()
@@ -171,3 +612,27 @@ class SQLiteStore:
 
     def close(self) -> None:
         self.conn.close()
+
+
+# Schema changes, oldest first; a database's user_version counts how many it
+# has had. Append new steps, never reorder. The early steps also check the
+# schema itself, since databases from before versioning all report 0.
+_MIGRATIONS: tuple[Callable[[SQLiteStore], None], ...] = (
+    SQLiteStore._create_schema,
+    SQLiteStore._add_epoch_columns,
+    SQLiteStore._add_location_ids,
+    SQLiteStore._split_blobs,
+    SQLiteStore._create_query_indexes,
+    SQLiteStore._add_watermark_coverage,
+)
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+@contextmanager
+def using_store(db: str | SQLiteStore) -> Iterator[SQLiteStore]:
+    """Yield ``db`` itself if it is a store (left open), else a store opened on that path."""
+    if isinstance(db, SQLiteStore):
+        yield db
+        return
+    with SQLiteStore(db) as store:
+        yield store
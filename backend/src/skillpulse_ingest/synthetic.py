@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+
+# Synthetic postings for benchmarks; shaped like real provider descriptions
+# (nested HTML, entities, skill mentions scattered through filler prose).
+
+_FILLER = (
+    "we", "are", "looking", "for", "an", "engineer", "to", "join", "our", "team", "and", "help",
+    "build", "reliable", "scalable", "systems", "customers", "love", "you", "will", "collaborate",
+    "with", "product", "design", "ship", "features", "quickly", "own", "code", "review", "mentor",
+    "others", "communication", "skills", "experience", "years", "remote", "office", "benefits",
+    "health", "insurance", "equity", "competitive", "salary", "growth", "learning", "culture",
+    "continuous", "delivery", "testing", "monitoring", "performance", "security", "data",
+)
+
+_SKILL_PHRASES = (
+    "Python", "python3", "Java", "JavaScript", "TypeScript", "JS", "Node.js", "NodeJS", "React",
+    "ReactJS", "Angular", "SQL", "PostgreSQL", "Postgres", "MySQL", "Oracle", "MongoDB", "DynamoDB",
+    "Redis", "Snowflake", "REST", "RESTful", "REST APIs", "web services", "HTTP APIs", "Git",
+    "GitHub", "GitLab", "SVN", "Docker", "containers", "containerization", "Kubernetes", "K8s",
+    "AWS", "Amazon Web Services", "Terraform", "CI/CD", "CICD", "Jenkins", "GitHub Actions",
+    "CircleCI", "Golang", "Go services", "Go developer", "C language", "C++", "C#", "C sharp",
+    "Spring", "Spring Boot", "Django", "Flask", "GraphQL", "JavaScript/TypeScript",
+)
+
+_TITLES = (
+    "Software Engineer", "Junior Backend Engineer", "Frontend Developer", "Full Stack Engineer",
+    "Associate Software Engineer", "Backend Engineer I", "Platform Engineer", "Web Developer",
+)
+
+_COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne")
+
+_LOCATIONS = ("Dallas, TX", "Austin, TX", "Dallas, Texas", "Remote", "New York, NY", "Seattle, WA")
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_FILLER) for _ in range(rng.randint(8, 20))]
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_SKILL_PHRASES))
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice((".", ".", "!", " &amp; more.", "&nbsp;today."))
+
+
+def synthetic_description(rng: random.Random, *, paragraphs: int = 8) -> str:
+    parts: list[str] = ["<div class=\"job-description\">"]
+    for _ in range(paragraphs):
+        if rng.random() < 0.4:
+            items = "".join(f"<li>{_sentence(rng)}</li>\n" for _ in range(rng.randint(3, 7)))
+            parts.append(f"<h3>What you&#39;ll do</h3>\n<ul>\n{items}</ul>")
+        else:
+            body = " ".join(_sentence(rng) for _ in range(rng.randint(3, 6)))
+            parts.append(f"<p>{body.replace('Python', '<strong>Python</strong>')}</p>")
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+def synthetic_title(rng: random.Random) -> str:
+    return rng.choice(_TITLES)
+
+
+def synthetic_theirstack_job(rng: random.Random, job_id: int, *, date_posted: str | None = None) -> dict:
+    return {
+        "id": job_id,
+        "job_title": synthetic_title(rng),
+        "company": rng.choice(_COMPANIES),
+        "location": rng.choice(_LOCATIONS),
+        "date_posted": date_posted or f"2026-01-{rng.randint(1, 28):02d}",
+        "final_url": f"https://jobs.example.com/{job_id}",
+        "description": synthetic_description(rng, paragraphs=rng.randint(3, 10)),
+    }
+
+
+def synthetic_remotive_job(rng: random.Random, job_id: int, *, publication_date: str | None = None) -> dict:
+    return {
+        "id": job_id,
+        "url": f"https://remotive.example.com/{job_id}",
+        "title": synthetic_title(rng),
+        "company_name": rng.choice(_COMPANIES),
+        "candidate_required_location": rng.choice(_LOCATIONS),
+        "publication_date": publication_date or f"2026-01-{rng.randint(1, 28):02d}T12:00:00",
+        "description": synthetic_description(rng, paragraphs=rng.randint(3, 10)),
+    }
@@ -2,16 +2,30 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import Any, Callable, Iterator, Sequence
 
+from .extraction_cache import DEFAULT_CACHE_SIZE, ExtractionCache
+from .metrics import get_metrics
 from .models import IngestionQuery
-from .pipeline import get_source, run_pipeline
+from .pipeline import IngestSummary, get_sources, run_pipeline
 from .runtime_paths import ensure_parent_dir
 from .skill_aggregate import aggregate_skills
-from .skill_extract import extract_skill_counts
-from .storage_sqlite import SQLiteStore
+from .skill_extract import count_skills, skill_text
+from .skills_catalog import CATALOG_FINGERPRINT
+from .sources.http_client import caching
+from .sources.response_cache import ResponseCache
+from .storage_sqlite import SQLiteStore, using_store
+
+
+# Postings per worker task and per write transaction during extraction.
+EXTRACT_CHUNK_SIZE = 200
+# Postings written to the extraction sample file.
+SAMPLE_SIZE = 20
 
 
 @dataclass(frozen=True)
@@ -21,6 +35,10 @@ class ExtractionSummary:
     skills_inserted: int
     skills_updated_or_skipped: int
     sample_out: str | None = None
+    postings_skipped: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    skills_removed: int = 0
 
 
 def setup_logger(log_path: str) -> logging.Logger:
@@ -46,62 +64,228 @@ def setup_logger(log_path: str) -> logging.Logger:
 
 def ingest_postings(
     q: IngestionQuery,
-    db_path: str,
+    db_path: str | SQLiteStore,
     log_path: str,
     *,
     source_name: str | None = None,
-) -> None:
-    ensure_parent_dir(db_path)
+    extract_skills: bool = False,
+    incremental: bool = False,
+    http_cache: ResponseCache | None = None,
+) -> IngestSummary:
+    if isinstance(db_path, str):
+        ensure_parent_dir(db_path)
     logger = setup_logger(log_path)
-    store = SQLiteStore(db_path)
-    try:
-        adapters = [get_source(source_name)]
-        run_pipeline(q, adapters, store, logger)
-    finally:
-        store.close()
+    with using_store(db_path) as store:
+        # ``source_name`` may also be "all" or a comma-separated list. A source
+        # that can't be set up is skipped; the others still run.
+        adapters = get_sources(source_name, logger)
+        with caching(http_cache):
+            return run_pipeline(q, adapters, store, logger, extract_skills=extract_skills, incremental=incremental)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+# Worker entry points only see plain tuples and strings, never sqlite3.Row.
+def _clean_chunk(jobs: list[tuple[str, str]]) -> list[str]:
+    return [skill_text(title, description) for title, description in jobs]
+
+
+def _count_texts(texts: list[str]) -> list[dict[str, int]]:
+    return [count_skills(text) for text in texts]
+
+
+def _extract_chunk(jobs: list[tuple[str, str]]) -> tuple[list[str], dict[str, dict[str, int]]]:
+    # Cleaning, keying and matching share one worker task, so only keys and
+    # counts come back to the main process, never the cleaned text.
+    keys: list[str] = []
+    counts: dict[str, dict[str, int]] = {}
+    for title, description in jobs:
+        text = skill_text(title, description)
+        key = ExtractionCache.key(text)
+        keys.append(key)
+        if key not in counts:
+            counts[key] = count_skills(text)
+    return keys, counts
+
+
+def _resolve_chunk(
+    chunk: Sequence[Any],
+    keys: list[str],
+    cache: ExtractionCache,
+    match: Callable[[list[str]], list[dict[str, int]]],
+) -> list[tuple[Any, dict[str, int]]]:
+    # Identical cleaned text is matched once; everything else comes from the cache.
+    found, missing = cache.lookup(keys)
+    if missing:
+        computed = dict(zip(missing, match(missing)))
+        cache.put_many(computed)
+        found.update(computed)
+    return [(row, found[key]) for row, key in zip(chunk, keys)]
+
+
+def _iter_extracted(
+    rows: Sequence[Any],
+    workers: int,
+    cache: ExtractionCache,
+    load_descriptions: Callable[[list[str]], dict[str, str]],
+) -> Iterator[list[tuple[Any, dict[str, int]]]]:
+    """Yield chunks of ``(row, skill_counts)`` in the order rows were read."""
+    chunks = list(_chunks(rows, EXTRACT_CHUNK_SIZE))
+
+    def jobs_for(chunk: Sequence[Any]) -> list[tuple[str, str]]:
+        # Descriptions are decompressed a chunk at a time, just before cleaning.
+        descriptions = load_descriptions([row["id"] for row in chunk])
+        return [(row["title"], descriptions.get(row["id"], "")) for row in chunk]
+
+    inputs = (jobs_for(chunk) for chunk in chunks)
+
+    metrics = get_metrics()
+    if workers <= 1:
+        for chunk, jobs in zip(chunks, inputs):
+            with metrics.stage("clean", mode="batch") as stage:
+                stage.items = len(jobs)
+                texts = _clean_chunk(jobs)
+            keys = [cache.key(text) for text in texts]
+            text_by_key = dict(zip(keys, texts))
+
+            def match(missing: list[str]) -> list[dict[str, int]]:
+                with metrics.stage("skill_match", mode="batch") as stage:
+                    stage.items = len(missing)
+                    return _count_texts([text_by_key[key] for key in missing])
+
+            yield _resolve_chunk(chunk, keys, cache, match)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Workers run a bounded number of chunks ahead. They match every
+        # distinct text they see; cache lookups and writes stay in this
+        # process, in order, so hits, misses and results match a serial run.
+        ahead = deque()
+        pending = iter(zip(chunks, inputs))
+        for chunk, jobs in islice(pending, workers * 2):
+            ahead.append((chunk, pool.submit(_extract_chunk, jobs)))
+        while ahead:
+            chunk, extracted = ahead.popleft()
+            for next_chunk, jobs in islice(pending, 1):
+                ahead.append((next_chunk, pool.submit(_extract_chunk, jobs)))
+            # Time spent waiting on workers, which both clean and match.
+            with metrics.stage("clean", mode="pool") as stage:
+                stage.items = len(chunk)
+                keys, counts = extracted.result()
+            yield _resolve_chunk(chunk, keys, cache, lambda missing: [counts[key] for key in missing])
 
 
 def extract_posting_skills(
-    db_path: str,
+    db_path: str | SQLiteStore,
     q: IngestionQuery,
     *,
     limit: int | None = None,
     sample_out: str | None = None,
+    workers: int = 1,
+    force: bool = False,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    persist_cache: bool = False,
 ) -> ExtractionSummary:
-    store = SQLiteStore(db_path)
-    try:
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    with get_metrics().stage("extract") as stage:
+        summary = _extract_posting_skills(
+            db_path,
+            q,
+            limit=limit,
+            sample_out=sample_out,
+            workers=workers,
+            force=force,
+            cache_size=cache_size,
+            persist_cache=persist_cache,
+        )
+        stage.items = summary.postings_processed
+    metrics = get_metrics()
+    metrics.add("extraction_postings_skipped_total", summary.postings_skipped)
+    metrics.add("extraction_cache_hits_total", summary.cache_hits)
+    metrics.add("extraction_cache_misses_total", summary.cache_misses)
+    return summary
+
+
+def _extract_posting_skills(
+    db_path: str | SQLiteStore,
+    q: IngestionQuery,
+    *,
+    limit: int | None,
+    sample_out: str | None,
+    workers: int,
+    force: bool,
+    cache_size: int,
+    persist_cache: bool,
+) -> ExtractionSummary:
+    with using_store(db_path) as store:
         rows = store.iter_postings(q, limit=limit)
+        postings_read = len(rows)
+        # The sample shows the first postings read, whether extracted now or skipped.
+        sample_rows = rows[:SAMPLE_SIZE]
+        sample_ids = {row["id"] for row in sample_rows}
+        sample_counts: dict[str, dict[str, int]] = {}
+
+        # Postings already extracted from identical text with this catalog are
+        # skipped; the stored content hash means their descriptions are never read.
+        if not force:
+            rows = [
+                row
+                for row in rows
+                if row["extracted_fingerprint"] != CATALOG_FINGERPRINT or row["extracted_hash"] != row["content_hash"]
+            ]
+        postings_skipped = postings_read - len(rows)
+
+        cache = ExtractionCache(cache_size, store=store if persist_cache else None)
+        if persist_cache:
+            store.prune_extraction_cache(cache.catalog_fingerprint)
 
         postings_processed = 0
         skills_inserted = 0
         skills_updated = 0
+        skills_removed = 0
         nonempty_postings = 0
-        sample: list[dict[str, object]] = []
 
-        for row in rows:
-            postings_processed += 1
-            skill_counts = extract_skill_counts(row["title"], row["description_raw"])
-            inserted, updated = store.upsert_posting_skills(row["id"], skill_counts)
+        # This process is the only writer; each chunk lands in one transaction.
+        for chunk in _iter_extracted(rows, workers, cache, store.get_descriptions):
+            inserted, updated, removed = store.upsert_skills_many(
+                ((row["id"], skill_counts) for row, skill_counts in chunk), commit=False
+            )
             skills_inserted += inserted
             skills_updated += updated
+            skills_removed += removed
+
+            for row, skill_counts in chunk:
+                postings_processed += 1
+                if skill_counts:
+                    nonempty_postings += 1
+
+                if row["id"] in sample_ids:
+                    sample_counts[row["id"]] = skill_counts
+            store.record_extractions(((row["id"], row["content_hash"]) for row, _ in chunk), CATALOG_FINGERPRINT)
+            store.commit()
 
-            if skill_counts:
-                nonempty_postings += 1
-
-            if len(sample) < 20:
-                sample.append(
-                    {
-                        "id": row["id"],
-                        "title": row["title"],
-                        "company": row["company"],
-                        "extracted_skills": [
-                            {"name": k, "count": v}
-                            for k, v in sorted(skill_counts.items(), key=lambda kv: (-kv[1], kv[0]))
-                        ],
-                    }
-                )
-    finally:
-        store.close()
+        # Skipped postings in the sample show the skills stored for them.
+        stored = store.get_posting_skills([row["id"] for row in sample_rows if row["id"] not in sample_counts])
+        sample = [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "company": row["company"],
+                "extracted_skills": [
+                    {"name": k, "count": v}
+                    for k, v in sorted(
+                        sample_counts.get(row["id"], stored.get(row["id"], {})).items(), key=lambda kv: (-kv[1], kv[0])
+                    )
+                ],
+            }
+            for row in sample_rows
+        ]
 
     if sample_out:
         sample_path = ensure_parent_dir(sample_out)
@@ -113,6 +297,10 @@ def extract_posting_skills(
         skills_inserted=skills_inserted,
         skills_updated_or_skipped=skills_updated,
         sample_out=sample_out,
+        postings_skipped=postings_skipped,
+        cache_hits=cache.hits,
+        cache_misses=cache.misses,
+        skills_removed=skills_removed,
     )
 
 
@@ -132,15 +320,17 @@ def title_for_query(q: IngestionQuery) -> str:
     return " ".join(p for p in parts if p).strip()
 
 
-def build_skill_insights(db_path: str, q: IngestionQuery, *, top_n: int) -> dict[str, Any]:
-    store = SQLiteStore(db_path)
-    try:
-        postings_count = store.get_postings_count(q)
-        companies_count = store.get_unique_companies_count(q)
-    finally:
-        store.close()
+def build_skill_insights(db_path: str | SQLiteStore, q: IngestionQuery, *, top_n: int) -> dict[str, Any]:
+    metrics = get_metrics()
+    # One connection for the totals and the aggregation.
+    with using_store(db_path) as store:
+        with metrics.stage("insights_totals"):
+            postings_count = store.get_postings_count(q)
+            companies_count = store.get_unique_companies_count(q)
 
-    skills = aggregate_skills(db_path, q, top_n=top_n)
+        with metrics.stage("aggregate") as stage:
+            skills = aggregate_skills(store, q, top_n=top_n)
+            stage.items = postings_count
 
     return {
         "title": title_for_query(q),
@@ -0,0 +1,29 @@
+import unittest
+from datetime import datetime, timezone
+
+from skillpulse_ingest.dates import parse_datetime, to_epoch
+
+
+class TestParseDatetime(unittest.TestCase):
+    def test_source_formats(self) -> None:
+        expected = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+        for value in (
+            "2026-03-01T12:00:00Z",
+            "2026-03-01T12:00:00",
+            "2026-03-01T12:00:00.000000+00:00",
+            "2026-03-01T07:00:00-05:00",
+            "Sun, 01 Mar 2026 12:00:00 GMT",
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(parse_datetime(value), expected)
+        self.assertEqual(parse_datetime("2026-03-01"), datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    def test_unparseable_values(self) -> None:
+        for value in (None, "", "not a date", "2026-13-45"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_datetime(value))
+                self.assertIsNone(to_epoch(value))
+
+    def test_to_epoch(self) -> None:
+        self.assertEqual(to_epoch("1970-01-02T00:00:00Z"), 86400)
+        self.assertEqual(to_epoch("2026-03-01T07:00:00-05:00"), to_epoch("2026-03-01T12:00:00+00:00"))
@@ -0,0 +1,43 @@
+import unittest
+
+from skillpulse_ingest.extraction_cache import ExtractionCache
+from skillpulse_ingest.storage_sqlite import SQLiteStore
+
+
+class TestExtractionCache(unittest.TestCase):
+    def test_lookup_counts_repeats_of_missing_keys_as_hits(self) -> None:
+        cache = ExtractionCache()
+        found, missing = cache.lookup(["a", "b", "a"])
+        self.assertEqual(found, {})
+        self.assertEqual(missing, ["a", "b"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        cache.put_many({"a": {"Python": 1}, "b": {}})
+        found, missing = cache.lookup(["b", "a"])
+        self.assertEqual(found, {"a": {"Python": 1}, "b": {}})
+        self.assertEqual(missing, [])
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        cache = ExtractionCache(max_entries=2)
+        cache.put_many({"a": {}, "b": {}})
+        cache.lookup(["a"])
+        cache.put_many({"c": {}})
+        _, missing = cache.lookup(["a", "b", "c"])
+        self.assertEqual(missing, ["b"])
+
+    def test_persisted_entries_survive_new_cache_and_respect_catalog(self) -> None:
+        store = SQLiteStore(":memory:")
+        first = ExtractionCache(store=store, catalog_fingerprint="v1")
+        first.put_many({"k": {"SQL / Databases": 2}})
+        store.commit()
+
+        second = ExtractionCache(store=store, catalog_fingerprint="v1")
+        found, missing = second.lookup(["k"])
+        self.assertEqual(found, {"k": {"SQL / Databases": 2}})
+        self.assertEqual(missing, [])
+
+        other_catalog = ExtractionCache(store=store, catalog_fingerprint="v2")
+        _, missing = other_catalog.lookup(["k"])
+        self.assertEqual(missing, ["k"])
+        store.close()
@@ -0,0 +1,131 @@
+import logging
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+from skillpulse_ingest.fake_source import FakeSourceConfig, FakeSourceServer
+from skillpulse_ingest.metrics import recording
+from skillpulse_ingest.models import FetchWatermark, IngestionQuery
+from skillpulse_ingest.pipeline import run_pipeline
+from skillpulse_ingest.sources.http_client import HttpClient
+from skillpulse_ingest.sources.remotive import RemotiveAdapter
+from skillpulse_ingest.sources.response_cache import ResponseCache
+from skillpulse_ingest.sources.theirstack import TheirstackAdapter
+from skillpulse_ingest.storage_sqlite import SQLiteStore
+
+
+def _query(max_results: int, days: int = 30) -> IngestionQuery:
+    return IngestionQuery(location="", role_bucket="any", level_bucket="any", days=days, max_results=max_results)
+
+
+class TestFakeSourceServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = HttpClient(backoff_seconds=0, max_retries=8)
+        self.addCleanup(self.client.close)
+
+    def _theirstack(self, server: FakeSourceServer, **kwargs) -> TheirstackAdapter:
+        return TheirstackAdapter(api_key="test", client=self.client, base_url=server.theirstack_base, **kwargs)
+
+    def test_theirstack_pages_and_window(self) -> None:
+        # One posting per hour: a 2-day window holds postings 0..48.
+        config = FakeSourceConfig(postings=200, spacing_seconds=3600)
+        with FakeSourceServer(config) as server:
+            jobs = self._theirstack(server).fetch(_query(max_results=500, days=2))
+            # The last page is 20 (divides the offset) or 30 (doesn't) postings.
+            capped = {n: self._theirstack(server).fetch(_query(max_results=n)) for n in (120, 130)}
+
+        self.assertEqual([j["id"] for j in jobs], list(range(49)))
+        for n, rows in capped.items():
+            self.assertEqual([j["id"] for j in rows], list(range(n)))
+
+    def test_short_pages_end_the_listing(self) -> None:
+        with FakeSourceServer(FakeSourceConfig(postings=200, max_page_size=20)) as server:
+            pages = list(self._theirstack(server, page_concurrency=1).iter_pages(_query(max_results=200)))
+        self.assertEqual([len(p) for p in pages], [20])
+
+    def test_watermark_requests_only_newer_postings(self) -> None:
+        with FakeSourceServer(FakeSourceConfig(postings=100, spacing_seconds=60)) as server:
+            mark = FetchWatermark(server.posted_at(10), frozenset({"10"}))
+            jobs = self._theirstack(server).fetch(_query(max_results=100))
+            newer = [j for p in self._theirstack(server).iter_pages(_query(max_results=100), since=mark) for j in p]
+        self.assertEqual(len(jobs), 100)
+        self.assertEqual([j["id"] for j in newer], list(range(10)))
+
+    def test_injected_failures_are_retried(self) -> None:
+        config = FakeSourceConfig(postings=150, error_rate=0.3, throttle_rate=0.2, seed=7)
+        with FakeSourceServer(config) as server:
+            jobs = self._theirstack(server).fetch(_query(max_results=150))
+            stats = dict(server.stats)
+        self.assertEqual(len(jobs), 150)
+        self.assertGreater(stats["errors"] + stats["throttled"], 0)
+        self.assertEqual(stats["requests"], 3 + stats["errors"] + stats["throttled"])
+
+    def test_remotive_feed_streams_and_stops_early(self) -> None:
+        with FakeSourceServer(FakeSourceConfig(postings=2000)) as server:
+            adapter = RemotiveAdapter(client=self.client, base_url=server.remotive_base)
+            jobs = adapter.fetch(_query(max_results=25))
+            served = server.stats["postings"]
+            self.assertLess(server.posted_at(0) - server.posted_at(1), timedelta(hours=1))
+
+        self.assertEqual([j["id"] for j in jobs], list(range(25)))
+        # The connection is closed at max_results; the server stops well short of the feed.
+        self.assertLess(served, 2000)
+
+    def test_remotive_stops_early_through_the_http_cache(self) -> None:
+        # A cache miss is copied as it is read. Stopping at max_results still
+        # caches the whole feed, so a larger fetch is served from the cache and
+        # the same run can be replayed.
+        with tempfile.TemporaryDirectory() as tmpdir, FakeSourceServer(FakeSourceConfig(postings=2000)) as server:
+            client = HttpClient(backoff_seconds=0, cache=ResponseCache(tmpdir))
+            self.addCleanup(client.close)
+            adapter = RemotiveAdapter(client=client, base_url=server.remotive_base)
+
+            first = adapter.fetch(_query(max_results=25))
+            full = adapter.fetch(_query(max_results=5000))
+            served = server.stats["postings"]
+            client.cache = ResponseCache(tmpdir, replay=True)
+            replayed = adapter.fetch(_query(max_results=25))
+
+        self.assertEqual([j["id"] for j in first], list(range(25)))
+        self.assertEqual(len(full), 2000)
+        self.assertEqual(served, 2000)
+        self.assertEqual(replayed, first)
+
+    def test_streamed_bytes_are_counted_as_they_are_read(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir, FakeSourceServer(FakeSourceConfig(postings=50)) as server:
+            body = self.client.get(server.remotive_base, source="remotive").content
+            cached = HttpClient(backoff_seconds=0, cache=ResponseCache(Path(tmpdir) / "cache"))
+            self.addCleanup(cached.close)
+            with recording(Path(tmpdir) / "metrics") as metrics:
+                for client in (self.client, cached, cached):  # plain, cache miss, cache hit
+                    RemotiveAdapter(client=client, base_url=server.remotive_base).fetch(_query(max_results=500))
+                counters = metrics.snapshot()["counters"]
+
+        fetched = [c["value"] for c in counters if c["name"] == "http_bytes_total" and c["labels"] == {"source": "remotive"}]
+        # Bytes from the network only: the cache hit adds nothing.
+        self.assertEqual(fetched, [2 * len(body)])
+
+    def test_incremental_runs_fetch_the_whole_window_when_it_grows(self) -> None:
+        # A narrower or truncated first run must not hide older postings from a wider one.
+        logger = logging.getLogger("test_fake_source")
+
+        def stored(store: SQLiteStore) -> dict[str, int]:
+            return dict(store.conn.execute("SELECT source, COUNT(*) FROM postings GROUP BY source").fetchall())
+
+        with FakeSourceServer(FakeSourceConfig(postings=300, spacing_seconds=3600)) as server:
+            adapters = [self._theirstack(server), RemotiveAdapter(client=self.client, base_url=server.remotive_base)]
+            for first, second in (
+                (_query(max_results=250, days=1), _query(max_results=250, days=10)),
+                (_query(max_results=20, days=10), _query(max_results=250, days=10)),
+            ):
+                with self.subTest(first=first, second=second):
+                    with SQLiteStore(":memory:") as store, SQLiteStore(":memory:") as fresh:
+                        run_pipeline(first, adapters, store, logger, incremental=True)
+                        before = stored(store)
+                        run_pipeline(second, adapters, store, logger, incremental=True)
+                        run_pipeline(second, adapters, fresh, logger)
+
+                        self.assertEqual(stored(store), stored(fresh))
+                        for source, count in before.items():
+                            self.assertGreater(stored(store)[source], count)
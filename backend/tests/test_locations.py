@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import unittest
+
+from skillpulse_ingest.locations import ParsedLocation, parse_location
+
+
+class TestParseLocation(unittest.TestCase):
+    def test_city_and_state_spellings_agree(self) -> None:
+        dallas = ParsedLocation(city="dallas", state="TX", country="US")
+        for text in ("Dallas, TX", "Dallas, Texas", "dallas,  tx", "Dallas, TX, United States", "Dallas, TX 75201"):
+            with self.subTest(text=text):
+                self.assertEqual(parse_location(text), dallas)
+
+    def test_metro_aliases_fold_into_the_city(self) -> None:
+        self.assertEqual(parse_location("Dallas-Fort Worth"), ParsedLocation(city="dallas", state="TX", country="US"))
+        self.assertEqual(parse_location("DFW, TX"), ParsedLocation(city="dallas", state="TX", country="US"))
+        self.assertEqual(parse_location("NYC").city, "new york")
+
+    def test_remote_state_and_country_only(self) -> None:
+        self.assertEqual(parse_location("Remote"), ParsedLocation(remote=True))
+        self.assertEqual(parse_location("Remote - US"), ParsedLocation(country="US", remote=True))
+        self.assertEqual(parse_location("Austin, TX (Remote)"), ParsedLocation("austin", "TX", "US", remote=True))
+        self.assertEqual(parse_location("Texas"), ParsedLocation(state="TX", country="US"))
+        self.assertEqual(parse_location("USA Only"), ParsedLocation(country="US"))
+
+    def test_non_us_locations(self) -> None:
+        self.assertEqual(parse_location("Berlin, Germany"), ParsedLocation(city="berlin", country="germany"))
+        self.assertEqual(parse_location("Toronto, ON, Canada"), ParsedLocation("toronto", "on", "canada"))
+
+    def test_empty(self) -> None:
+        self.assertEqual(parse_location(None), ParsedLocation())
+        self.assertEqual(parse_location("  "), ParsedLocation())
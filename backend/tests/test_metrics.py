@@ -0,0 +1,95 @@
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from skillpulse_ingest import metrics
+from skillpulse_ingest.metrics import Metrics, NullMetrics, get_metrics, recording
+from skillpulse_ingest.models import IngestionQuery
+from skillpulse_ingest.pipeline import run_pipeline
+
+
+class FakeAdapter:
+    name = "theirstack"
+
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def fetch(self, q: IngestionQuery) -> list[dict]:
+        return self._rows
+
+
+class FakeStore:
+    def known_posting_ids(self, ids):
+        return set()
+
+    def upsert_many(self, postings, known_ids=None):
+        return (len(postings), 0)
+
+
+class FakeLogger:
+    def info(self, *args, **kwargs):
+        return None
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_stage_counter_and_histogram_snapshot(self) -> None:
+        m = Metrics(buckets=(0.1, 1.0))
+        for _ in range(2):
+            with m.stage("normalize", source="theirstack") as stage:
+                stage.items = 5
+        m.add("http_bytes_total", 100, source="theirstack")
+        m.add("http_bytes_total", 50, source="theirstack")
+        m.observe("http_request_seconds", 0.05, source="theirstack")
+        m.observe("http_request_seconds", 2.0, source="theirstack")
+
+        snap = m.snapshot()
+        stage = snap["stages"][0]
+        self.assertEqual((stage["name"], stage["labels"], stage["calls"], stage["items"]),
+                         ("normalize", {"source": "theirstack"}, 2, 10))
+        self.assertEqual(snap["counters"][0]["value"], 150)
+        hist = snap["histograms"][0]
+        self.assertEqual(hist["buckets"], {"0.1": 1, "1.0": 1, "+Inf": 2})
+        self.assertEqual(hist["count"], 2)
+
+        prom = m.to_prometheus()
+        self.assertIn('skillpulse_stage_items_total{stage="normalize",source="theirstack"} 10', prom)
+        self.assertIn('skillpulse_http_bytes_total{source="theirstack"} 150', prom)
+        self.assertIn('skillpulse_http_request_seconds_bucket{source="theirstack",le="+Inf"} 2', prom)
+        self.assertIn("# TYPE skillpulse_http_request_seconds histogram", prom)
+
+    def test_recording_is_disabled_without_directory(self) -> None:
+        with recording(None) as m:
+            self.assertIsInstance(m, NullMetrics)
+            with m.stage("anything") as stage:
+                stage.items = 3
+        self.assertEqual(list(self.tmpdir.iterdir()), [])
+
+    def test_recording_writes_pipeline_metrics(self) -> None:
+        rows = [
+            {"id": str(i), "job_title": "Junior Backend Engineer", "description": "APIs",
+             "date_posted": datetime.now(timezone.utc).isoformat(), "final_url": f"https://example.com/m/{i}"}
+            for i in range(4)
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        out = self.tmpdir / "metrics"
+        with recording(out):
+            self.assertIsInstance(get_metrics(), Metrics)
+            run_pipeline(q, [FakeAdapter(rows)], FakeStore(), FakeLogger())
+        self.assertIsInstance(get_metrics(), NullMetrics)
+
+        snap = json.loads((out / metrics.METRICS_JSON).read_text(encoding="utf-8"))
+        stages = {(s["name"], s["labels"].get("source")): s for s in snap["stages"]}
+        self.assertEqual(stages[("normalize", "theirstack")]["items"], 4)
+        self.assertEqual(stages[("ingest", None)]["items"], 4)
+        counters = {c["name"]: c["value"] for c in snap["counters"]}
+        self.assertEqual(counters["postings_inserted_total"], 4)
+        self.assertIn("skillpulse_stage_seconds_total", (out / metrics.METRICS_PROM).read_text(encoding="utf-8"))
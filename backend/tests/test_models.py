@@ -1,8 +1,8 @@
 import json
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from skillpulse_ingest.models import JobPosting
+from skillpulse_ingest.models import FetchWatermark, JobPosting
 
 
 class TestModels(unittest.TestCase):
@@ -35,3 +35,14 @@ class TestModels(unittest.TestCase):
         self.assertEqual(raw["id"], "abc")
         self.assertEqual(raw["source"], "theirstack")
         self.assertEqual(raw["company"], "Acme")
+
+    def test_watermark_covers_only_complete_fetches_of_a_wide_enough_window(self) -> None:
+        newest = datetime(2026, 3, 10, tzinfo=timezone.utc)
+        start = newest - timedelta(days=10)
+        mark = FetchWatermark(newest, window_start=start, complete=True)
+
+        self.assertTrue(mark.covers_window(start + timedelta(days=1)))
+        self.assertTrue(mark.covers_window(start))
+        self.assertFalse(mark.covers_window(start - timedelta(days=1)))
+        self.assertFalse(FetchWatermark(newest, window_start=start).covers_window(start))
+        self.assertFalse(FetchWatermark(newest, complete=True).covers_window(start))
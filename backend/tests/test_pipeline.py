@@ -1,9 +1,18 @@
+import shutil
+import tempfile
+import threading
 import unittest
 from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
 
+from skillpulse_ingest.dates import parse_datetime
 from skillpulse_ingest.models import IngestionQuery
-from skillpulse_ingest.pipeline import get_source, run_pipeline
+from skillpulse_ingest import pipeline
+from skillpulse_ingest.pipeline import get_source, get_sources, parse_source_names, run_pipeline
 from skillpulse_ingest.sources.remotive import RemotiveAdapter
+from skillpulse_ingest.storage_sqlite import SQLiteStore
+from skillpulse_ingest.workflow import extract_posting_skills
 
 
 class FakeAdapter:
@@ -23,17 +32,67 @@ class BrokenAdapter:
         raise RuntimeError("network failure")
 
 
+class BarrierAdapter(FakeAdapter):
+    """Fetch only returns once every adapter sharing the barrier is fetching."""
+
+    def __init__(self, name: str, rows: list[dict], barrier: threading.Barrier) -> None:
+        super().__init__(rows)
+        self.name = name
+        self._barrier = barrier
+
+    def fetch(self, q: IngestionQuery) -> list[dict]:
+        self._barrier.wait(timeout=5)
+        return self._rows
+
+
+class FailingPagesAdapter:
+    """Yields one page, then fails like a dropped connection mid-pagination."""
+
+    name = "theirstack"
+
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def iter_pages(self, q: IngestionQuery):
+        yield self._rows
+        raise RuntimeError("network failure")
+
+
+class WatermarkAdapter:
+    """Serves only rows newer than ``since``, like a provider date filter."""
+
+    name = "theirstack"
+    POSTED_AT_FIELD = "date_posted"
+
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.since_seen = []
+
+    def iter_pages(self, q: IngestionQuery, since=None):
+        self.since_seen.append(since)
+        yield [r for r in self.rows if since is None or not since.covers(parse_datetime(r["date_posted"]), r["id"])]
+
+
 class FakeStore:
     def __init__(self) -> None:
         self.received = []
+        self.batches = 0
+
+    def known_posting_ids(self, ids):
+        return {p.id for p in self.received} & set(ids)
 
-    def upsert_many(self, postings):
+    def upsert_many(self, postings, known_ids=None):
         self.received.extend(postings)
+        self.batches += 1
         return (len(postings), 0)
 
 
 class FakeLogger:
+    def __init__(self) -> None:
+        self.infos = []
+
     def info(self, *args, **kwargs):
+        self.infos.append(args)
         return None
 
     def warning(self, *args, **kwargs):
@@ -124,3 +183,200 @@ class TestPipeline(unittest.TestCase):
         run_pipeline(q, [FakeAdapter(rows)], store, logger)
         self.assertEqual(len(store.received), 1)
         self.assertEqual(store.received[0].company, "Acme")
+
+    def test_parse_source_names(self) -> None:
+        self.assertEqual(parse_source_names(None), ["theirstack"])
+        self.assertEqual(parse_source_names("all"), ["theirstack", "remotive"])
+        self.assertEqual(parse_source_names("remotive, theirstack,remotive"), ["remotive", "theirstack"])
+        with self.assertRaises(ValueError):
+            parse_source_names("remotive,unknown")
+        self.assertIsInstance(get_sources("remotive")[0], RemotiveAdapter)
+
+    def test_run_pipeline_fetches_sources_concurrently(self) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        theirstack_rows = [
+            {"id": "5", "job_title": "Junior Backend Engineer", "description": "APIs", "date_posted": now,
+             "final_url": "https://example.com/ts"},
+        ]
+        remotive_rows = [
+            {"id": "6", "title": "Junior Backend Engineer", "description": "APIs", "publication_date": now,
+             "url": "https://example.com/rm"},
+        ]
+        # Serial fetching would break the barrier and raise inside fetch.
+        barrier = threading.Barrier(2)
+        adapters = [
+            BarrierAdapter("theirstack", theirstack_rows, barrier),
+            BarrierAdapter("remotive", remotive_rows, barrier),
+            BrokenAdapter(),
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        store = FakeStore()
+        run_pipeline(q, adapters, store, FakeLogger())
+        self.assertEqual(sorted(p.source for p in store.received), ["remotive", "theirstack"])
+
+    def test_run_pipeline_keeps_pages_stored_before_a_fetch_error(self) -> None:
+        rows = [
+            {"id": "7", "job_title": "Junior Backend Engineer", "description": "APIs",
+             "date_posted": datetime.now(timezone.utc).isoformat(), "final_url": "https://example.com/page1"},
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        for adapters in ([FailingPagesAdapter(rows)], [FailingPagesAdapter(rows), BrokenAdapter()]):
+            store = FakeStore()
+            run_pipeline(q, adapters, store, FakeLogger())
+            self.assertEqual([p.url for p in store.received], ["https://example.com/page1"])
+            self.assertEqual(store.batches, 1)
+
+    def test_raw_posting_id_matches_normalized_id(self) -> None:
+        theirstack, remotive = FakeAdapter([]), RemotiveAdapter()
+        cases = [
+            (theirstack, {"id": 1, "final_url": "https://example.com/a"}),
+            (theirstack, {"id": 2, "url": "https://example.com/b", "source_url": "https://example.com/c"}),
+            (theirstack, {"id": 3}),
+            (remotive, {"id": 4, "url": "https://example.com/d"}),
+            (remotive, {"id": 5}),
+        ]
+        for adapter, raw in cases:
+            posting, _ = pipeline._normalize(adapter, raw)
+            self.assertEqual(pipeline._raw_posting_id(adapter, raw), posting.id)
+
+    def test_run_pipeline_skips_known_postings_before_normalizing(self) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {"id": str(i), "job_title": "Junior Backend Engineer", "description": "APIs", "date_posted": now,
+             "final_url": f"https://example.com/known/{i}"}
+            for i in range(3)
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        store = FakeStore()
+        run_pipeline(q, [FakeAdapter(rows[:2])], store, FakeLogger())
+
+        logger = FakeLogger()
+        with patch.object(pipeline, "_normalize", wraps=pipeline._normalize) as normalize:
+            # The repeated row is dropped within the page as well.
+            run_pipeline(q, [FakeAdapter(rows + rows[2:])], store, logger)
+        self.assertEqual(normalize.call_count, 1)
+        self.assertEqual(len(store.received), 3)
+        upserted = [args for args in logger.infos if args[0].startswith("Upserted")]
+        self.assertEqual(upserted[-1][1:], ("theirstack", 1, 3, 1))
+
+    def test_run_pipeline_looks_up_known_ids_once_per_page(self) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {"id": str(i), "job_title": "Junior Backend Engineer", "description": "APIs", "date_posted": now,
+             "final_url": f"https://example.com/lookup/{i}"}
+            for i in range(3)
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        store = SQLiteStore(":memory:")
+        self.addCleanup(store.close)
+        statements: list[str] = []
+        store.conn.set_trace_callback(statements.append)
+
+        run_pipeline(q, [FakeAdapter(rows)], store, FakeLogger())
+        lookups = [sql for sql in statements if sql.startswith("SELECT id FROM postings WHERE id IN")]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(store.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0], 3)
+
+    def test_run_pipeline_classifies_cleaned_text(self) -> None:
+        rows = [
+            {
+                "id": "4",
+                "job_title": "Backend Engineer",
+                "company": "Acme",
+                "description": '<div class="senior-banner">Junior role building APIs</div>',
+                "date_posted": datetime.now(timezone.utc).isoformat(),
+                "final_url": "https://example.com/markup",
+            }
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+        store = FakeStore()
+        run_pipeline(q, [FakeAdapter(rows)], store, FakeLogger())
+        # The class attribute used to mark this posting senior_excluded.
+        self.assertEqual(len(store.received), 1)
+        self.assertEqual(store.received[0].level_bucket, "entry")
+
+    def test_run_pipeline_extracts_skills_inline(self) -> None:
+        tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        db_path = str(tmpdir / "postings.db")
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "id": str(i),
+                "job_title": "Junior Backend Engineer",
+                "company": "Acme",
+                "location": "Dallas, TX",
+                "description": f"<p>Python &amp; SQL</p><p>Docker {i}</p>",
+                "date_posted": now,
+                "final_url": f"https://example.com/inline/{i}",
+            }
+            for i in range(3)
+        ]
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=7)
+
+        store = SQLiteStore(db_path)
+        try:
+            run_pipeline(q, [FakeAdapter(rows)], store, FakeLogger(), extract_skills=True)
+            inline = store.conn.execute("SELECT posting_id, skill, count FROM posting_skills ORDER BY 1, 2").fetchall()
+        finally:
+            store.close()
+
+        self.assertEqual(len(inline), 9)
+        # Inline results are recorded as current, so a normal run skips them
+        # and a forced run reproduces them.
+        summary = extract_posting_skills(db_path, q)
+        self.assertEqual((summary.postings_processed, summary.postings_skipped), (0, 3))
+        extract_posting_skills(db_path, q, force=True)
+        store = SQLiteStore(db_path)
+        try:
+            rerun = store.conn.execute("SELECT posting_id, skill, count FROM posting_skills ORDER BY 1, 2").fetchall()
+        finally:
+            store.close()
+        self.assertEqual([tuple(r) for r in rerun], [tuple(r) for r in inline])
+
+    def test_run_pipeline_incremental_fetches_after_watermark(self) -> None:
+        def row(i: int, day: int) -> dict:
+            return {
+                "id": str(i),
+                "job_title": "Junior Backend Engineer",
+                "company": "Acme",
+                "location": "Dallas, TX",
+                "description": "Python",
+                "date_posted": f"2026-03-{day:02d}T12:00:00Z",
+                "final_url": f"https://example.com/wm/{i}",
+            }
+
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=30)
+        adapter = WatermarkAdapter([row(1, 1), row(2, 2), row(3, 2)])
+        store = SQLiteStore(":memory:")
+        self.addCleanup(store.close)
+
+        run_pipeline(q, [adapter], store, FakeLogger(), incremental=True)
+        mark = store.get_watermark("theirstack", q.watermark_key())
+        self.assertEqual(mark.newest_posted_at, datetime(2026, 3, 2, 12, tzinfo=timezone.utc))
+        self.assertEqual(mark.boundary_ids, frozenset({"2", "3"}))
+
+        # A new posting at the boundary time is still fetched; the known ones aren't.
+        adapter.rows.append(row(4, 2))
+        logger = FakeLogger()
+        run_pipeline(q, [adapter], store, logger, incremental=True)
+        self.assertEqual(adapter.since_seen[-1], mark)
+        self.assertIn(("Upserted source=%s inserted=%d skipped=%d (after filtering %d)", "theirstack", 1, 0, 1), logger.infos)
+        self.assertEqual(store.get_watermark("theirstack", q.watermark_key()).boundary_ids, frozenset({"2", "3", "4"}))
+
+        run_pipeline(q, [adapter], store, FakeLogger())
+        self.assertIsNone(adapter.since_seen[-1])
+
+    def test_run_pipeline_keeps_watermark_after_a_fetch_error(self) -> None:
+        class FailingWatermarkAdapter(WatermarkAdapter):
+            def iter_pages(self, q, since=None):
+                yield from super().iter_pages(q, since)
+                raise RuntimeError("network failure")
+
+        q = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry", days=30)
+        rows = [{"id": "1", "job_title": "Backend Engineer", "date_posted": "2026-03-01", "final_url": "https://example.com/f/1"}]
+        store = SQLiteStore(":memory:")
+        self.addCleanup(store.close)
+
+        run_pipeline(q, [FailingWatermarkAdapter(rows)], store, FakeLogger(), incremental=True)
+        self.assertIsNone(store.get_watermark("theirstack", q.watermark_key()))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import unittest
+from datetime import datetime, timezone
+from typing import Any
+
+from skillpulse_ingest.models import IngestionQuery, JobPosting
+from skillpulse_ingest.skill_aggregate import aggregate_skills
+from skillpulse_ingest.storage_sqlite import SQLiteStore
+
+# Postings and skills grow with every run; the location tables stay tiny.
+_FULL_SCAN = re.compile(r"^SCAN (postings|p|posting_skills|ps|posting_extractions|pe)\b")
+
+_SHAPES = [
+    IngestionQuery(location=location, role_bucket=role, level_bucket=level, days=30)
+    for location in ("", "Dallas, TX")
+    for role in ("any", "backend")
+    for level in ("any", "entry")
+]
+
+
+class _PlanRecorder:
+    """Connection stand-in that records EXPLAIN QUERY PLAN for every query it runs."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        self.plans: list[tuple[str, list[str]]] = []
+
+    def execute(self, sql: str, params: Any = ()) -> sqlite3.Cursor:
+        plan = [row["detail"] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        self.plans.append((sql, plan))
+        return self._conn.execute(sql, params)
+
+    def cursor(self) -> _PlanRecorder:
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+def _posting(i: int) -> JobPosting:
+    url = f"https://example.com/{i}"
+    return JobPosting(
+        id=JobPosting.make_id("theirstack", url),
+        source="theirstack",
+        url=url,
+        title="Backend Engineer",
+        company=f"Company {i % 3}",
+        location="Dallas, TX",
+        date_posted="2026-02-01T12:00:00Z",
+        retrieved_at=datetime.now(timezone.utc).isoformat(),
+        role_bucket="backend",
+        level_bucket="entry",
+        description_raw="Python and APIs",
+        raw={"url": url},
+    )
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = SQLiteStore(":memory:")
+        postings = [_posting(i) for i in range(6)]
+        self.store.upsert_many(postings)
+        self.store.upsert_skills_many((p.id, {"Python": 1}) for p in postings)
+        self.recorder = _PlanRecorder(self.store.conn)
+        self.store.conn = self.recorder
+
+    def tearDown(self) -> None:
+        self.recorder._conn.close()
+
+    def _plans(self, run: Any) -> list[tuple[str, list[str]]]:
+        self.recorder.plans.clear()
+        run()
+        self.assertTrue(self.recorder.plans)
+        return list(self.recorder.plans)
+
+    def _assert_no_full_scan(self, plans: list[tuple[str, list[str]]]) -> None:
+        for sql, plan in plans:
+            scans = [step for step in plan if _FULL_SCAN.match(step)]
+            self.assertEqual(scans, [], f"full scan in plan {plan} for {sql}")
+
+    def test_reads_never_scan_postings_or_skills(self) -> None:
+        store = self.store
+        for q in _SHAPES:
+            with self.subTest(location=q.location, role=q.role_bucket, level=q.level_bucket):
+                self._assert_no_full_scan(self._plans(lambda: store.iter_postings(q)))
+                self._assert_no_full_scan(self._plans(lambda: store.get_postings_count(q)))
+                self._assert_no_full_scan(self._plans(lambda: store.get_unique_companies_count(q)))
+                self._assert_no_full_scan(self._plans(lambda: aggregate_skills(store, q, 5)))
+
+    def test_totals_and_skills_join_are_index_only(self) -> None:
+        store = self.store
+        for q in _SHAPES:
+            with self.subTest(location=q.location, role=q.role_bucket, level=q.level_bucket):
+                runs = [
+                    lambda: store.get_postings_count(q),
+                    lambda: store.get_unique_companies_count(q),
+                    lambda: aggregate_skills(store, q, 5),
+                ]
+                for run in runs:
+                    for sql, plan in self._plans(run):
+                        fact_steps = [s for s in plan if re.match(r"^SEARCH (postings|p|ps)\b", s)]
+                        self.assertTrue(fact_steps, f"no index search in {plan} for {sql}")
+                        for step in fact_steps:
+                            self.assertIn("USING COVERING INDEX", step, f"table lookups in {plan} for {sql}")
@@ -1,6 +1,8 @@
+import random
 import unittest
 
-from skillpulse_ingest.role_match import classify_level, classify_role, matches_query
+from skillpulse_ingest.role_match import classify_level, classify_posting, classify_role, matches_query
+from skillpulse_ingest.synthetic import synthetic_description, synthetic_title
 
 
 class TestRoleMatch(unittest.TestCase):
@@ -24,6 +26,26 @@ class TestRoleMatch(unittest.TestCase):
         desc = "5+ years"
         self.assertEqual(classify_level(title, desc), "senior_excluded")
 
+    def test_classify_posting_matches_separate_classifiers(self) -> None:
+        rng = random.Random(5)
+        samples = [(synthetic_title(rng), synthetic_description(rng, paragraphs=2)) for _ in range(200)]
+        samples += [
+            ("Senior Backend Engineer", "Java and Spring"),
+            ("Engineer", "1 - 3 years with React"),
+            ("Full-Stack Developer", "api"),
+            ("Engineer I", ""),
+            ("", ""),
+        ]
+        for title, desc in samples:
+            self.assertEqual(classify_posting(title, desc), (classify_role(title, desc), classify_level(title, desc)))
+
+    def test_classify_posting_can_skip_role_for_senior(self) -> None:
+        self.assertEqual(
+            classify_posting("Senior Backend Engineer", "Java", skip_senior_role=True),
+            ("any", "senior_excluded"),
+        )
+        self.assertEqual(classify_posting("Senior Backend Engineer", "Java"), ("backend", "senior_excluded"))
+
     def test_matches_query_filters(self) -> None:
         self.assertTrue(matches_query("backend", "entry", "backend", "entry"))
         self.assertFalse(matches_query("frontend", "entry", "backend", "entry"))
@@ -1,11 +1,17 @@
 import importlib.util
 import io
 import json
+import logging
+import os
+import tempfile
 import unittest
 from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from unittest.mock import patch
 
+from skillpulse_ingest.fake_source import FakeSourceConfig, FakeSourceServer
+from skillpulse_ingest.pipeline import IngestSummary
+from skillpulse_ingest.storage_sqlite import SQLiteStore
 from skillpulse_ingest.workflow import ExtractionSummary
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -54,6 +60,7 @@ class TestRunBackendScript(unittest.TestCase):
         with patch.object(run_backend, "ingest_postings") as mock_ingest:
             with patch.object(run_backend, "extract_posting_skills") as mock_extract:
                 with patch.object(run_backend, "build_skill_insights") as mock_build:
+                    mock_ingest.return_value = IngestSummary(postings_inserted=2)
                     mock_extract.return_value = ExtractionSummary(
                         postings_processed=2,
                         postings_with_skills=2,
@@ -65,12 +72,18 @@ class TestRunBackendScript(unittest.TestCase):
 
                     stdout = io.StringIO()
                     stderr = io.StringIO()
-                    with redirect_stdout(stdout), redirect_stderr(stderr):
-                        run_backend.main(["--role", "backend", "--level", "entry", "--out", str(out_path)])
+                    with tempfile.TemporaryDirectory() as tmpdir, redirect_stdout(stdout), redirect_stderr(stderr):
+                        db_path = str(Path(tmpdir) / "skillpulse.db")
+                        run_backend.main(["--role", "backend", "--level", "entry", "--db", db_path, "--out", str(out_path)])
 
         mock_ingest.assert_called_once()
         mock_extract.assert_called_once()
         mock_build.assert_called_once()
+        # All three stages share one store.
+        store = mock_ingest.call_args.args[1]
+        self.assertIsInstance(store, SQLiteStore)
+        self.assertIs(mock_extract.call_args.args[0], store)
+        self.assertIs(mock_build.call_args.args[0], store)
         self.assertEqual(json.loads(stdout.getvalue()), payload)
         self.assertTrue(out_path.exists())
         self.assertEqual(json.loads(out_path.read_text(encoding="utf-8")), payload)
@@ -78,3 +91,29 @@ class TestRunBackendScript(unittest.TestCase):
         out_path.unlink()
         if out_dir.exists() and not any(out_dir.iterdir()):
             out_dir.rmdir()
+
+    def test_fresh_ingest_still_writes_an_extraction_sample(self) -> None:
+        # New postings are extracted during ingest, so the extraction step skips
+        # them; the sample is filled from their stored skills.
+        run_backend = _load_script_module("run_backend")
+        with tempfile.TemporaryDirectory() as tmpdir, FakeSourceServer(FakeSourceConfig(postings=250)) as server:
+            tmp = Path(tmpdir)
+            args = [
+                "--source", "remotive", "--location", "", "--no-http-cache",
+                "--db", str(tmp / "skillpulse.db"), "--log", str(tmp / "ingest.log"),
+                "--sample-out", str(tmp / "skills_sample.json"),
+            ]
+            stderr = io.StringIO()
+            with patch.dict(os.environ, {"REMOTIVE_BASE_URL": server.remotive_base}), redirect_stdout(io.StringIO()):
+                with redirect_stderr(stderr):
+                    run_backend.main(args)
+            logger = logging.getLogger("skillpulse_ingest")
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+            sample = json.loads((tmp / "skills_sample.json").read_text(encoding="utf-8"))
+
+        self.assertIn("postings_processed=0", stderr.getvalue())
+        self.assertNotIn("inline_postings_extracted=0", stderr.getvalue())
+        self.assertEqual(len(sample), 20)
+        self.assertTrue(any(entry["extracted_skills"] for entry in sample))
@@ -1,6 +1,19 @@
+import html
+import random
+import re
 import unittest
 
+from skillpulse_ingest.prepared import PreparedPosting
 from skillpulse_ingest.skill_extract import clean_text, extract_skill_counts
+from skillpulse_ingest.synthetic import synthetic_description
+
+
+def _three_pass_clean(text: str | None) -> str:
+    # Previous implementation, kept as the parity oracle.
+    if not text:
+        return ""
+    no_tags = re.sub(r"<[^>]+>", " ", text)
+    return re.sub(r"\s+", " ", html.unescape(no_tags)).strip()
 
 
 class TestSkillExtract(unittest.TestCase):
@@ -9,6 +22,16 @@ class TestSkillExtract(unittest.TestCase):
         cleaned = clean_text(text)
         self.assertEqual(cleaned, "Python & SQL REST APIs")
 
+    def test_clean_text_matches_three_pass_cleaner(self) -> None:
+        rng = random.Random(11)
+        atoms = ["<", ">", "&", "#", ";", "1", "x", "amp", "nbsp", "#10", "#x20", "#0", " ", "\t", "\n",
+                 "\r", "\xa0", "<p>", "</li>", "&amp;", "&nbsp;", "ampx", "Python", "c++"]
+        samples = ["".join(rng.choice(atoms) for _ in range(rng.randint(0, 20))) for _ in range(5000)]
+        samples += [synthetic_description(rng) for _ in range(20)]
+        samples += ["a&nbsp;<br>&#0;<br>b", "&lt;b&gt;bold&lt;/b&gt;", "  <p> x </p>  ", None]
+        for text in samples:
+            self.assertEqual(clean_text(text), _three_pass_clean(text), repr(text))
+
     def test_extract_from_html_description(self) -> None:
         title = "Junior Backend Engineer"
         desc = "<div>We use <b>Python</b>, PostgreSQL, and RESTful web services.</div>"
@@ -17,6 +40,14 @@ class TestSkillExtract(unittest.TestCase):
         self.assertGreaterEqual(counts.get("SQL / Databases", 0), 1)
         self.assertGreaterEqual(counts.get("REST APIs", 0), 1)
 
+    def test_prepared_posting_matches_extract_skill_counts(self) -> None:
+        rng = random.Random(12)
+        samples = [("Junior Backend Engineer", synthetic_description(rng, paragraphs=2)) for _ in range(50)]
+        samples += [("İOS Developer", "Kotlin &amp; ſql"), ("", "")]
+        for title, desc in samples:
+            prepared = PreparedPosting(title, desc)
+            self.assertEqual(prepared.skill_counts, extract_skill_counts(title, desc))
+
     def test_normalization_aliases(self) -> None:
         title = "React.js and NodeJS Engineer"
         desc = "Build APIs with node.js and reactjs"
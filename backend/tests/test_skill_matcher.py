@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from skillpulse_ingest.skill_extract import clean_text
+from skillpulse_ingest.skill_matcher import SkillMatcher, _plan_alias, per_pattern_counts
+from skillpulse_ingest.synthetic import synthetic_description, synthetic_title
+
+
+class TestSkillMatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.matcher = SkillMatcher()
+
+    def test_overlapping_and_shared_aliases_match_reference(self) -> None:
+        texts = [
+            "REST API and RESTful web services over HTTP APIs",
+            "GitHub Actions, github, GitLab and CI/CD with Jenkins",
+            "Kubernetes (k8s) containers, Redis, Postgres and PostgreSQL, MySQL",
+            "Node.js, nodejs, React.js, JS/TS, JavaScript, Java script, Java",
+            "Go developer writing go services; we go to lunch",
+            "C++ and C# (C sharp) plus C programming, C language",
+            "python3 K8s Python",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(self.matcher.count(text), per_pattern_counts(text))
+
+    def test_synthetic_postings_match_reference(self) -> None:
+        rng = random.Random(7)
+        for _ in range(200):
+            text = f"{clean_text(synthetic_title(rng))}\n{clean_text(synthetic_description(rng))}"
+            self.assertEqual(self.matcher.count(text), per_pattern_counts(text))
+
+    def test_non_ascii_case_folding_matches_reference(self) -> None:
+        # IGNORECASE matches these against ASCII letters; others never match.
+        for text in ["ſpring \u212a8s PYTHON3", "İava and ıava", "pythön ſql Ｐython", "ſharp c ſharp"]:
+            with self.subTest(text=text):
+                self.assertEqual(self.matcher.count(text), per_pattern_counts(text))
+
+    def test_aliases_are_split_into_token_and_regex_tiers(self) -> None:
+        self.assertEqual(_plan_alias(r"\bpython(?:3)?\b"), ("token", frozenset({"python", "python3"})))
+        self.assertEqual(_plan_alias(r"\bcontainer(?:s|ization)?\b")[0], "token")
+        self.assertEqual(_plan_alias(r"\bjava\b(?!\s*script)"), ("gated", frozenset({"java"})))
+        self.assertEqual(_plan_alias(r"\bc\s*sharp\b"), ("gated", frozenset({"c", "csharp"})))
+        self.assertEqual(_plan_alias(r"\bc\+\+\b"), ("gated", frozenset({"c"})))
+        self.assertEqual(_plan_alias(r"\.net\b")[0], "scan")
+        self.assertEqual(_plan_alias(r"\bpy[a-z]+\b")[0], "scan")
+
+    def test_non_anchored_aliases_fall_back_to_findall(self) -> None:
+        catalog = {"Dotnet": (r"\.net\b", r"\bdotnet\b"), "Python": (r"\bpython\b",)}
+        matcher = SkillMatcher(catalog)
+        text = "ASP.NET, .net core, dotnet and python"
+        self.assertEqual(matcher.count(text), per_pattern_counts(text, catalog))
+        self.assertEqual(matcher.count(text), {"Dotnet": 3, "Python": 1})
+
+    def test_output_follows_catalog_order(self) -> None:
+        counts = self.matcher.count("Flask and Django with Python")
+        self.assertEqual(list(counts), ["Python", "Django", "Flask"])
@@ -11,6 +11,18 @@ class DummyAdapter(SourceAdapter):
         return []
 
 
+class PagedAdapter(SourceAdapter):
+    name = "paged"
+
+    def iter_pages(self, q: IngestionQuery):
+        yield [{"id": "1"}, {"id": "2"}]
+        yield [{"id": "3"}]
+
+
+class IncompleteAdapter(SourceAdapter):
+    name = "incomplete"
+
+
 class TestSourceAdapter(unittest.TestCase):
     def test_abstract_base_cannot_instantiate(self) -> None:
         with self.assertRaises(TypeError):
@@ -20,3 +32,14 @@ class TestSourceAdapter(unittest.TestCase):
         adapter = DummyAdapter()
         q = IngestionQuery(location="X", role_bucket="any", level_bucket="any")
         self.assertEqual(adapter.fetch(q), [])
+
+    def test_fetch_and_iter_jobs_derive_from_iter_pages(self) -> None:
+        adapter = PagedAdapter()
+        q = IngestionQuery(location="X", role_bucket="any", level_bucket="any")
+        self.assertEqual([j["id"] for j in adapter.iter_jobs(q)], ["1", "2", "3"])
+        self.assertEqual(len(adapter.fetch(q)), 3)
+        self.assertEqual(list(DummyAdapter().iter_pages(q)), [[]])
+
+    def test_adapter_must_implement_iter_pages_or_fetch(self) -> None:
+        with self.assertRaises(TypeError):
+            IncompleteAdapter()
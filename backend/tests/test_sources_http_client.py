@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from skillpulse_ingest.sources.http_client import HttpClient
+
+
+class StatusResponse:
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"{}"
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class TestHttpClient(unittest.TestCase):
+    def test_one_pooled_session_per_host(self) -> None:
+        client = HttpClient(pool_size=4)
+        a = client.session_for("https://api.theirstack.com/v1/jobs/search")
+        b = client.session_for("https://api.theirstack.com/v1/other")
+        c = client.session_for("https://remotive.com/api/remote-jobs")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertIn("gzip", a.headers["Accept-Encoding"])
+        self.assertEqual(a.get_adapter("https://api.theirstack.com")._pool_maxsize, 4)
+        client.close()
+
+    def test_retries_retryable_status_then_succeeds(self) -> None:
+        client = HttpClient(timeout=5, backoff_seconds=0.5)
+        with patch("skillpulse_ingest.sources.http_client.time.sleep") as sleep:
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+                responses = [StatusResponse(503), StatusResponse(429), StatusResponse(200)]
+                send.side_effect = responses
+                resp = client.get("https://example.com/jobs", source="test", params={"a": 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(send.call_count, 3)
+        # Failed attempts hand their connection back before the retry.
+        self.assertEqual([r.closed for r in responses], [True, True, False])
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertEqual(delays[0], 0.5)
+        self.assertAlmostEqual(delays[1], 1.0, places=2)
+        self.assertEqual(send.call_args.kwargs["timeout"], 5)
+
+    def test_429_pauses_every_request_to_the_host(self) -> None:
+        client = HttpClient(backoff_seconds=0.5)
+        with patch("skillpulse_ingest.sources.http_client.time.sleep") as sleep:
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+                send.side_effect = [StatusResponse(429, {"Retry-After": "3"}), StatusResponse(200), StatusResponse(200)]
+                client.get("https://example.com/a", source="test")
+                # Mocked sleep lets no time pass, so the host is still paused.
+                client.get("https://example.com/b", source="test")
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        for delay in delays:
+            self.assertAlmostEqual(delay, 3.0, places=2)
+
+    def test_non_retryable_status_is_raised_immediately(self) -> None:
+        client = HttpClient()
+        with patch("skillpulse_ingest.sources.http_client.time.sleep") as sleep:
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+                send.return_value = StatusResponse(401)
+                with self.assertRaises(requests.HTTPError):
+                    client.post("https://example.com/jobs", source="test", json={})
+        self.assertEqual(send.call_count, 1)
+        sleep.assert_not_called()
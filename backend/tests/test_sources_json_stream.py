@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from skillpulse_ingest.sources.json_stream import iter_array_items
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestIterArrayItems(unittest.TestCase):
+    def test_matches_json_loads_at_every_chunk_size(self) -> None:
+        doc = {
+            "job-count": 12345,
+            "meta": {"jobs": ["not", "this"]},
+            "jobs": [
+                {"id": 1, "salary": 12.5e3, "tags": ["a", "b"], "remote": True, "end": None},
+                {"id": 22, "title": "Ingénieur \"backend\" – 東京", "n": -7},
+                [],
+                1234567890,
+            ],
+            "after": "ignored",
+        }
+        data = json.dumps(doc, ensure_ascii=False, indent=1).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(data)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_array_items(_chunks(data, size), "jobs")), doc["jobs"])
+
+    def test_missing_or_empty_array_yields_nothing(self) -> None:
+        self.assertEqual(list(iter_array_items([b'{"other": [1, 2]}'], "jobs")), [])
+        self.assertEqual(list(iter_array_items([b"{}"], "jobs")), [])
+        self.assertEqual(list(iter_array_items([b'{"jobs": [ ]}'], "jobs")), [])
+
+    def test_stops_reading_when_the_consumer_stops(self) -> None:
+        pulled = []
+
+        def source():
+            for i in range(1000):
+                pulled.append(i)
+                yield (b'{"jobs": [' if i == 0 else b",") + json.dumps({"id": i}).encode()
+
+        items = iter_array_items(source(), "jobs")
+        self.assertEqual([next(items)["id"] for _ in range(3)], [0, 1, 2])
+        self.assertLessEqual(len(pulled), 4)
+
+    def test_truncated_document_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_array_items([b'{"jobs": [{"id": 1}, {"id"'], "jobs"))
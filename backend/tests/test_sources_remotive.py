@@ -1,3 +1,4 @@
+import json
 import unittest
 from datetime import datetime, timezone
 from unittest.mock import patch
@@ -9,8 +10,11 @@ from skillpulse_ingest.sources.remotive import RemotiveAdapter
 
 
 class DummyResponse:
-    def __init__(self, payload: dict) -> None:
+    def __init__(self, payload: dict, chunk_size: int | None = None) -> None:
         self._payload = payload
+        self._chunk_size = chunk_size
+        self.chunks_read = 0
+        self.closed = False
 
     def raise_for_status(self) -> None:
         return None
@@ -18,6 +22,22 @@ class DummyResponse:
     def json(self) -> dict:
         return self._payload
 
+    def iter_content(self, chunk_size: int = 1):
+        body = json.dumps(self._payload).encode("utf-8")
+        size = self._chunk_size or chunk_size
+        for start in range(0, len(body), size):
+            self.chunks_read += 1
+            yield body[start : start + size]
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self) -> "DummyResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 class TestRemotiveAdapter(unittest.TestCase):
     def test_fetch_filters_by_date_and_search(self) -> None:
@@ -41,7 +61,7 @@ class TestRemotiveAdapter(unittest.TestCase):
             ]
         }
 
-        with patch("skillpulse_ingest.sources.remotive.requests.get") as mock_get:
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_get:
             mock_get.return_value = DummyResponse(payload)
             adapter = RemotiveAdapter()
             q = IngestionQuery(
@@ -61,7 +81,7 @@ class TestRemotiveAdapter(unittest.TestCase):
 
     def test_fetch_without_role_bucket(self) -> None:
         payload = {"jobs": []}
-        with patch("skillpulse_ingest.sources.remotive.requests.get") as mock_get:
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_get:
             mock_get.return_value = DummyResponse(payload)
             adapter = RemotiveAdapter()
             q = IngestionQuery(
@@ -77,8 +97,8 @@ class TestRemotiveAdapter(unittest.TestCase):
 
     def test_fetch_retries_transient_errors(self) -> None:
         payload = {"jobs": []}
-        with patch("skillpulse_ingest.sources.remotive.time.sleep", return_value=None):
-            with patch("skillpulse_ingest.sources.remotive.requests.get") as mock_get:
+        with patch("skillpulse_ingest.sources.http_client.time.sleep", return_value=None):
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_get:
                 mock_get.side_effect = [
                     requests.ConnectionError("temporary"),
                     DummyResponse(payload),
@@ -94,3 +114,29 @@ class TestRemotiveAdapter(unittest.TestCase):
                 jobs = adapter.fetch(q)
                 self.assertEqual(jobs, [])
                 self.assertEqual(mock_get.call_count, 2)
+
+    def test_streams_feed_and_stops_reading_at_max_results(self) -> None:
+        recent = datetime.now(timezone.utc).isoformat()
+        payload = {
+            "0-legal-notice": "Remotive API",
+            "job-count": 500,
+            "jobs": [
+                {"id": i, "title": f"Backend {i}", "publication_date": recent, "description": "<p>ü</p>" * 100}
+                for i in range(500)
+            ],
+        }
+        resp = DummyResponse(payload, chunk_size=1024)
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_get:
+            mock_get.return_value = resp
+            adapter = RemotiveAdapter()
+            q = IngestionQuery(location="", role_bucket="any", level_bucket="any", days=2, max_results=150)
+            pages = list(adapter.iter_pages(q))
+
+        self.assertEqual([len(p) for p in pages], [100, 50])
+        self.assertEqual([j["id"] for p in pages for j in p], list(range(150)))
+        self.assertEqual(pages[0][0]["description"], "<p>ü</p>" * 100)
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        self.assertTrue(resp.closed)
+        # Only about the first 150 of 500 postings were read off the stream.
+        total_chunks = -(-len(json.dumps(payload).encode("utf-8")) // 1024)
+        self.assertLess(resp.chunks_read, total_chunks // 2)
@@ -0,0 +1,108 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from skillpulse_ingest.sources.http_client import HttpClient
+from skillpulse_ingest.sources.response_cache import ReplayMiss, ResponseCache, cache_key
+
+URL = "https://remotive.com/api/remote-jobs"
+
+
+def _response(status: int, body: bytes = b"", headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = URL
+    resp.headers = CaseInsensitiveDict(headers or {})
+    resp._content = body
+    resp._content_consumed = True
+    return resp
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def test_fresh_entries_are_served_without_a_request(self) -> None:
+        client = HttpClient(cache=ResponseCache(self.tmpdir, ttl_seconds=60))
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+            send.return_value = _response(200, b'{"jobs": [1]}', {"ETag": '"v1"', "Date": "x"})
+            first = client.get(URL, source="remotive", params={"search": "backend"})
+            second = client.get(URL, source="remotive", params={"search": "backend"})
+            client.get(URL, source="remotive", params={"search": "frontend"})
+
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["ETag"], '"v1"')
+        self.assertNotIn("Date", second.headers)
+
+    def test_stale_entries_are_revalidated(self) -> None:
+        cache = ResponseCache(self.tmpdir, ttl_seconds=0)
+        client = HttpClient(cache=cache)
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+            send.side_effect = [
+                _response(200, b'{"jobs": [1]}', {"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 09:00:00 GMT"}),
+                _response(304),
+            ]
+            client.get(URL, source="remotive")
+            resp = client.get(URL, source="remotive")
+
+        headers = send.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 02 Mar 2026 09:00:00 GMT")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"jobs": [1]})
+
+    def test_replay_never_touches_the_network(self) -> None:
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+            send.return_value = _response(200, b'{"data": []}')
+            HttpClient(cache=ResponseCache(self.tmpdir)).post(URL, source="theirstack", json={"page": 0})
+
+            replay = HttpClient(cache=ResponseCache(self.tmpdir, ttl_seconds=0, replay=True))
+            self.assertEqual(replay.post(URL, source="theirstack", json={"page": 0}).json(), {"data": []})
+            with self.assertRaises(ReplayMiss):
+                replay.post(URL, source="theirstack", json={"page": 1})
+        self.assertEqual(send.call_count, 1)
+
+    def test_streamed_responses_are_cached_without_buffering(self) -> None:
+        body = b'{"jobs": [' + b",".join(b'{"id": %d}' % i for i in range(1000)) + b"]}"
+        network = _response(200)
+        network._content, network._content_consumed = False, False
+        network.raw = io.BytesIO(body)
+        client = HttpClient(cache=ResponseCache(self.tmpdir))
+        with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as send:
+            send.return_value = network
+            with client.get(URL, source="remotive", stream=True) as first:
+                self.assertEqual(b"".join(first.iter_content(4096)), body)
+            with client.get(URL, source="remotive", stream=True) as second:
+                self.assertEqual(second.raw.read(), body)
+        self.assertEqual(send.call_count, 1)
+
+    def test_identical_bodies_are_stored_once_and_lru_is_evicted(self) -> None:
+        cache = ResponseCache(self.tmpdir, max_bytes=25)
+        keys = [cache_key("GET", URL, {"page": i}) for i in range(3)]
+        cache.store(keys[0], _response(200, b"a" * 10))
+        cache.store(keys[1], _response(200, b"a" * 10))
+        self.assertEqual(len(os.listdir(self.tmpdir / "bodies")), 1)
+
+        cache.store(keys[2], _response(200, b"b" * 10))
+        # Age both "a" entries, then exceed the bound.
+        past = time.time() - 100
+        os.utime(self.tmpdir / "entries" / f"{keys[0]}.json", (past, past))
+        os.utime(self.tmpdir / "entries" / f"{keys[1]}.json", (past - 1, past - 1))
+        self.assertIsNotNone(cache.lookup(keys[2]))
+        cache.store(cache_key("GET", URL, {"page": 3}), _response(200, b"c" * 10))
+
+        # Both "a" entries go before the shared body is freed; "b" survives.
+        self.assertIsNone(cache.lookup(keys[0]))
+        self.assertIsNone(cache.lookup(keys[1]))
+        self.assertIsNotNone(cache.lookup(keys[2]))
+        self.assertEqual(len(os.listdir(self.tmpdir / "bodies")), 2)
@@ -1,10 +1,13 @@
 import os
+import threading
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import requests
 
-from skillpulse_ingest.models import IngestionQuery
+from skillpulse_ingest.models import FetchWatermark, IngestionQuery
+from skillpulse_ingest.sources.http_client import HttpClient
 from skillpulse_ingest.sources.theirstack import TheirstackAdapter
 
 
@@ -29,7 +32,7 @@ class TestTheirstackAdapter(unittest.TestCase):
         payload = {"data": [{"id": "1", "job_title": "Backend Engineer"}]}
 
         with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
-            with patch("skillpulse_ingest.sources.theirstack.requests.post") as mock_post:
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
                 mock_post.return_value = DummyResponse(payload)
                 adapter = TheirstackAdapter()
                 q = IngestionQuery(
@@ -55,8 +58,8 @@ class TestTheirstackAdapter(unittest.TestCase):
     def test_fetch_retries_transient_errors(self) -> None:
         payload = {"data": []}
         with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
-            with patch("skillpulse_ingest.sources.theirstack.time.sleep", return_value=None):
-                with patch("skillpulse_ingest.sources.theirstack.requests.post") as mock_post:
+            with patch("skillpulse_ingest.sources.http_client.time.sleep", return_value=None):
+                with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
                     mock_post.side_effect = [
                         requests.ConnectionError("temporary"),
                         DummyResponse(payload),
@@ -72,3 +75,98 @@ class TestTheirstackAdapter(unittest.TestCase):
                     jobs = adapter.fetch(q)
                     self.assertEqual(jobs, [])
                     self.assertEqual(mock_post.call_count, 2)
+
+    def test_concurrent_pages_keep_order_and_stop_at_short_page(self) -> None:
+        sizes = {0: 50, 1: 50, 2: 10}
+        # Pages 0-2 only answer once all three are in flight together.
+        barrier = threading.Barrier(3)
+
+        def respond(method, url, **kwargs):
+            page = kwargs["json"]["page"]
+            if page < 3:
+                barrier.wait(timeout=5)
+            start = page * 50
+            return DummyResponse({"data": [{"id": str(i)} for i in range(start, start + sizes.get(page, 50))]})
+
+        with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
+                mock_post.side_effect = respond
+                adapter = TheirstackAdapter(client=HttpClient(), page_concurrency=4)
+                q = IngestionQuery(location="", role_bucket="any", level_bucket="any", max_results=1000)
+                pages = list(adapter.iter_pages(q))
+
+        self.assertEqual([len(p) for p in pages], [50, 50, 10])
+        ids = [int(j["id"]) for p in pages for j in p]
+        self.assertEqual(ids, list(range(110)))
+        # At most the pages in flight when the short page arrived were requested.
+        self.assertLessEqual(mock_post.call_count, 3 + 4)
+
+    def test_iter_pages_requests_one_page_at_a_time(self) -> None:
+        pages = [
+            {"data": [{"id": str(i)} for i in range(50)]},
+            {"data": [{"id": str(i)} for i in range(50, 100)]},
+            {"data": [{"id": str(i)} for i in range(100, 150)]},
+        ]
+        with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
+                mock_post.side_effect = [DummyResponse(p) for p in pages]
+                adapter = TheirstackAdapter(client=HttpClient(), page_concurrency=1)
+                q = IngestionQuery(location="", role_bucket="any", level_bucket="any", max_results=120)
+                it = adapter.iter_pages(q)
+
+                first = next(it)
+                self.assertEqual(len(first), 50)
+                self.assertEqual(mock_post.call_count, 1)
+
+                rest = list(it)
+                self.assertEqual([len(p) for p in rest], [50, 20])
+                self.assertEqual(mock_post.call_args.kwargs["json"]["limit"], 20)
+                # Every page went through the same pooled session.
+                self.assertEqual(len(adapter.client._sessions), 1)
+
+    def test_iter_pages_since_watermark_stops_at_known_postings(self) -> None:
+        # Newest first: two new postings, then the boundary posting and older ones.
+        page = {
+            "data": [
+                {"id": "n2", "date_posted": "2026-03-02T09:00:00Z"},
+                {"id": "n1", "date_posted": "2026-03-01T12:00:00Z"},
+                {"id": "b1", "date_posted": "2026-03-01T12:00:00Z"},
+                {"id": "o1", "date_posted": "2026-02-28T08:00:00Z"},
+            ]
+            + [{"id": f"o{i}", "date_posted": "2026-02-27"} for i in range(2, 48)]
+        }
+        since = FetchWatermark(datetime(2026, 3, 1, 12, tzinfo=timezone.utc), frozenset({"b1"}))
+        with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
+                mock_post.return_value = DummyResponse(page)
+                adapter = TheirstackAdapter(client=HttpClient(), page_concurrency=1)
+                q = IngestionQuery(location="", role_bucket="any", level_bucket="any", max_results=500)
+                pages = list(adapter.iter_pages(q, since=since))
+
+        self.assertEqual([[j["id"] for j in p] for p in pages], [["n2", "n1"]])
+        # The full first page reached known postings, so no second page was requested.
+        self.assertEqual(mock_post.call_count, 1)
+        body = mock_post.call_args.kwargs["json"]
+        self.assertEqual(body["posted_at_gte"], "2026-03-01")
+        self.assertEqual(body["order_by"], [{"desc": True, "field": "date_posted"}])
+
+    def test_iter_pages_since_watermark_reads_past_boundary_day_ties(self) -> None:
+        # Same-day postings come back in any order; a known one on page 1
+        # must not hide a new one on page 2.
+        day = "2026-03-01"
+        first = {"data": [{"id": "b1", "date_posted": day}] + [{"id": f"n{i}", "date_posted": day} for i in range(49)]}
+        second = {
+            "data": [{"id": "late", "date_posted": day}, {"id": "b2", "date_posted": day}]
+            + [{"id": f"o{i}", "date_posted": "2026-02-28"} for i in range(48)]
+        }
+        since = FetchWatermark(datetime(2026, 3, 1, tzinfo=timezone.utc), frozenset({"b1", "b2"}))
+        with patch.dict(os.environ, {"THEIRSTACK_API_KEY": "test-key"}, clear=True):
+            with patch("skillpulse_ingest.sources.http_client.requests.Session.request") as mock_post:
+                mock_post.side_effect = [DummyResponse(first), DummyResponse(second)]
+                adapter = TheirstackAdapter(client=HttpClient(), page_concurrency=1)
+                q = IngestionQuery(location="", role_bucket="any", level_bucket="any", max_results=500)
+                pages = list(adapter.iter_pages(q, since=since))
+
+        self.assertEqual([[j["id"] for j in p] for p in pages], [[f"n{i}" for i in range(49)], ["late"]])
+        # Page 2 reached postings older than the watermark, so paging stopped there.
+        self.assertEqual(mock_post.call_count, 2)
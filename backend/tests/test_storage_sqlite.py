@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import sqlite3
 import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest import mock
 
-from skillpulse_ingest.models import IngestionQuery, JobPosting
-from skillpulse_ingest.storage_sqlite import SQLiteStore
+from skillpulse_ingest.models import FetchWatermark, IngestionQuery, JobPosting
+from skillpulse_ingest.skill_extract import content_hash
+from skillpulse_ingest.storage_sqlite import SCHEMA_VERSION, SQLiteStore, using_store
 
 
 def _make_posting(url: str, *, company: str = "Acme", location: str = "Dallas, TX", role: str = "backend", level: str = "entry", retrieved_at: str | None = None, description: str = "Build APIs") -> JobPosting:
@@ -45,6 +48,196 @@ class TestSQLiteStore(unittest.TestCase):
 
             store.close()
 
+    def test_upsert_counts_stored_and_in_batch_duplicates(self) -> None:
+        store = SQLiteStore(":memory:")
+        stored = _make_posting("https://example.com/stored")
+        store.upsert_many([stored])
+
+        new = _make_posting("https://example.com/new")
+        repeated = _make_posting("https://example.com/new", company="Other")
+        self.assertEqual(store.upsert_many([stored, new, repeated]), (1, 2))
+        # The first copy of a repeated id wins, as with per-row inserts.
+        row = store.conn.execute("SELECT company FROM postings WHERE id = ?", (new.id,)).fetchone()
+        self.assertEqual(row["company"], "Acme")
+        self.assertEqual(store.upsert_many([]), (0, 0))
+        store.close()
+
+    def test_window_filter_uses_epoch_seconds(self) -> None:
+        store = SQLiteStore(":memory:")
+        minus_12 = timezone(timedelta(hours=-12))
+        now = datetime.now(timezone.utc)
+        # Inside a 1-day window, but its -12:00 string sorts before the UTC cutoff.
+        inside = _make_posting("https://example.com/in", retrieved_at=(now - timedelta(hours=23)).astimezone(minus_12).isoformat())
+        outside = _make_posting("https://example.com/out", retrieved_at=(now - timedelta(hours=25)).isoformat())
+        store.upsert_many([inside, outside])
+
+        q = IngestionQuery(location="Dallas", role_bucket="backend", level_bucket="entry", days=1)
+        self.assertEqual([row["id"] for row in store.iter_postings(q)], [inside.id])
+        self.assertEqual(store.get_postings_count(q), 1)
+        store.close()
+
+    def test_epoch_columns_are_added_to_existing_databases(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "old.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE postings (id TEXT PRIMARY KEY, source TEXT NOT NULL, url TEXT NOT NULL, "
+                "title TEXT NOT NULL, company TEXT NOT NULL, location TEXT, date_posted TEXT, "
+                "retrieved_at TEXT NOT NULL, role_bucket TEXT NOT NULL, level_bucket TEXT NOT NULL, "
+                "description_raw TEXT NOT NULL, raw_json TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO postings VALUES ('p1', 'remotive', 'u', 't', 'c', NULL, '2026-03-01', "
+                "'2026-03-02T00:00:00+00:00', 'backend', 'entry', 'd', '{}')"
+            )
+            conn.execute(
+                "INSERT INTO postings VALUES ('p2', 'remotive', 'u2', 't', 'c', 'Dallas,  Texas', NULL, "
+                "'2026-03-02T00:00:00+00:00', 'backend', 'entry', 'd', '{}')"
+            )
+            conn.commit()
+            conn.close()
+
+            store = SQLiteStore(db_path)
+            row = store.conn.execute("SELECT posted_ts, retrieved_ts FROM postings WHERE id = 'p1'").fetchone()
+            located = store.conn.execute(
+                "SELECT l.city, l.state FROM postings p JOIN locations l ON l.id = p.location_id WHERE p.id = 'p2'"
+            ).fetchone()
+            self.assertEqual(tuple(located), ("dallas", "TX"))
+            indexes = {r["name"] for r in store.conn.execute("PRAGMA index_list(postings)")}
+            store.close()
+
+        expected_posted = int(datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(tuple(row), (expected_posted, expected_posted + 86400))
+        self.assertLessEqual({"idx_postings_posted_ts", "idx_postings_time"}, indexes)
+
+    def test_blobs_are_stored_compressed_and_read_on_demand(self) -> None:
+        store = SQLiteStore(":memory:")
+        description = "<p>Python and SQL</p>" * 200
+        p = _make_posting("https://example.com/blob", description=description)
+        store.upsert_many([p])
+
+        columns = {row["name"] for row in store.conn.execute("PRAGMA table_info(postings)")}
+        self.assertFalse({"description_raw", "raw_json"} & columns)
+        stored = store.conn.execute("SELECT description_z FROM posting_blobs").fetchone()["description_z"]
+        self.assertLess(len(stored), len(description) // 10)
+
+        self.assertEqual(store.get_descriptions([p.id, "missing"]), {p.id: description})
+        self.assertEqual(store.get_raw(p.id), p.raw)
+        self.assertIsNone(store.get_raw("missing"))
+        q = IngestionQuery(location="Dallas", role_bucket="backend", level_bucket="entry", days=30)
+        self.assertEqual(store.iter_postings(q)[0]["content_hash"], content_hash(p.title, description))
+        store.close()
+
+    def test_inline_blobs_are_moved_out_of_existing_databases(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "old.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE postings (id TEXT PRIMARY KEY, source TEXT NOT NULL, url TEXT NOT NULL, "
+                "title TEXT NOT NULL, company TEXT NOT NULL, location TEXT, date_posted TEXT, "
+                "retrieved_at TEXT NOT NULL, role_bucket TEXT NOT NULL, level_bucket TEXT NOT NULL, "
+                "description_raw TEXT NOT NULL, raw_json TEXT NOT NULL, posted_ts INTEGER, retrieved_ts INTEGER)"
+            )
+            conn.execute(
+                "INSERT INTO postings VALUES ('p1', 'remotive', 'u', 'Dev', 'c', NULL, '2026-03-01', "
+                "'2026-03-02T00:00:00+00:00', 'backend', 'entry', '<p>Go</p>', '{\"id\": 1}', 0, 0)"
+            )
+            conn.commit()
+            conn.close()
+
+            store = SQLiteStore(db_path)
+            row = store.conn.execute("SELECT title, content_hash, retrieved_ts FROM postings").fetchone()
+            self.assertIsNone(store.conn.execute("SELECT location_id FROM postings").fetchone()[0])
+            columns = {r["name"] for r in store.conn.execute("PRAGMA table_info(postings)")}
+            indexes = {r["name"] for r in store.conn.execute("PRAGMA index_list(postings)")}
+            self.assertEqual(store.get_descriptions(["p1"]), {"p1": "<p>Go</p>"})
+            self.assertEqual(store.get_raw("p1"), {"id": 1})
+            store.close()
+
+        self.assertEqual(tuple(row), ("Dev", content_hash("Dev", "<p>Go</p>"), 0))
+        self.assertFalse({"description_raw", "raw_json"} & columns)
+        self.assertLessEqual({"idx_postings_role_level", "idx_postings_time"}, indexes)
+
+    def test_up_to_date_database_opens_without_ddl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "skillpulse.db")
+            with SQLiteStore(db_path) as store:
+                self.assertEqual(store.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+                store.upsert_many([_make_posting("https://example.com/1")])
+
+            statements: list[str] = []
+            conn = sqlite3.connect(db_path)
+            conn.set_trace_callback(statements.append)
+            with mock.patch.object(sqlite3, "connect", return_value=conn):
+                store = SQLiteStore(db_path)
+            self.assertEqual(statements, ["PRAGMA user_version"])
+            q = IngestionQuery(location="", role_bucket="any", level_bucket="any", days=30)
+            self.assertEqual(store.get_postings_count(q), 1)
+            store.close()
+
+    def test_newer_schema_version_is_refused(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "skillpulse.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+            conn.close()
+
+            with self.assertRaises(RuntimeError):
+                SQLiteStore(db_path)
+
+    def test_using_store_only_closes_stores_it_opened(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "skillpulse.db")
+            with using_store(db_path) as opened:
+                opened.upsert_many([_make_posting("https://example.com/1")])
+            with self.assertRaises(sqlite3.ProgrammingError):
+                opened.conn.execute("SELECT 1")
+
+            with SQLiteStore(db_path) as store:
+                with using_store(store) as shared:
+                    self.assertIs(shared, store)
+                self.assertEqual(store.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0], 1)
+
+    def test_watermark_round_trip(self) -> None:
+        store = SQLiteStore(":memory:")
+        key = IngestionQuery(location="Dallas, TX", role_bucket="backend", level_bucket="entry").watermark_key()
+        self.assertIsNone(store.get_watermark("theirstack", key))
+
+        mark = FetchWatermark(datetime(2026, 3, 1, 12, tzinfo=timezone.utc), frozenset({"b", "a"}))
+        store.save_watermark("theirstack", key, mark)
+        self.assertEqual(store.get_watermark("theirstack", key), mark)
+        self.assertIsNone(store.get_watermark("remotive", key))
+
+        newer = FetchWatermark(
+            datetime(2026, 3, 2, tzinfo=timezone.utc),
+            frozenset({"c"}),
+            window_start=datetime(2026, 2, 1, tzinfo=timezone.utc),
+            complete=True,
+        )
+        store.save_watermark("theirstack", key, newer)
+        self.assertEqual(store.get_watermark("theirstack", key), newer)
+        store.close()
+
+    def test_watermarks_from_before_coverage_read_as_incomplete(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "old.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE fetch_watermarks (source TEXT NOT NULL, query_key TEXT NOT NULL, "
+                "newest_posted_at TEXT NOT NULL, boundary_ids_json TEXT NOT NULL, updated_at TEXT NOT NULL, "
+                "PRIMARY KEY (source, query_key))"
+            )
+            conn.execute("INSERT INTO fetch_watermarks VALUES ('theirstack', 'k', '2026-03-01T00:00:00+00:00', '[\"a\"]', '')")
+            conn.commit()
+            conn.close()
+
+            with SQLiteStore(db_path) as store:
+                mark = store.get_watermark("theirstack", "k")
+
+        self.assertEqual(mark.boundary_ids, frozenset({"a"}))
+        self.assertIsNone(mark.window_start)
+        self.assertFalse(mark.complete)
+
     def test_posting_skills_upsert(self) -> None:
         store = SQLiteStore(":memory:")
         p = _make_posting("https://example.com/skill")
@@ -66,6 +259,41 @@ class TestSQLiteStore(unittest.TestCase):
 
         store.close()
 
+    def test_bulk_skill_upsert_replaces_each_postings_skills(self) -> None:
+        store = SQLiteStore(":memory:")
+        a = _make_posting("https://example.com/a")
+        b = _make_posting("https://example.com/b")
+        store.upsert_many([a, b])
+
+        self.assertEqual(store.upsert_skills_many([(a.id, {"Python": 1, "React": 1}), (b.id, {"Go": 1})]), (3, 0, 0))
+        # React and Go disappeared from the re-extraction; Docker is new.
+        counts = store.upsert_skills_many([(a.id, {"Python": 2, "Docker / Containers": 1}), (b.id, {})])
+        self.assertEqual(counts, (1, 1, 2))
+
+        rows = store.conn.execute("SELECT posting_id, skill, count FROM posting_skills ORDER BY skill").fetchall()
+        self.assertEqual([tuple(r) for r in rows], [(a.id, "Docker / Containers", 1), (a.id, "Python", 2)])
+        store.close()
+
+    def test_location_filter_matches_parsed_locations(self) -> None:
+        store = SQLiteStore(":memory:")
+        texts = ["Dallas, TX", "Dallas, Texas", "Dallas-Fort Worth", "Austin, TX", "Dallas, TX (Remote)", None]
+        postings = [_make_posting(f"https://example.com/{i}", location=t) for i, t in enumerate(texts)]
+        store.upsert_many(postings)
+
+        def matched(location: str) -> set[str]:
+            q = IngestionQuery(location=location, role_bucket="backend", level_bucket="entry", days=30)
+            return {row["location"] for row in store.iter_postings(q)}
+
+        dallas = {"Dallas, TX", "Dallas, Texas", "Dallas-Fort Worth", "Dallas, TX (Remote)"}
+        self.assertEqual(matched("Dallas, TX"), dallas)
+        self.assertEqual(matched("Texas"), dallas | {"Austin, TX"})
+        self.assertEqual(matched("Remote"), {"Dallas, TX (Remote)"})
+        # Plain substrings of stored locations still match, as before.
+        self.assertEqual(matched("tin, TX"), {"Austin, TX"})
+        self.assertEqual(matched("Nowhere"), set())
+        self.assertEqual(store.conn.execute("SELECT COUNT(*) FROM locations").fetchone()[0], 3)
+        store.close()
+
     def test_iter_postings_and_counts(self) -> None:
         store = SQLiteStore(":memory:")
         now = datetime.now(timezone.utc)
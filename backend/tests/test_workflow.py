@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from skillpulse_ingest.fake_source import FakeSourceConfig, FakeSourceServer
+from skillpulse_ingest.models import IngestionQuery, JobPosting
+from skillpulse_ingest.storage_sqlite import SQLiteStore
+from skillpulse_ingest.synthetic import synthetic_description, synthetic_title
+from skillpulse_ingest.extraction_cache import ExtractionCache
+from skillpulse_ingest.skill_extract import extract_skill_counts, skill_text
+from skillpulse_ingest.workflow import _extract_chunk, build_skill_insights, extract_posting_skills, ingest_postings
+
+
+def _seed(db_path: Path, n: int, *, distinct: int | None = None) -> None:
+    rng = random.Random(3)
+    # With ``distinct`` set, postings repeat that many title/description pairs.
+    variants = [(synthetic_title(rng), synthetic_description(rng, paragraphs=3)) for _ in range(distinct or n)]
+    now = datetime.now(timezone.utc).isoformat()
+    postings = []
+    for i in range(n):
+        url = f"https://example.com/{i}"
+        postings.append(
+            JobPosting(
+                id=JobPosting.make_id("theirstack", url),
+                source="theirstack",
+                url=url,
+                title=variants[i % len(variants)][0],
+                company=f"Company {i % 7}",
+                location="Dallas, TX",
+                date_posted="2026-02-01T12:00:00Z",
+                retrieved_at=now,
+                role_bucket="backend",
+                level_bucket="entry",
+                description_raw=variants[i % len(variants)][1],
+                raw={"url": url},
+            )
+        )
+    store = SQLiteStore(str(db_path))
+    store.upsert_many(postings)
+    store.close()
+
+
+def _skill_rows(db_path: Path) -> list[tuple[str, str, int]]:
+    store = SQLiteStore(str(db_path))
+    try:
+        rows = store.conn.execute("SELECT posting_id, skill, count FROM posting_skills ORDER BY 1, 2").fetchall()
+        return [tuple(r) for r in rows]
+    finally:
+        store.close()
+
+
+class TestExtractPostingSkills(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.q = IngestionQuery(location="Dallas", role_bucket="backend", level_bucket="entry", days=30)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_workers_match_serial_run(self) -> None:
+        serial_db = self.tmpdir / "serial.db"
+        parallel_db = self.tmpdir / "parallel.db"
+        _seed(serial_db, 450, distinct=300)
+        shutil.copy(serial_db, parallel_db)
+
+        serial = extract_posting_skills(str(serial_db), self.q, sample_out=str(self.tmpdir / "serial.json"))
+        parallel = extract_posting_skills(
+            str(parallel_db), self.q, sample_out=str(self.tmpdir / "parallel.json"), workers=2
+        )
+
+        self.assertEqual(serial.postings_processed, 450)
+        self.assertEqual((serial.cache_hits, serial.cache_misses), (150, 300))
+        self.assertEqual(serial, replace(parallel, sample_out=serial.sample_out))
+        self.assertEqual(
+            json.loads((self.tmpdir / "serial.json").read_text(encoding="utf-8")),
+            json.loads((self.tmpdir / "parallel.json").read_text(encoding="utf-8")),
+        )
+        self.assertEqual(_skill_rows(serial_db), _skill_rows(parallel_db))
+
+    def test_worker_chunks_return_keys_and_counts_only(self) -> None:
+        repeated = ("Python Developer", "<p>Python and SQL</p>")
+        jobs = [repeated, ("Go Engineer", "Go, Docker"), repeated]
+        keys, counts = _extract_chunk(jobs)
+
+        self.assertEqual(keys, [ExtractionCache.key(skill_text(title, description)) for title, description in jobs])
+        self.assertEqual(counts, {key: extract_skill_counts(*job) for key, job in zip(keys, jobs)})
+        self.assertEqual(len(counts), 2)
+
+    def test_persisted_cache_is_reused_by_forced_rerun(self) -> None:
+        db_path = self.tmpdir / "skillpulse.db"
+        _seed(db_path, 6, distinct=2)
+
+        first = extract_posting_skills(str(db_path), self.q, persist_cache=True)
+        self.assertEqual((first.cache_hits, first.cache_misses), (4, 2))
+
+        rerun = extract_posting_skills(str(db_path), self.q, force=True, cache_size=0, persist_cache=True)
+        self.assertEqual((rerun.cache_hits, rerun.cache_misses), (6, 0))
+        self.assertEqual(rerun.postings_with_skills, first.postings_with_skills)
+
+    def test_rerun_skips_current_postings(self) -> None:
+        db_path = self.tmpdir / "skillpulse.db"
+        _seed(db_path, 5)
+
+        first = extract_posting_skills(str(db_path), self.q)
+        self.assertEqual((first.postings_processed, first.postings_skipped), (5, 0))
+
+        second = extract_posting_skills(str(db_path), self.q)
+        self.assertEqual((second.postings_processed, second.postings_skipped), (0, 5))
+
+        forced = extract_posting_skills(str(db_path), self.q, force=True)
+        self.assertEqual((forced.postings_processed, forced.postings_skipped), (5, 0))
+        self.assertEqual(forced.skills_inserted, 0)
+
+    def test_sample_includes_skipped_postings(self) -> None:
+        db_path = self.tmpdir / "skillpulse.db"
+        sample_path = self.tmpdir / "sample.json"
+        _seed(db_path, 25)
+        extract_posting_skills(str(db_path), self.q, sample_out=str(sample_path))
+        first = json.loads(sample_path.read_text(encoding="utf-8"))
+
+        # Everything is current now; the sample comes from the stored skills.
+        rerun = extract_posting_skills(str(db_path), self.q, sample_out=str(sample_path))
+        self.assertEqual(rerun.postings_processed, 0)
+        self.assertEqual(len(first), 20)
+        self.assertTrue(any(entry["extracted_skills"] for entry in first))
+        self.assertEqual(json.loads(sample_path.read_text(encoding="utf-8")), first)
+
+    def test_catalog_change_invalidates_extractions(self) -> None:
+        db_path = self.tmpdir / "skillpulse.db"
+        _seed(db_path, 3)
+        extract_posting_skills(str(db_path), self.q)
+
+        with patch("skillpulse_ingest.workflow.CATALOG_FINGERPRINT", "changed"):
+            summary = extract_posting_skills(str(db_path), self.q)
+        self.assertEqual((summary.postings_processed, summary.postings_skipped), (3, 0))
+
+    def test_db_path_takes_a_path_or_an_open_store(self) -> None:
+        db_path = self.tmpdir / "skillpulse.db"
+        _seed(db_path, 3)
+        summary = extract_posting_skills(db_path=str(db_path), q=self.q)
+        self.assertEqual(summary.postings_processed, 3)
+
+        with SQLiteStore(str(db_path)) as store:
+            payload = build_skill_insights(db_path=store, q=self.q, top_n=5)
+            # The caller's store is left open.
+            self.assertEqual(store.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0], 3)
+        self.assertEqual(payload["skills"], build_skill_insights(str(db_path), self.q, top_n=5)["skills"])
+
+    def test_rejects_non_positive_workers(self) -> None:
+        with self.assertRaises(ValueError):
+            extract_posting_skills(str(self.tmpdir / "x.db"), self.q, workers=0)
+
+
+class TestIngestPostings(unittest.TestCase):
+    def test_all_sources_without_theirstack_key_still_runs_remotive(self) -> None:
+        q = IngestionQuery(location="", role_bucket="any", level_bucket="any", days=30, max_results=20)
+        with tempfile.TemporaryDirectory() as tmpdir, FakeSourceServer(FakeSourceConfig(postings=50)) as server:
+            stderr = io.StringIO()
+            with patch.dict(os.environ, {"REMOTIVE_BASE_URL": server.remotive_base}, clear=True), redirect_stderr(stderr):
+                with SQLiteStore(":memory:") as store:
+                    ingest_postings(q, store, str(Path(tmpdir) / "ingest.log"), source_name="all")
+                    sources = {row[0] for row in store.conn.execute("SELECT DISTINCT source FROM postings")}
+            logger = logging.getLogger("skillpulse_ingest")
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+
+        self.assertEqual(sources, {"remotive"})
+        self.assertIn("Setup failed for source=theirstack", stderr.getvalue())